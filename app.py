@@ -8,26 +8,22 @@ modular architecture with self-healing feature loading.
 
 import os
 import sys
+import atexit
 import logging
 from flask import Flask, render_template, jsonify
 from flask_cors import CORS
-from sqlalchemy import create_engine
+from werkzeug.exceptions import HTTPException
 from sqlalchemy.orm import sessionmaker, scoped_session
 import firebase_admin
 from firebase_admin import credentials
 
 # Import configuration
-from config import config
+from config import config, Config
+from utils.startup_profiler import StartupProfiler
+from utils.logging_setup import configure_logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('app.log')
-    ]
-)
+# Configure logging (queued to a background writer; see utils/logging_setup.py)
+configure_logging(Config)
 logger = logging.getLogger(__name__)
 
 
@@ -47,26 +43,54 @@ def create_app(config_name='default'):
     Returns:
         Flask application instance
     """
+    # Phase timings, enabled by MM_STARTUP_PROFILE (see utils/startup_profiler.py)
+    profiler = StartupProfiler.from_env()
+    
     app = Flask(__name__)
+    app.startup_profiler = profiler
     
     # Load configuration
-    app.config.from_object(config[config_name])
-    config[config_name].init_app(app)
-    
-    # Enable CORS
-    CORS(app, origins=app.config['CORS_ORIGINS'])
+    with profiler.phase('config'):
+        app.config.from_object(config[config_name])
+        config[config_name].init_app(app)
+        
+        # Enable CORS
+        CORS(app, origins=app.config['CORS_ORIGINS'])
     
     # Initialize Firebase Admin SDK
-    init_firebase(app)
+    with profiler.phase('firebase'):
+        init_firebase(app)
     
     # Initialize Database
-    init_database(app)
+    with profiler.phase('database'):
+        init_database(app)
+    
+    # Per-request phase timings (Server-Timing header, slow-request log)
+    from utils.request_timing import register_request_timing
+    register_request_timing(app)
+    
+    # N+1 warnings and @query_budget enforcement in debug/testing
+    from utils.query_guard import register_query_guard
+    register_query_guard(app)
+    
+    # Prometheus metrics on /metrics (aggregated across gunicorn workers)
+    from utils.metrics import register_metrics
+    register_metrics(app)
+    
+    # Sampling profiler for requests chosen by admin header or sample rate
+    from utils.sampling_profiler import register_profiler
+    register_profiler(app)
     
     # Register error handlers
     register_error_handlers(app)
     
     # Load features (fail-safe modular system)
-    load_features(app)
+    with profiler.phase('features'):
+        load_features(app)
+    
+    # Liveness/readiness probes for load balancers
+    from utils.health import register_health_checks
+    register_health_checks(app)
     
     # Register root route
     @app.route('/')
@@ -123,8 +147,12 @@ def create_app(config_name='default'):
         }), 200
     
     logger.info(f"Money Matrix initialized in {config_name} mode")
-    logger.info(f"Registered routes: {[str(rule) for rule in app.url_map.iter_rules()]}")
+    routes = [str(rule) for rule in app.url_map.iter_rules()]
+    logger.info(f"Registered {len(routes)} routes")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Routes: {routes}")
     
+    profiler.finish(app, config_name)
     return app
 
 
@@ -155,6 +183,43 @@ def init_firebase(app):
         logger.warning("Application will continue without Firebase authentication")
 
 
+def reinit_after_fork(app):
+    """
+    Reset fork-unsafe resources in a worker process forked from a preloaded app
+    Called from gunicorn's post_fork hook (see gunicorn.conf.py)
+    
+    Args:
+        app: Flask application instance created in the master process
+    """
+    global firebase_app
+    
+    # The log writer thread stayed in the parent
+    from utils.logging_setup import reinit_after_fork as reinit_logging
+    reinit_logging()
+    
+    # New connection pool for this process; close=False leaves the parent's
+    # connections alone instead of closing sockets the parent still owns
+    if getattr(app, 'db_engine', None) is not None:
+        app.db_engine.dispose(close=False)
+        app.db_session.remove()
+        app.db_read_session.remove()
+    if getattr(app, 'db_read_engine', None) not in (None, getattr(app, 'db_engine', None)):
+        app.db_read_engine.dispose(close=False)
+    
+    # Firebase clients hold HTTP/gRPC sessions: rebuild the default app
+    if firebase_app is not None:
+        credential = firebase_app.credential
+        firebase_admin.delete_app(firebase_app)
+        firebase_app = firebase_admin.initialize_app(credential)
+        
+        # Cloud sync's Firestore client was created from the old app
+        cloud_sync_module = sys.modules.get('utils.cloud_sync')
+        if cloud_sync_module is not None and cloud_sync_module.cloud_sync.is_available():
+            cloud_sync_module.cloud_sync.reinitialize()
+    
+    logger.info(f"Worker {os.getpid()} re-initialized after fork")
+
+
 def init_database(app):
     """
     Initialize SQLite database with SQLAlchemy
@@ -165,27 +230,50 @@ def init_database(app):
     global db_session
     
     try:
-        # Create SQLAlchemy engine
-        engine = create_engine(
-            app.config['SQLALCHEMY_DATABASE_URI'],
-            echo=app.config['SQLALCHEMY_ECHO'],
-            pool_pre_ping=True
-        )
+        # Create SQLAlchemy engine (pool settings; SQLite: WAL + pragmas on
+        # every connection, PRAGMA optimize at exit)
+        from utils.db_engine import create_app_engine, optimize_sqlite
+        engine = create_app_engine(app.config['SQLALCHEMY_DATABASE_URI'], app.config)
+        atexit.register(optimize_sqlite, engine)
         
         # Create session factory
         session_factory = sessionmaker(bind=engine)
         db_session = scoped_session(session_factory)
         
+        # Keep analytics rollups and recurring signatures in step with
+        # transaction writes, whether or not the analytics feature loads
+        from utils.rollups import register_rollup_listeners
+        from utils.recurring import register_signature_listeners
+        register_rollup_listeners(session_factory)
+        register_signature_listeners(session_factory)
+        
         # Store in app context for access in features
         app.db_engine = engine
         app.db_session = db_session
         
-        logger.info(f"Database initialized: {app.config['SQLALCHEMY_DATABASE_URI']}")
+        # Read-only session for GET handlers (see utils/db_routing.py), on
+        # the optional read replica or else the primary
+        from utils.db_sessions import read_only_sessionmaker, register_session_teardown
+        replica_uri = app.config.get('DATABASE_REPLICA_URI')
+        if replica_uri:
+            app.db_read_engine = create_app_engine(replica_uri, app.config)
+            logger.info("Read replica configured for GET requests")
+        else:
+            app.db_read_engine = engine
+        app.db_read_session = scoped_session(read_only_sessionmaker(app.db_read_engine))
+        
+        # Return connections and drop identity maps after every request
+        register_session_teardown(app)
         
-        # Import base models and create tables
-        from models.base import Base
-        Base.metadata.create_all(engine)
-        logger.info("Database tables created successfully")
+        logger.info(f"Database initialized: {engine.url.render_as_string(hide_password=True)}")
+        
+        # Versioned schema: one version query when current, migrations
+        # (under a leader lock) only when the database is behind
+        from utils.schema import ensure_schema, db_cli
+        with app.startup_profiler.phase('schema'):
+            version = ensure_schema(engine, auto_upgrade=app.config['SCHEMA_AUTO_UPGRADE'])
+        app.cli.add_command(db_cli)
+        logger.info(f"Database schema version: {version}")
     
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
@@ -221,6 +309,10 @@ def register_error_handlers(app):
     @app.errorhandler(Exception)
     def handle_exception(error):
         """Handle all unhandled exceptions"""
+        # 405s and other HTTP errors without their own handler keep their status
+        if isinstance(error, HTTPException):
+            return error
+        
         logger.error(f"Unhandled exception: {str(error)}", exc_info=True)
         
         if db_session:
@@ -244,6 +336,8 @@ def load_features(app):
     try:
         registry = FeatureRegistry(app)
         loaded_count = registry.load_all_features()
+        # Only a completed load is published; /readyz treats a missing registry as a crash
+        app.feature_registry = registry
         
         logger.info(f"Feature loading completed: {loaded_count} features loaded successfully")
         logger.info(f"Active features: {', '.join(registry.get_active_features())}")
@@ -0,0 +1,122 @@
+"""
+Async I/O Load Benchmark
+Throughput of the I/O-bound endpoints (cloud sync, AI predictions) with
+their remote calls awaited one after another vs overlapped
+
+Each variant starts gunicorn from gunicorn.conf.py against a seeded SQLite
+database with the local Firestore and Gemini stubs (utils/io_stubs.py), so
+every remote call costs --latency-ms of waiting and nothing else:
+
+- sequential: ASYNC_IO_CONCURRENT=false, the behaviour of the previous
+  sync views (one round trip after another)
+- concurrent: ASYNC_IO_CONCURRENT=true, independent round trips overlap
+
+Both run on the same worker class (--worker-class, default sync: one request
+per worker at a time, the case where waiting hurts most).
+
+Usage:
+    python benchmarks/async_io.py [--worker-class sync] [--workers 2]
+        [--concurrency 16] [--duration 15] [--latency-ms 50] [--output results.json]
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+from load_modes import PROJECT_ROOT, _free_port, start_server, wait_ready, run_load
+
+sys.path.insert(0, PROJECT_ROOT)
+
+DEMO_USER = 'demo-user-id'
+
+REQUEST_MIX = [
+    ('POST', '/sync/api/push'),
+    ('GET', '/analytics/api/predictions'),
+    ('POST', '/sync/api/pull'),
+    ('GET', '/analytics/api/predictions'),
+]
+
+VARIANTS = {
+    'sequential': {'ASYNC_IO_CONCURRENT': 'false'},
+    'concurrent': {'ASYNC_IO_CONCURRENT': 'true'},
+}
+
+
+def seed_database(path: str, transactions: int = 200):
+    """Schema plus the development demo user with settings and transactions"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from utils.schema import upgrade
+    from models.user import User, UserSettings
+    from models.transaction import Transaction
+
+    engine = create_engine(f'sqlite:///{path}')
+    upgrade(engine)
+    with Session(engine) as session:
+        session.add(User(firebase_uid=DEMO_USER, email='demo@example.com', display_name='Demo', is_active=True))
+        session.add(UserSettings(firebase_uid=DEMO_USER, theme='auto', currency='USD'))
+        session.add_all([
+            Transaction(
+                firebase_uid=DEMO_USER,
+                amount=Decimal(f'{5 + i % 90}.50'),
+                type='expense',
+                description=('GROCERY MART', 'COFFEE HOUSE', 'NETFLIX')[i % 3],
+                date=date(2026, 1, 1) + timedelta(days=i % 300),
+                is_deleted=False
+            )
+            for i in range(transactions)
+        ])
+        session.commit()
+    engine.dispose()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Sequential vs overlapped remote calls under load')
+    parser.add_argument('--worker-class', default='sync', choices=['sync', 'gthread', 'gevent'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4, help='threads per gthread worker')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15.0, help='seconds of load per variant')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='simulated Firestore/Gemini round trip')
+    parser.add_argument('--variants', nargs='+', default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument('--output', help='write results as JSON')
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        for variant in args.variants:
+            seed_database(os.path.join(scratch, f'load_{variant}.db'))
+            extra_env = dict(
+                VARIANTS[variant],
+                FIRESTORE_BACKEND='stub',
+                GEMINI_BACKEND='stub',
+                IO_STUB_LATENCY_MS=str(args.latency_ms)
+            )
+
+            port = _free_port()
+            server = start_server(args.worker_class, args.workers, args.threads, port, scratch,
+                                  extra_env=extra_env, name=variant)
+            try:
+                wait_ready(port)
+                run_load(port, args.concurrency, min(2.0, args.duration), REQUEST_MIX)  # Warm-up
+                results[variant] = run_load(port, args.concurrency, args.duration, REQUEST_MIX)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+            r = results[variant]
+            print(f"{variant:<11} {r['rps']:>8.1f} req/s  p50 {r['p50_ms']}ms  p95 {r['p95_ms']}ms  "
+                  f"p99 {r['p99_ms']}ms  errors {r['errors']}/{r['requests']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
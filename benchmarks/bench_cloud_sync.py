@@ -0,0 +1,55 @@
+"""
+Cloud Sync Benchmarks
+CloudSyncService push and pull against the in-memory Firestore stub
+
+The stub runs with zero latency, so the timings are the service's own work:
+building documents from the database, batching writes, and on pull reading
+the documents back and reconciling them with local rows. The pull re-imports
+what the push wrote, i.e. every document already exists locally (the common
+case for a device that is up to date), so the database is left unchanged.
+"""
+
+import pytest
+
+from conftest import DEMO_USER
+
+
+@pytest.fixture
+def sync_service():
+    from utils.cloud_sync import CloudSyncService
+    from utils.io_stubs import InMemoryFirestore
+
+    service = CloudSyncService()
+    service.firestore_db = InMemoryFirestore(latency_ms=0)
+    return service
+
+
+def _push(app, service):
+    with app.app_context():
+        try:
+            return service.sync_user_data(DEMO_USER, app.db_session)
+        finally:
+            app.db_session.remove()
+
+
+def _pull(app, service):
+    with app.app_context():
+        try:
+            return service.pull_from_cloud(DEMO_USER, app.db_session)
+        finally:
+            app.db_session.remove()
+
+
+@pytest.mark.benchmark(group='cloud-sync')
+def bench_cloud_sync_push(benchmark, app, dataset, sync_service):
+    result = benchmark(_push, app, sync_service)
+    assert result['success']
+    assert result['stats']['transactions'] == dataset.per_user
+
+
+@pytest.mark.benchmark(group='cloud-sync')
+def bench_cloud_sync_pull(benchmark, app, sync_service):
+    assert _push(app, sync_service)['success']
+    result = benchmark(_pull, app, sync_service)
+    assert result['success']
+    assert result['stats']['transactions'] == 0
@@ -0,0 +1,80 @@
+"""
+Endpoint Benchmarks
+Hot JSON APIs through the test client, as the development demo user
+
+Covers the dashboard stats, transaction listing (first and deepest page),
+budget usage (one budget and all of them) and the rollup-backed analytics endpoints. The seeded history
+covers 2024-2025, so analytics ranges are pinned to it. The benchmark app
+runs the query guard in 'raise' mode, so a view exceeding its
+@query_budget fails here.
+"""
+
+import pytest
+from sqlalchemy import func, select
+
+from conftest import DEMO_USER
+
+HISTORY = 'start=2024-01&end=2025-12'
+
+
+def _get_json(client, path: str):
+    response = client.get(path)
+    assert response.status_code == 200, f"{path}: {response.status_code}"
+    return response.get_json()
+
+
+@pytest.mark.benchmark(group='dashboard')
+def bench_get_stats(benchmark, client):
+    data = benchmark(_get_json, client, '/dashboard/api/stats')
+    assert data['success']
+
+
+@pytest.mark.benchmark(group='transactions')
+@pytest.mark.parametrize('page', ['first', 'deep'])
+def bench_list_transactions(benchmark, app, client, page):
+    from models.transaction import Transaction
+
+    per_page = 20
+    number = 1
+    if page == 'deep':
+        with app.app_context():
+            total = app.db_session.scalar(
+                select(func.count(Transaction.id)).where(Transaction.firebase_uid == DEMO_USER)
+            )
+            app.db_session.remove()
+        number = max(1, (total + per_page - 1) // per_page)
+
+    data = benchmark(_get_json, client, f'/transactions/api/list?page={number}&per_page={per_page}')
+    assert data['data']
+
+
+@pytest.mark.benchmark(group='budgets')
+def bench_get_budget_usage(benchmark, app, client):
+    from models.budget import Budget
+
+    with app.app_context():
+        budget_id = app.db_session.scalar(
+            select(Budget.id).where(Budget.firebase_uid == DEMO_USER).order_by(Budget.id).limit(1)
+        )
+        app.db_session.remove()
+
+    data = benchmark(_get_json, client, f'/budgets/api/usage/{budget_id}')
+    assert data['data']['spent'] > 0
+
+
+@pytest.mark.benchmark(group='budgets')
+def bench_list_budget_usage(benchmark, client):
+    data = benchmark(_get_json, client, '/budgets/api/usage')
+    assert len(data['data']) == 4
+
+
+@pytest.mark.benchmark(group='analytics')
+def bench_spending_trends(benchmark, client):
+    data = benchmark(_get_json, client, f'/analytics/api/spending-trends?{HISTORY}')
+    assert len(data['data']) == 24
+
+
+@pytest.mark.benchmark(group='analytics')
+def bench_category_breakdown(benchmark, client):
+    data = benchmark(_get_json, client, '/analytics/api/category-breakdown')
+    assert data['data']
@@ -0,0 +1,39 @@
+"""
+Startup Benchmarks
+Feature registry loading and full create_app() boots
+
+Modules stay imported between rounds, so these measure the per-app work
+(manifest/index handling, blueprint registration, lazy stubs, schema version
+check) rather than cold imports; benchmarks/startup_budget.py covers cold
+boots in a fresh interpreter.
+"""
+
+import pytest
+from flask import Flask
+
+
+def _load_registry(app):
+    from features import FeatureRegistry
+
+    flask_app = Flask('app')
+    flask_app.config.update(app.config)
+    flask_app.db_session = app.db_session
+    flask_app.db_read_session = app.db_read_session
+    registry = FeatureRegistry(flask_app)
+    registry.load_all_features()
+    return registry
+
+
+@pytest.mark.benchmark(group='startup')
+def bench_feature_registry_startup(benchmark, app):
+    registry = benchmark(_load_registry, app)
+    assert not registry.failed_features
+    assert registry.get_active_features()
+
+
+@pytest.mark.benchmark(group='startup')
+def bench_create_app(benchmark, dataset):
+    from conftest import make_app
+
+    app = benchmark.pedantic(make_app, args=(dataset.path,), rounds=5, iterations=1)
+    app.db_engine.dispose()
@@ -0,0 +1,144 @@
+"""
+Benchmark Suite Fixtures
+Seeded SQLite databases and app instances for the pytest-benchmark suite
+
+Every benchmark taking the `dataset` fixture runs once per selected dataset
+size. Datasets are generated with utils.seed (same seed, same rows) on first
+use and cached under benchmarks/.data, keyed by size, seed and schema
+version, so later runs start immediately:
+
+    cd benchmarks
+    pytest                                   # 10k and 100k rows
+    pytest --datasets 10k,100k,1m            # 1M takes ~1 minute to seed once
+    pytest --benchmark-autosave              # save results to .benchmarks/
+    pytest --benchmark-compare --benchmark-compare-fail=median:15%
+
+The apps use the development config (demo user, no Firebase) with SQL echo
+off, and request logging quietened so it does not dominate the timings.
+"""
+
+import os
+import sys
+import logging
+from typing import NamedTuple
+
+import pytest
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCHMARK_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+DEMO_USER = 'demo-user-id'
+BENCH_SEED = 42
+
+
+class Dataset(NamedTuple):
+    name: str
+    transactions: int
+    users: int
+    path: str
+
+    @property
+    def per_user(self) -> int:
+        return self.transactions // self.users
+
+
+# Name -> (transactions, users); the demo user owns one user's share
+DATASETS = {
+    '10k': (10_000, 20),
+    '100k': (100_000, 50),
+    '1m': (1_000_000, 100),
+}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('money-matrix')
+    group.addoption('--datasets', default=os.getenv('BENCH_DATASETS', '10k,100k'),
+                    help=f"comma-separated dataset sizes ({', '.join(DATASETS)})")
+    group.addoption('--data-dir', default=os.getenv('BENCH_DATA_DIR', os.path.join(BENCHMARK_DIR, '.data')),
+                    help='cache directory for seeded databases')
+
+
+def pytest_generate_tests(metafunc):
+    if 'dataset' in metafunc.fixturenames:
+        names = [name.strip().lower() for name in metafunc.config.getoption('datasets').split(',') if name.strip()]
+        unknown = [name for name in names if name not in DATASETS]
+        if unknown:
+            raise pytest.UsageError(f"Unknown dataset(s) {', '.join(unknown)} (choose from {', '.join(DATASETS)})")
+        metafunc.parametrize('dataset', names, indirect=True, scope='session')
+
+
+def _seeded_database(name: str, data_dir: str) -> str:
+    """Path of the seeded database for a dataset, generating it if missing"""
+    from sqlalchemy.orm import Session
+    from utils.db_engine import create_app_engine
+    from utils.schema import HEAD, upgrade
+    from utils.seed import seed_database
+
+    transactions, users = DATASETS[name]
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"bench_{name}_seed{BENCH_SEED}_v{HEAD}.db")
+    if os.path.exists(path):
+        return path
+
+    building = f"{path}.building"
+    for leftover in (building, f"{building}-wal", f"{building}-shm"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+
+    engine = create_app_engine(f"sqlite:///{building}", {})
+    try:
+        upgrade(engine)
+        with Session(engine) as session:
+            seed_database(session, users=users, transactions=transactions, seed=BENCH_SEED, demo_user=True)
+        with engine.connect() as connection:
+            connection.exec_driver_sql('PRAGMA wal_checkpoint(TRUNCATE)')
+    finally:
+        engine.dispose()
+    os.replace(building, path)
+    return path
+
+
+@pytest.fixture(scope='session')
+def dataset(request) -> Dataset:
+    transactions, users = DATASETS[request.param]
+    path = _seeded_database(request.param, request.config.getoption('data_dir'))
+    return Dataset(request.param, transactions, users, path)
+
+
+def make_app(database_path: str):
+    """Development app on a seeded database, without SQL echo; @query_budget overruns fail the request"""
+    import config
+    from app import create_app
+
+    config.config['benchmark'] = type('BenchmarkConfig', (config.DevelopmentConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{database_path}",
+        'SQLALCHEMY_ECHO': False,
+        'DB_POOL_LEAK_DETECTION': 'false',
+        'QUERY_GUARD': 'raise'
+    })
+    app = create_app('benchmark')
+    logging.getLogger().setLevel(logging.ERROR)
+    return app
+
+
+@pytest.fixture(scope='session')
+def app(dataset):
+    app = make_app(dataset.path)
+    yield app
+    app.db_session.remove()
+    app.db_read_session.remove()
+    app.db_engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def db_session(app):
+    session = app.db_session
+    yield session
+    session.remove()
@@ -0,0 +1,171 @@
+"""
+Gunicorn Worker Mode Load Benchmark
+Compares sync, gthread and gevent workers under the same request mix
+
+For each mode a gunicorn server is started from gunicorn.conf.py (with the
+worker class overridden) against a throwaway SQLite database, warmed up, and
+driven by concurrent keep-alive clients for a fixed duration. The app runs
+in the development configuration so the demo user authenticates API calls;
+absolute numbers include SQL echo logging, so compare modes with each other
+rather than with production.
+
+Usage:
+    python benchmarks/load_modes.py [--modes sync gthread gevent] [--workers 2]
+        [--threads 4] [--concurrency 16] [--duration 15] [--output results.json]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+import importlib.util
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REQUEST_MIX = [
+    '/dashboard/api/stats',
+    '/transactions/api/list',
+    '/analytics/api/series?granularity=month',
+    '/analytics/api/category-breakdown',
+    '/budgets/api/list',
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, workers: int, threads: int, port: int, scratch: str,
+                 extra_env: dict = None, name: str = None) -> subprocess.Popen:
+    name = name or mode
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        FLASK_ENV='development',
+        DATABASE_URI=f"sqlite:///{os.path.join(scratch, f'load_{name}.db')}",
+        GUNICORN_WORKER_CLASS=mode,
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_THREADS=str(threads),
+        GUNICORN_ACCESS_LOG=os.devnull,
+        GUNICORN_MAX_REQUESTS='0',  # Worker recycling would drop keep-alive connections mid-run
+        GUNICORN_LOG_LEVEL='warning',
+        **(extra_env or {})
+    )
+    log = open(os.path.join(scratch, f'gunicorn_{name}.log'), 'w')
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(PROJECT_ROOT, 'gunicorn.conf.py'), 'wsgi:app'],
+        cwd=scratch, env=dict(env, PYTHONPATH=PROJECT_ROOT), stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+def wait_ready(port: int, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/readyz')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"Server on port {port} did not become ready")
+
+
+def run_load(port: int, concurrency: int, duration: float, mix=REQUEST_MIX) -> dict:
+    """Drive the server; mix entries are GET paths or (method, path) pairs"""
+    mix = [entry if isinstance(entry, tuple) else ('GET', entry) for entry in mix]
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    stop_at = time.monotonic() + duration
+
+    def client(slot: int):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        i = slot
+        while time.monotonic() < stop_at:
+            method, path = mix[i % len(mix)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                connection.request(method, path)
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    errors[slot] += 1
+            except (OSError, http.client.HTTPException):
+                errors[slot] += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            latencies[slot].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    clients = [threading.Thread(target=client, args=(slot,)) for slot in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = np.array([value for slot in latencies for value in slot]) * 1000
+    total = len(samples) + sum(errors)
+    return {
+        'requests': int(total),
+        'errors': int(sum(errors)),
+        'error_rate': round(sum(errors) / total, 4) if total else 0.0,
+        'rps': round(len(samples) / elapsed, 1),
+        'p50_ms': round(float(np.percentile(samples, 50)), 2) if len(samples) else None,
+        'p95_ms': round(float(np.percentile(samples, 95)), 2) if len(samples) else None,
+        'p99_ms': round(float(np.percentile(samples, 99)), 2) if len(samples) else None
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Compare gunicorn worker classes under load')
+    parser.add_argument('--modes', nargs='+', default=['sync', 'gthread', 'gevent'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4, help='threads per gthread worker')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15.0, help='seconds of load per mode')
+    parser.add_argument('--output', help='write results as JSON')
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        for mode in args.modes:
+            if mode == 'gevent' and importlib.util.find_spec('gevent') is None:
+                print(f"{mode:<8} skipped (pip install gevent)")
+                continue
+
+            port = _free_port()
+            server = start_server(mode, args.workers, args.threads, port, scratch)
+            try:
+                wait_ready(port)
+                run_load(port, args.concurrency, min(2.0, args.duration))  # Warm-up
+                results[mode] = run_load(port, args.concurrency, args.duration)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+            r = results[mode]
+            print(f"{mode:<8} {r['rps']:>8.1f} req/s  p50 {r['p50_ms']}ms  p95 {r['p95_ms']}ms  "
+                  f"p99 {r['p99_ms']}ms  errors {r['errors']}/{r['requests']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+SQLite Concurrency Benchmark
+Many processes writing transactions to one SQLite file at once
+
+Simulates gunicorn workers: each writer process commits transactions one at
+a time through the same ORM path as the app (rollup and recurring-signature
+listeners included) while reader processes run the dashboard-style queries.
+Runs once with the default SQLite settings and once with the tuned profile
+from utils/db_engine.py, and reports throughput, commit latency and
+'database is locked' failures for each.
+
+Usage:
+    python benchmarks/sqlite_writers.py [--writers 8] [--readers 2]
+        [--transactions 200] [--modes default tuned]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import multiprocessing
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+def _engine(path: str, tuned: bool):
+    from sqlalchemy import create_engine
+    from config import Config
+    from utils.db_engine import configure_sqlite
+
+    engine = create_engine(f'sqlite:///{path}')
+    config = {key: getattr(Config, key) for key in dir(Config) if key.startswith('SQLITE_')}
+    config['SQLITE_TUNING'] = tuned
+    configure_sqlite(engine, config)
+    return engine
+
+
+def _session_factory(engine):
+    from sqlalchemy.orm import sessionmaker
+    from utils.rollups import register_rollup_listeners
+    from utils.recurring import register_signature_listeners
+
+    factory = sessionmaker(bind=engine)
+    register_rollup_listeners(factory)
+    register_signature_listeners(factory)
+    return factory
+
+
+def writer(path: str, tuned: bool, worker: int, count: int, start_at: float, results):
+    from sqlalchemy.exc import OperationalError
+    from models.transaction import Transaction
+
+    factory = _session_factory(_engine(path, tuned))
+    rng = random.Random(worker)
+    latencies, locked, other_errors = [], 0, 0
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    for _ in range(count):
+        session = factory()
+        started = time.perf_counter()
+        try:
+            session.add(Transaction(
+                firebase_uid=f'bench-user-{worker % 4}',
+                amount=Decimal(f'{rng.uniform(1, 200):.2f}'),
+                type='expense',
+                description=rng.choice(['GROCERY MART', 'COFFEE HOUSE', 'FUEL STATION', 'NETFLIX']),
+                date=date(2026, 1, 1) + timedelta(days=rng.randrange(365)),
+                is_deleted=False
+            ))
+            session.commit()
+            latencies.append(time.perf_counter() - started)
+        except OperationalError as e:
+            session.rollback()
+            if 'locked' in str(e):
+                locked += 1
+            else:
+                other_errors += 1
+        finally:
+            session.close()
+
+    results.put(('writer', latencies, locked, other_errors, time.time()))
+
+
+def reader(path: str, tuned: bool, worker: int, stop_at: float, start_at: float, results):
+    from sqlalchemy import func
+    from sqlalchemy.exc import OperationalError
+    from models.transaction import Transaction
+    from models.rollup import MonthlyCategoryRollup
+
+    factory = _session_factory(_engine(path, tuned))
+    latencies, locked, other_errors = [], 0, 0
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    while time.time() < stop_at:
+        session = factory()
+        started = time.perf_counter()
+        try:
+            session.query(Transaction).filter(Transaction.firebase_uid == f'bench-user-{worker % 4}')\
+                .order_by(Transaction.date.desc()).limit(50).all()
+            session.query(MonthlyCategoryRollup.month, func.sum(MonthlyCategoryRollup.total))\
+                .group_by(MonthlyCategoryRollup.month).all()
+            latencies.append(time.perf_counter() - started)
+        except OperationalError as e:
+            if 'locked' in str(e):
+                locked += 1
+            else:
+                other_errors += 1
+        finally:
+            session.close()
+
+    results.put(('reader', latencies, locked, other_errors, None))
+
+
+def run_mode(mode: str, args, scratch: str) -> dict:
+    from utils.schema import upgrade
+
+    path = os.path.join(scratch, f'writers_{mode}.db')
+    tuned = mode == 'tuned'
+    upgrade(_engine(path, tuned))
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    start_at = time.time() + 2.0  # Let every process import before the clock starts
+    writers = [
+        context.Process(target=writer, args=(path, tuned, i, args.transactions, start_at, results))
+        for i in range(args.writers)
+    ]
+    for process in writers:
+        process.start()
+
+    # Readers keep querying for --reader-seconds, overlapping the writes
+    stop_at = start_at + args.reader_seconds
+    readers = [
+        context.Process(target=reader, args=(path, tuned, i, stop_at, start_at, results))
+        for i in range(args.readers)
+    ]
+    for process in readers:
+        process.start()
+
+    collected = [results.get() for _ in range(len(writers) + len(readers))]
+    writes_finished = max(finished for kind, _, _, _, finished in collected if kind == 'writer')
+    for process in writers + readers:
+        process.join()
+
+    write_latencies = np.array([v for kind, lat, _, _, _ in collected if kind == 'writer' for v in lat]) * 1000
+    read_latencies = np.array([v for kind, lat, _, _, _ in collected if kind == 'reader' for v in lat]) * 1000
+
+    def pct(values, q):
+        return round(float(np.percentile(values, q)), 2) if len(values) else None
+
+    return {
+        'commits': len(write_latencies),
+        'commits_per_s': round(len(write_latencies) / max(writes_finished - start_at, 1e-9), 1),
+        'commit_p50_ms': pct(write_latencies, 50),
+        'commit_p99_ms': pct(write_latencies, 99),
+        'write_locked': sum(locked for kind, _, locked, _, _ in collected if kind == 'writer'),
+        'write_errors': sum(errors for kind, _, _, errors, _ in collected if kind == 'writer'),
+        'reads': len(read_latencies),
+        'read_p50_ms': pct(read_latencies, 50),
+        'read_locked': sum(locked for kind, _, locked, _, _ in collected if kind == 'reader')
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Concurrent SQLite writers: default vs tuned profile')
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=2)
+    parser.add_argument('--transactions', type=int, default=200, help='commits per writer')
+    parser.add_argument('--reader-seconds', type=float, default=10.0)
+    parser.add_argument('--modes', nargs='+', default=['default', 'tuned'], choices=['default', 'tuned'])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        for mode in args.modes:
+            r = run_mode(mode, args, scratch)
+            print(f"{mode:<8} {r['commits']} commits ({r['commits_per_s']}/s, p50 {r['commit_p50_ms']}ms, "
+                  f"p99 {r['commit_p99_ms']}ms), locked {r['write_locked']}, other errors {r['write_errors']}; "
+                  f"{r['reads']} reads (p50 {r['read_p50_ms']}ms), locked {r['read_locked']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
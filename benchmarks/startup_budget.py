@@ -0,0 +1,79 @@
+"""
+Startup Time Regression Benchmark
+Fails (exit code 1) when create_app() boot time goes over budget
+
+Each run boots the app in a fresh interpreter against a throwaway SQLite
+database (so schema migrations do real work), using utils.startup_profiler. The
+median run is compared against the budgets and its report can be saved.
+
+Usage:
+    python benchmarks/startup_budget.py [--runs 5] [--budget-ms 2000]
+        [--app-budget-ms 600] [--report startup_report.json]
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils.startup_profiler import profile_startup  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='create_app() startup time budget check')
+    parser.add_argument('--runs', type=int, default=5, help='boots to measure (median is used)')
+    parser.add_argument('--env', default='development', help='configuration name')
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('STARTUP_BUDGET_MS', 2000)),
+                        help='budget for interpreter start + imports + create_app()')
+    parser.add_argument('--app-budget-ms', type=float, default=float(os.getenv('STARTUP_APP_BUDGET_MS', 600)),
+                        help='budget for create_app() alone')
+    parser.add_argument('--report', help='write the median run report (JSON) here')
+    args = parser.parse_args(argv)
+
+    reports = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for run in range(args.runs):
+            os.environ['DATABASE_URI'] = f"sqlite:///{os.path.join(scratch, f'startup_{run}.db')}"
+            reports.append(profile_startup(args.env, cwd=PROJECT_ROOT))
+
+    reports.sort(key=lambda report: report['wall_ms'])
+    median = reports[len(reports) // 2]
+    wall = statistics.median(report['wall_ms'] for report in reports)
+    app_ms = statistics.median(report['total_ms'] for report in reports)
+
+    print(f"Startup over {args.runs} runs (median): wall {wall:.0f}ms, create_app {app_ms:.0f}ms, "
+          f"imports {median['import_total_ms']:.0f}ms")
+    for phase in median['phases']:
+        print(f"  {phase['name']:<24} {phase['ms']:>8.1f}ms")
+    for name, timing in sorted(median['features'].items()):
+        print(f"  feature {name:<16} {timing.get('import_ms', 0.0) + timing.get('init_ms', 0.0):>8.1f}ms")
+    print("Slowest imports:")
+    for item in median['imports'][:10]:
+        print(f"  {item['module']:<40} {item['cumulative_us'] / 1000:>8.1f}ms")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(median, f, indent=2)
+
+    failures = []
+    if wall > args.budget_ms:
+        failures.append(f"wall time {wall:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+    if app_ms > args.app_budget_ms:
+        failures.append(f"create_app() {app_ms:.0f}ms exceeds budget {args.app_budget_ms:.0f}ms")
+    if median['failed_features']:
+        failures.append(f"features failed to load: {', '.join(median['failed_features'])}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if not failures:
+        print("OK: startup within budget")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -23,6 +23,64 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URI', 'sqlite:///database.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = DEBUG
+    # Optional read replica: GET handlers read from it (see utils/db_routing.py)
+    DATABASE_REPLICA_URI = os.getenv('DATABASE_REPLICA_URI', '')
+    
+    # Logging (see utils/logging_setup.py): written by a background thread;
+    # the file rotates by size and is shared safely by gunicorn workers
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVELS = os.getenv('LOG_LEVELS', '')  # Per-logger overrides: 'sqlalchemy.engine=WARNING,werkzeug=INFO'
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')  # 'text' or 'json'
+    LOG_FILE = os.getenv('LOG_FILE', 'app.log')  # Empty = stdout only
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+    
+    # Connection pool (server databases; file-based SQLite uses the same pool)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))  # Seconds to wait for a connection
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # Seconds before reconnecting
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))  # 0 = no limit (PostgreSQL/MySQL)
+    # Warn about connections not returned to the pool (default: on when DEBUG)
+    DB_POOL_LEAK_DETECTION = os.getenv('DB_POOL_LEAK_DETECTION', '')
+    DB_POOL_LEAK_THRESHOLD_S = float(os.getenv('DB_POOL_LEAK_THRESHOLD_S', 10))  # Seconds before a held connection is reported
+    
+    # Prometheus /metrics (requires prometheus-client; see utils/metrics.py)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_AUTH_TOKEN = os.getenv('METRICS_AUTH_TOKEN', '')  # 'Bearer <token>'; required outside DEBUG/TESTING
+    
+    # Request timing (see utils/request_timing.py); the Server-Timing header
+    # exposes internal timings, so by default it is only sent when DEBUG/TESTING
+    SERVER_TIMING_HEADER = os.getenv('SERVER_TIMING_HEADER', '')
+    SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', 500))  # 0 disables the slow-request log
+    
+    # N+1 detection and @query_budget checks (see utils/query_guard.py):
+    # 'raise', 'warn' or 'off'; empty = raise when TESTING, warn when DEBUG
+    QUERY_GUARD = os.getenv('QUERY_GUARD', '')
+    N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', 5))  # Repeats of one statement per request
+    
+    # /readyz reuses database check results for this long (see utils/health.py)
+    HEALTH_CHECK_CACHE_S = float(os.getenv('HEALTH_CHECK_CACHE_S', 2))
+    
+    # Sampling profiler (see utils/sampling_profiler.py): profiles requests sent
+    # with 'X-Profile: 1' by an admin, plus this fraction of all requests
+    PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', 'True').lower() == 'true'
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', 5))  # Time between stack samples
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+    PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', 100))  # Newest profiles kept
+    
+    # Apply pending schema migrations at boot (under a leader lock); disable
+    # to run 'flask db upgrade' as a separate release step instead
+    SCHEMA_AUTO_UPGRADE = os.getenv('SCHEMA_AUTO_UPGRADE', 'True').lower() == 'true'
+    
+    # SQLite performance profile (see utils/db_engine.py); ignored for other databases
+    SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'True').lower() == 'true'
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024))
     
     # Firebase Configuration
     FIREBASE_CREDENTIALS_PATH = os.getenv('FIREBASE_CREDENTIALS', 'S:/MONEY_MATRIX/MONEY_MATRIX/firebase_credentials.json')
@@ -36,8 +94,15 @@ class Config:
     FIREBASE_APP_ID = os.getenv('FIREBASE_APP_ID', '1:123456789:web:abcdef')
     FIREBASE_MEASUREMENT_ID = os.getenv('FIREBASE_MEASUREMENT_ID', 'G-XXXXXXXXXX')
     
+    # Cloud sync backend: 'firestore', or 'stub' for the in-memory client (utils/io_stubs.py)
+    FIRESTORE_BACKEND = os.getenv('FIRESTORE_BACKEND', 'firestore')
+    
     # AI/ML Configuration
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
+    GEMINI_BACKEND = os.getenv('GEMINI_BACKEND', 'gemini')  # 'stub' = canned local responses
+    IO_STUB_LATENCY_MS = float(os.getenv('IO_STUB_LATENCY_MS', 50))  # Simulated round trip for stubs
+    CATEGORIZER_MODEL_PATH = os.getenv('CATEGORIZER_MODEL_PATH', 'categorizer.joblib')
+    CATEGORIZER_MIN_CONFIDENCE = float(os.getenv('CATEGORIZER_MIN_CONFIDENCE', 0.6))
     
     # Security Configuration
     CSRF_ENABLED = os.getenv('CSRF_ENABLED', 'True').lower() == 'true'
@@ -48,12 +113,16 @@ class Config:
     # CORS Configuration
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
     
+    # Async views: await independent Firestore/Gemini calls concurrently
+    ASYNC_IO_CONCURRENT = os.getenv('ASYNC_IO_CONCURRENT', 'True').lower() == 'true'
+    
     # Application Settings
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max file upload
     UPLOAD_FOLDER = 'uploads'
     
     # Feature System
     FEATURES_DIR = 'features'
+    FEATURE_LOAD_WORKERS = int(os.getenv('FEATURE_LOAD_WORKERS', 4))  # 1 = sequential
     
     @staticmethod
     def init_app(app):
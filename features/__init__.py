@@ -3,21 +3,263 @@ Feature Registry and Loader
 Implements fail-safe, self-healing modular architecture
 
 This module provides:
-- Automatic feature discovery by scanning features/ directory
+- Automatic feature discovery by scanning features/ directory, cached in a
+  discovery index (features/.index.json) keyed by manifest mtimes; see
+  'python -m features --help' to validate manifests and prebuild the index
 - Exception-isolated feature loading (failures don't crash the app)
-- Dependency resolution
-- Graceful degradation
+- Dependency resolution: manifests are ordered topologically by
+  "dependencies" (cycles are rejected) and by "priority" (lower loads first)
+- Concurrent loading: independent features are imported in parallel, one
+  dependency "wave" at a time; init_feature() and Blueprint registration
+  then run on the calling thread in priority order
+- Graceful degradation: dependents of a failed feature are skipped
+- Lazy features: manifests with "lazy": true are registered as a thin stub
+  and only imported on their first request
+- Per-feature import/init timings (FeatureRegistry.feature_timings)
 """
 
 import os
 import json
+import time
 import logging
 import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
-from flask import Blueprint
+from flask import Blueprint, Flask, jsonify, request
+
+from utils.metrics import record_feature_load
 
 logger = logging.getLogger(__name__)
 
+# Manifests without a "priority" load after those with one
+DEFAULT_PRIORITY = 100
+
+FEATURES_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_FILENAME = '.index.json'
+INDEX_VERSION = 2
+REQUIRED_FIELDS = ['name', 'display_name', 'version', 'enabled']
+
+
+# ==================== DISCOVERY INDEX ====================
+
+def _listing(features_dir: str) -> List[str]:
+    """Candidate feature names (special '_'/'.' entries such as the index are skipped)"""
+    return sorted(item for item in os.listdir(features_dir) if not item.startswith(('_', '.')))
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def scan_features(features_dir: str) -> Dict:
+    """
+    Scan a features directory and parse every manifest
+    
+    Args:
+        features_dir: Directory containing feature packages
+    
+    Returns:
+        Index dict: {'version', 'listing', 'entries': [{'dir', 'init_mtime',
+        'manifest_mtime', 'manifest' or 'error'}]}, entries sorted by dir
+    """
+    listing = _listing(features_dir)
+    entries = []
+    for item in listing:
+        item_path = os.path.join(features_dir, item)
+        
+        # Skip non-directories
+        if not os.path.isdir(item_path):
+            continue
+        
+        manifest_path = os.path.join(item_path, 'manifest.json')
+        entry = {
+            'dir': item,
+            'init_mtime': _mtime(os.path.join(item_path, '__init__.py')),
+            'manifest_mtime': _mtime(manifest_path)
+        }
+        
+        if entry['manifest_mtime'] is None:
+            entry['error'] = "no manifest.json found"
+        else:
+            try:
+                with open(manifest_path, 'r') as f:
+                    manifest = json.load(f)
+                missing_fields = [field for field in REQUIRED_FIELDS if field not in manifest]
+                if missing_fields:
+                    entry['error'] = f"missing manifest fields: {missing_fields}"
+                else:
+                    entry['manifest'] = manifest
+            except json.JSONDecodeError as e:
+                entry['error'] = f"invalid manifest JSON: {e}"
+            except Exception as e:
+                entry['error'] = f"error reading manifest: {e}"
+        
+        entries.append(entry)
+    
+    return {'version': INDEX_VERSION, 'listing': listing, 'entries': entries}
+
+
+def index_is_fresh(index: Dict, features_dir: str) -> bool:
+    """
+    Check a cached index against the filesystem without parsing manifests
+    Added/removed features show up in the directory listing; adding, editing
+    or removing a manifest or package __init__.py changes its recorded mtime.
+    Directory mtimes are not used: they also change when Python writes
+    __pycache__ on first import, which would invalidate a prebuilt index.
+    """
+    if index.get('version') != INDEX_VERSION or index.get('listing') != _listing(features_dir):
+        return False
+    for entry in index.get('entries', []):
+        item_path = os.path.join(features_dir, entry['dir'])
+        if entry.get('init_mtime') != _mtime(os.path.join(item_path, '__init__.py')):
+            return False
+        if entry['manifest_mtime'] != _mtime(os.path.join(item_path, 'manifest.json')):
+            return False
+    return True
+
+
+def write_index(index: Dict, features_dir: str) -> str:
+    """Write the discovery index atomically; returns its path"""
+    path = os.path.join(features_dir, INDEX_FILENAME)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+    return path
+
+
+def load_index(features_dir: str) -> Dict:
+    """
+    Discovery index for a features directory, rebuilt when stale
+    
+    Workers normally read the prebuilt index; if it is missing or stale the
+    directory is rescanned and the index rewritten (best effort: read-only
+    deployments simply rescan on each boot).
+    """
+    path = os.path.join(features_dir, INDEX_FILENAME)
+    try:
+        with open(path, 'r') as f:
+            index = json.load(f)
+        if index_is_fresh(index, features_dir):
+            return index
+        logger.info("Feature discovery index is stale; rescanning")
+    except (OSError, ValueError):
+        pass
+    
+    index = scan_features(features_dir)
+    try:
+        write_index(index, features_dir)
+    except OSError as e:
+        logger.debug(f"Could not write feature discovery index: {e}")
+    return index
+
+
+def validate_manifests(index: Dict, features_dir: str = FEATURES_DIR) -> List[str]:
+    """
+    Build-time manifest validation (stricter than runtime discovery)
+    
+    Args:
+        index: Discovery index from scan_features()
+        features_dir: Directory the index was built from
+    
+    Returns:
+        List of error messages (empty when every manifest is valid)
+    """
+    errors = []
+    manifests = []
+    for entry in index['entries']:
+        item = entry['dir']
+        if 'error' in entry:
+            errors.append(f"{item}: {entry['error']}")
+            continue
+        
+        manifest = entry['manifest']
+        manifests.append(manifest)
+        if manifest['name'] != item:
+            errors.append(f"{item}: name '{manifest['name']}' does not match directory")
+        if not isinstance(manifest['enabled'], bool):
+            errors.append(f"{item}: 'enabled' must be true or false")
+        if not isinstance(manifest.get('dependencies', []), list):
+            errors.append(f"{item}: 'dependencies' must be a list")
+        if not isinstance(manifest.get('priority', DEFAULT_PRIORITY), int):
+            errors.append(f"{item}: 'priority' must be an integer")
+        url_prefix = manifest.get('url_prefix')
+        if url_prefix is not None and not (isinstance(url_prefix, str) and url_prefix.startswith('/')):
+            errors.append(f"{item}: 'url_prefix' must start with '/'")
+        if manifest.get('lazy') and url_prefix is None:
+            errors.append(f"{item}: lazy features must declare 'url_prefix'")
+        if not os.path.exists(os.path.join(features_dir, item, '__init__.py')):
+            errors.append(f"{item}: missing __init__.py")
+    
+    enabled = [m for m in manifests if m.get('enabled', True) and isinstance(m.get('dependencies', []), list)]
+    _, rejected = resolve_load_order(enabled)
+    errors.extend(f"{name}: {reason}" for name, reason in sorted(rejected.items()))
+    return errors
+
+
+def resolve_load_order(manifests: List[Dict]) -> Tuple[List[List[Dict]], Dict[str, str]]:
+    """
+    Group features into dependency-respecting waves
+    
+    Every feature in a wave depends only on features in earlier waves, so
+    the members of one wave can be initialized concurrently. Within a wave
+    features are sorted by priority, then name.
+    
+    Args:
+        manifests: Enabled feature manifests
+    
+    Returns:
+        Tuple of (waves, rejected) where rejected maps feature name to the
+        reason it cannot be loaded (unknown dependency or dependency cycle)
+    """
+    by_name = {m['name']: m for m in manifests}
+    rejected: Dict[str, str] = {}
+    
+    for name, manifest in by_name.items():
+        missing = [dep for dep in manifest.get('dependencies', []) if dep not in by_name]
+        if missing:
+            rejected[name] = f"Missing dependencies: {', '.join(missing)}"
+    
+    # Kahn's algorithm, one wave per round
+    remaining = {name: set(m.get('dependencies', [])) for name, m in by_name.items() if name not in rejected}
+    sort_key = lambda m: (m.get('priority', DEFAULT_PRIORITY), m['name'])
+    waves: List[List[Dict]] = []
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps & remaining.keys() and not deps & rejected.keys()]
+        blocked = [name for name, deps in remaining.items() if deps & rejected.keys()]
+        for name in blocked:
+            failed_deps = sorted(remaining[name] & rejected.keys())
+            rejected[name] = f"Dependency unavailable: {', '.join(failed_deps)}"
+            del remaining[name]
+        if blocked:
+            continue
+        if not ready:
+            cycle = _find_cycle(remaining)
+            for name in remaining:
+                rejected[name] = f"Dependency cycle: {' -> '.join(cycle)}"
+            break
+        waves.append(sorted((by_name[name] for name in ready), key=sort_key))
+        for name in ready:
+            del remaining[name]
+    
+    return waves, rejected
+
+
+def _find_cycle(graph: Dict[str, set]) -> List[str]:
+    """One dependency cycle in a graph where every node has unresolved dependencies"""
+    node = min(graph)
+    path: List[str] = []
+    seen: Dict[str, int] = {}
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = min(dep for dep in graph[node] if dep in graph)
+    return path[seen[node]:] + [node]
+
 
 class FeatureRegistry:
     """
@@ -33,92 +275,105 @@ class FeatureRegistry:
             app: Flask application instance
         """
         self.app = app
-        self.features_dir = os.path.join(os.getcwd(), 'features')
+        self.features_dir = FEATURES_DIR
         self.discovered_features: List[Dict] = []
         self.loaded_features: List[str] = []
         self.failed_features: Dict[str, str] = {}
         self.active_blueprints: List[Blueprint] = []
+        self.lazy_features: Dict[str, 'LazyFeature'] = {}
+        self.feature_timings: Dict[str, Dict[str, float]] = {}
     
     def load_all_features(self) -> int:
         """
         Discover and load all features
         
+        Features are loaded in dependency waves. Within a wave, only the
+        module imports run on a thread pool; init_feature() calls and
+        Blueprint registration then run on this thread one by one in
+        priority order, so app setup and route registration stay
+        deterministic and single-threaded.
+        
         Returns:
             Number of successfully loaded features
         """
         # Discover features
         self.discover_features()
         
-        # Load each feature with exception isolation
+        enabled = []
         for feature_meta in self.discovered_features:
-            feature_name = feature_meta['name']
-            
             # Skip if disabled in manifest
             if not feature_meta.get('enabled', True):
-                logger.info(f"Feature '{feature_name}' is disabled in manifest")
+                logger.info(f"Feature '{feature_meta['name']}' is disabled in manifest")
+                continue
+            enabled.append(feature_meta)
+        
+        waves, rejected = resolve_load_order(enabled)
+        for feature_name, error_msg in rejected.items():
+            self.failed_features[feature_name] = error_msg
+            logger.warning(f"Feature '{feature_name}' skipped: {error_msg}")
+        
+        max_workers = max(1, int(self.app.config.get('FEATURE_LOAD_WORKERS', 4)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='feature-loader') as executor:
+            for wave in waves:
+                self.load_wave(wave, executor)
+        
+        self.log_timings()
+        return len(self.loaded_features)
+    
+    def load_wave(self, wave: List[Dict], executor: ThreadPoolExecutor):
+        """
+        Load one wave of mutually independent features
+        
+        Args:
+            wave: Manifests whose dependencies are all resolved, in priority order
+            executor: Pool used to import eager features
+        """
+        pending = {}
+        for feature_meta in wave:
+            feature_name = feature_meta['name']
+            failed_deps = [dep for dep in feature_meta.get('dependencies', []) if dep in self.failed_features]
+            if failed_deps:
+                self.failed_features[feature_name] = f"Dependency failed: {', '.join(failed_deps)}"
+                logger.warning(f"Feature '{feature_name}' skipped: dependency failed ({', '.join(failed_deps)})")
+                continue
+            if not feature_meta.get('lazy', False):
+                pending[feature_name] = executor.submit(self._import_module, feature_name)
+        
+        for feature_meta in wave:
+            feature_name = feature_meta['name']
+            if feature_name in self.failed_features:
                 continue
             
-            # Load feature safely
-            success, error_msg = self.load_feature_safely(feature_name)
+            # Register the feature (or a stub that defers it to its first request)
+            if feature_meta.get('lazy', False):
+                success, error_msg = self.register_lazy_feature(feature_meta)
+            else:
+                imported = pending[feature_name].result()
+                success, error_msg = self.register_feature(*self.initialize_feature(feature_name, imported))
             
             if success:
                 self.loaded_features.append(feature_name)
-                logger.info(f"Feature '{feature_name}' loaded successfully")
+                logger.info(f"Feature '{feature_name}' {'registered (lazy)' if feature_name in self.lazy_features else 'loaded successfully'}")
             else:
                 self.failed_features[feature_name] = error_msg or "Unknown error"
                 logger.warning(f"Feature '{feature_name}' failed to load: {error_msg}")
-        
-        return len(self.loaded_features)
     
     def discover_features(self):
         """
-        Scan features/ directory and discover feature modules
+        Discover feature modules from the (cached) discovery index
         """
         if not os.path.exists(self.features_dir):
             logger.warning(f"Features directory not found: {self.features_dir}")
             return
         
-        # List all subdirectories in features/
-        for item in os.listdir(self.features_dir):
-            item_path = os.path.join(self.features_dir, item)
-            
-            # Skip if not a directory
-            if not os.path.isdir(item_path):
-                continue
-            
-            # Skip special directories
-            if item.startswith('_') or item.startswith('.'):
+        for entry in load_index(self.features_dir)['entries']:
+            if 'error' in entry:
+                logger.warning(f"Skipping '{entry['dir']}': {entry['error']}")
                 continue
             
-            # Check for manifest.json
-            manifest_path = os.path.join(item_path, 'manifest.json')
-            if not os.path.exists(manifest_path):
-                logger.warning(f"Skipping '{item}': no manifest.json found")
-                continue
-            
-            # Load and validate manifest
-            try:
-                with open(manifest_path, 'r') as f:
-                    manifest = json.load(f)
-                
-                # Validate required fields
-                required_fields = ['name', 'display_name', 'version', 'enabled']
-                missing_fields = [field for field in required_fields if field not in manifest]
-                
-                if missing_fields:
-                    logger.warning(f"Skipping '{item}': missing manifest fields: {missing_fields}")
-                    continue
-                
-                # Add to discovered features
-                self.discovered_features.append(manifest)
-                logger.debug(f"Discovered feature: {manifest['name']} v{manifest['version']}")
-            
-            except json.JSONDecodeError as e:
-                logger.warning(f"Skipping '{item}': invalid manifest JSON: {e}")
-                continue
-            except Exception as e:
-                logger.warning(f"Skipping '{item}': error reading manifest: {e}")
-                continue
+            manifest = entry['manifest']
+            self.discovered_features.append(manifest)
+            logger.debug(f"Discovered feature: {manifest['name']} v{manifest['version']}")
         
         logger.info(f"Discovered {len(self.discovered_features)} feature(s)")
     
@@ -132,34 +387,138 @@ class FeatureRegistry:
         Returns:
             Tuple of (success: bool, error_message: Optional[str])
         """
+        return self.register_feature(*self.import_feature(feature_name))
+    
+    def register_feature(self, blueprint: Optional[Blueprint],
+                         error_msg: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Register an imported feature's Blueprint with the app
+        
+        Args:
+            blueprint: Blueprint from import_feature(), or None if it failed
+            error_msg: Error from import_feature()
+        
+        Returns:
+            Tuple of (success: bool, error_message: Optional[str])
+        """
+        if blueprint is None:
+            return False, error_msg
+        
+        try:
+            # Register Blueprint with app
+            self.app.register_blueprint(blueprint)
+            self.active_blueprints.append(blueprint)
+            return True, None
+        except Exception as e:
+            return False, f"Unexpected error: {type(e).__name__}: {str(e)}"
+    
+    def import_feature(self, feature_name: str) -> Tuple[Optional[Blueprint], Optional[str]]:
+        """
+        Import a feature and call its init_feature(), recording timings
+        
+        Args:
+            feature_name: Name of the feature to import
+        
+        Returns:
+            Tuple of (blueprint or None, error_message or None)
+        """
+        return self.initialize_feature(feature_name, self._import_module(feature_name))
+    
+    def _import_module(self, feature_name: str) -> Tuple[Optional[object], float, Optional[str]]:
+        """
+        Import a feature's package without touching the app or the registry
+        (the only step that may run on a loader thread)
+        
+        Returns:
+            Tuple of (module or None, import time in ms, error_message or None)
+        """
+        started = time.perf_counter()
         try:
-            # Import feature module dynamically
             module = importlib.import_module(f'features.{feature_name}')
-            
+        except ImportError as e:
+            return None, 0.0, f"Import failed: {str(e)}"
+        except AttributeError as e:
+            return None, 0.0, f"Missing required attribute: {str(e)}"
+        except Exception as e:
+            return None, 0.0, f"Unexpected error: {type(e).__name__}: {str(e)}"
+        return module, round((time.perf_counter() - started) * 1000, 2), None
+    
+    def initialize_feature(self, feature_name: str,
+                           imported: Tuple[Optional[object], float, Optional[str]]) -> Tuple[Optional[Blueprint], Optional[str]]:
+        """
+        Call an imported feature's init_feature() and record its timings
+        
+        Args:
+            feature_name: Name of the feature
+            imported: Result of _import_module()
+        
+        Returns:
+            Tuple of (blueprint or None, error_message or None)
+        """
+        module, import_ms, error_msg = imported
+        if module is None:
+            return None, error_msg
+        
+        timings = self.feature_timings.setdefault(feature_name, {})
+        timings['import_ms'] = import_ms
+        try:
             # Check for required init_feature function
             if not hasattr(module, 'init_feature'):
-                return False, f"Missing init_feature() function"
+                return None, f"Missing init_feature() function"
             
             # Call initialization with Flask app instance
+            started = time.perf_counter()
             result = module.init_feature(self.app)
+            timings['init_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            record_feature_load(feature_name, timings['import_ms'], timings['init_ms'])
             
             # Validate Blueprint returned
             if not isinstance(result, Blueprint):
-                return False, f"init_feature() must return Flask Blueprint, got {type(result)}"
-            
-            # Register Blueprint with app
-            self.app.register_blueprint(result)
-            self.active_blueprints.append(result)
+                return None, f"init_feature() must return Flask Blueprint, got {type(result)}"
             
-            return True, None
+            return result, None
         
         except ImportError as e:
-            return False, f"Import failed: {str(e)}"
+            return None, f"Import failed: {str(e)}"
         except AttributeError as e:
-            return False, f"Missing required attribute: {str(e)}"
+            return None, f"Missing required attribute: {str(e)}"
+        except Exception as e:
+            return None, f"Unexpected error: {type(e).__name__}: {str(e)}"
+    
+    def register_lazy_feature(self, feature_meta: Dict) -> Tuple[bool, Optional[str]]:
+        """
+        Register a stub Blueprint that imports the real feature on first request
+        
+        Args:
+            feature_meta: Feature manifest
+        
+        Returns:
+            Tuple of (success: bool, error_message: Optional[str])
+        """
+        try:
+            lazy = LazyFeature(self, feature_meta)
+            self.app.register_blueprint(lazy.stub)
+            self.active_blueprints.append(lazy.stub)
+            self.lazy_features[feature_meta['name']] = lazy
+            return True, None
         except Exception as e:
             return False, f"Unexpected error: {type(e).__name__}: {str(e)}"
     
+    def log_timings(self):
+        """Log per-feature import/init times, slowest first"""
+        totals = {
+            name: timing.get('import_ms', 0.0) + timing.get('init_ms', 0.0)
+            for name, timing in self.feature_timings.items()
+        }
+        if not totals:
+            return
+        summary = ', '.join(
+            f"{name} {total:.1f}ms (import {self.feature_timings[name].get('import_ms', 0.0):.1f}, "
+            f"init {self.feature_timings[name].get('init_ms', 0.0):.1f})"
+            for name, total in sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        )
+        logger.info(f"Feature load times: {summary}")
+    
     def get_active_features(self) -> List[str]:
         """Get list of successfully loaded features"""
         return self.loaded_features.copy()
@@ -173,5 +532,157 @@ class FeatureRegistry:
         return {
             'discovered': len(self.discovered_features),
             'loaded': len(self.loaded_features),
-            'failed': len(self.failed_features)
+            'failed': len(self.failed_features),
+            'lazy_pending': len([f for f in self.lazy_features.values() if not f.is_loaded])
         }
+
+
+# Per-blueprint setup Flask keys by blueprint name (None = app-wide)
+_BLUEPRINT_HOOKS = ('before_request_funcs', 'after_request_funcs', 'teardown_request_funcs',
+                    'url_value_preprocessors', 'url_default_functions', 'template_context_processors')
+
+
+def _copy_rule(rule):
+    """Unbound copy of a URL rule, keeping Flask's automatic OPTIONS flag"""
+    copy = rule.empty()
+    copy.provide_automatic_options = getattr(rule, 'provide_automatic_options', False)
+    return copy
+
+
+class LazyFeature:
+    """
+    Deferred feature: a stub Blueprint that catches every URL under the
+    feature's url_prefix and, on first request, imports the real feature.
+    
+    On load the real Blueprint is registered on a private Flask app (Flask
+    refuses new Blueprints once the real app has served a request), and its
+    URL rules, view functions, request hooks and error handlers are merged
+    into the real app. The app gets a new URL map with the real rules, which
+    are more specific than the stub's catch-all, so later requests are routed
+    to the real endpoints directly: url_for() works and metrics and logs see
+    the real endpoint names. The first request is dispatched by the stub,
+    which runs the Blueprint's before_request hooks itself.
+    Limitations: url_for() fails for lazy endpoints until the feature has
+    loaded, and lazy features cannot own CLI commands (Blueprint.cli groups
+    are only added to the app at startup).
+    """
+    
+    METHODS = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+    
+    def __init__(self, registry: FeatureRegistry, feature_meta: Dict):
+        self.registry = registry
+        self.name = feature_meta['name']
+        self.url_prefix = feature_meta.get('url_prefix', f"/{self.name}")
+        self._lock = threading.Lock()
+        self._url_map = None
+        self._error = None
+        
+        template_folder = os.path.join(registry.features_dir, self.name, 'templates')
+        self.stub = Blueprint(
+            self.name,
+            f'features.{self.name}',
+            template_folder=template_folder if os.path.isdir(template_folder) else None,
+            url_prefix=self.url_prefix
+        )
+        self.stub.add_url_rule('/', 'lazy_dispatch', self.dispatch, methods=self.METHODS)
+        self.stub.add_url_rule('/<path:subpath>', 'lazy_dispatch', self.dispatch, methods=self.METHODS)
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self._url_map is not None
+    
+    def load(self) -> bool:
+        """Import and initialize the real feature (once, thread-safe)"""
+        if self._url_map is not None or self._error is not None:
+            return self._error is None
+        
+        with self._lock:
+            if self._url_map is not None or self._error is not None:
+                return self._error is None
+            
+            blueprint, error_msg = self.registry.import_feature(self.name)
+            if blueprint is None:
+                self._error = error_msg
+                self.registry.failed_features[self.name] = error_msg
+                logger.error(f"Lazy feature '{self.name}' failed to load: {error_msg}")
+                return False
+            
+            if (blueprint.url_prefix or '') != self.url_prefix:
+                logger.warning(
+                    f"Lazy feature '{self.name}' url_prefix {blueprint.url_prefix!r} does not match "
+                    f"manifest {self.url_prefix!r}; its routes may be unreachable"
+                )
+            
+            # Private app that performs the Blueprint registration
+            router = Flask(blueprint.import_name)
+            router.register_blueprint(blueprint)
+            self._merge_into_app(router, blueprint.name)
+            self._url_map = router.url_map
+            
+            timing = self.registry.feature_timings.get(self.name, {})
+            logger.info(
+                f"Lazy feature '{self.name}' loaded on first request "
+                f"(import {timing.get('import_ms', 0.0):.1f}ms, init {timing.get('init_ms', 0.0):.1f}ms)"
+            )
+            return True
+    
+    def _merge_into_app(self, router: Flask, blueprint_name: str):
+        """Copy the Blueprint's rules, views, hooks and error handlers into the real app"""
+        app = self.registry.app
+        
+        def owned(key) -> bool:
+            return key is not None and (key == blueprint_name or key.startswith(f"{blueprint_name}."))
+        
+        rules = [rule for rule in router.url_map.iter_rules() if owned(rule.endpoint.rpartition('.')[0])]
+        for rule in rules:
+            app.view_functions[rule.endpoint] = router.view_functions[rule.endpoint]
+        for attribute in _BLUEPRINT_HOOKS:
+            for key, functions in getattr(router, attribute).items():
+                if owned(key):
+                    getattr(app, attribute).setdefault(key, []).extend(functions)
+        for key, handlers_by_code in router.error_handler_spec.items():
+            if owned(key):
+                for code, handlers in handlers_by_code.items():
+                    app.error_handler_spec[key][code].update(handlers)
+        
+        # A new map swapped in whole, so requests matching concurrently never
+        # see a half-updated one
+        current = app.url_map
+        url_map = app.url_map_class(
+            [_copy_rule(rule) for rule in current.iter_rules()] + [_copy_rule(rule) for rule in rules],
+            default_subdomain=current.default_subdomain,
+            strict_slashes=current.strict_slashes,
+            merge_slashes=current.merge_slashes,
+            redirect_defaults=current.redirect_defaults,
+            converters=current.converters,
+            sort_parameters=current.sort_parameters,
+            sort_key=current.sort_key,
+            host_matching=current.host_matching
+        )
+        app.url_map = url_map
+    
+    def dispatch(self, subpath: str = ''):
+        """
+        Route a request that matched the stub: the feature's first request(s),
+        or a URL under the prefix that none of its routes accept (404/405)
+        """
+        hooks_pending = not self.is_loaded
+        if not self.load():
+            return jsonify({'error': f"Feature '{self.name}' is unavailable"}), 503
+        
+        app = self.registry.app
+        adapter = self._url_map.bind_to_environ(request.environ)
+        request.url_rule, request.view_args = adapter.match(return_rule=True)
+        
+        if hooks_pending:
+            # The Blueprint's hooks did not exist yet when this request was preprocessed
+            for name in reversed(request.blueprints):
+                for function in app.url_value_preprocessors.get(name, ()):
+                    function(request.endpoint, request.view_args)
+            for name in reversed(request.blueprints):
+                for function in app.before_request_funcs.get(name, ()):
+                    response = app.ensure_sync(function)()
+                    if response is not None:
+                        return response
+        
+        return app.ensure_sync(app.view_functions[request.endpoint])(**request.view_args)
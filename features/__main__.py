@@ -0,0 +1,47 @@
+"""
+Feature Discovery Tooling
+Validate manifests and prebuild the discovery index at build time
+
+Usage:
+    python -m features --check           # validate manifests, exit 1 on errors
+    python -m features --build           # write features/.index.json
+    python -m features --check --build   # both (e.g. in a Docker build step)
+"""
+
+import sys
+import argparse
+
+from features import FEATURES_DIR, scan_features, validate_manifests, write_index
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m features', description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--check', action='store_true', help='validate every manifest')
+    parser.add_argument('--build', action='store_true', help='write the discovery index')
+    parser.add_argument('--dir', default=FEATURES_DIR, help='features directory (default: this package)')
+    args = parser.parse_args(argv)
+
+    if not (args.check or args.build):
+        parser.print_help()
+        return 2
+
+    index = scan_features(args.dir)
+
+    if args.check:
+        errors = validate_manifests(index, args.dir)
+        for error in errors:
+            print(f"ERROR {error}", file=sys.stderr)
+        if errors:
+            print(f"{len(errors)} manifest error(s)", file=sys.stderr)
+            return 1
+        print(f"{len(index['entries'])} feature manifest(s) OK")
+
+    if args.build:
+        path = write_index(index, args.dir)
+        print(f"Wrote {path}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Admin Feature
+Operator endpoints (admin custom claim required)
+"""
+
+from flask import Blueprint
+
+
+def init_feature(app):
+    """
+    Initialize admin feature
+    
+    Args:
+        app: Flask application instance
+    
+    Returns:
+        Blueprint: Configured Flask Blueprint
+    """
+    bp = Blueprint(
+        'admin',
+        __name__,
+        url_prefix='/admin'
+    )
+    
+    # Import and register routes
+    from .routes import register_routes
+    register_routes(bp, app)
+    
+    return bp
@@ -0,0 +1,56 @@
+"""
+Admin Routes
+Sampling profiler output (see utils/sampling_profiler.py)
+"""
+
+import os
+import logging
+
+from flask import jsonify, request, send_from_directory
+from utils.auth_decorators import require_admin
+from utils.sampling_profiler import list_profiles, profile_dir
+
+logger = logging.getLogger(__name__)
+
+
+def register_routes(bp, app):
+    """Register admin routes"""
+
+    @bp.route('/api/profiles', methods=['GET'])
+    @require_admin
+    def get_profiles():
+        """
+        List recent request profiles, newest first
+        GET /admin/api/profiles?limit=50&endpoint=dashboard.get_stats
+        """
+        try:
+            limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+            endpoint = request.args.get('endpoint')
+
+            profiles = list_profiles(profile_dir(app), None if endpoint else limit)
+            if endpoint:
+                profiles = [p for p in profiles if p.get('endpoint') == endpoint][:limit]
+
+            return jsonify({
+                'success': True,
+                'data': profiles,
+                'profiler_enabled': getattr(app, 'profiler', None) is not None
+            }), 200
+
+        except Exception as e:
+            logger.error(f"Error listing profiles: {str(e)}")
+            return jsonify({'error': 'Failed to list profiles'}), 500
+
+    @bp.route('/api/profiles/<name>', methods=['GET'])
+    @require_admin
+    def get_profile(name):
+        """
+        Download one profile as collapsed stacks (flamegraph.pl / speedscope input)
+        GET /admin/api/profiles/<name>
+        """
+        directory = profile_dir(app)
+        filename = f"{name}.collapsed"
+        if os.path.basename(filename) != filename or not os.path.isfile(os.path.join(directory, filename)):
+            return jsonify({'error': 'Profile not found'}), 404
+
+        return send_from_directory(directory, filename, mimetype='text/plain', as_attachment=True)
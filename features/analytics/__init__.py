@@ -14,4 +14,7 @@ def init_feature(app):
     from .routes import register_routes
     register_routes(bp, app)
     
+    from .commands import register_commands
+    register_commands(bp, app)
+    
     return bp
@@ -0,0 +1,284 @@
+"""
+Unusual Spend Detection
+Vectorized robust statistics over transaction histories
+
+Each expense is compared against the trailing window of earlier expenses in
+the same (user, category) group using the median and the median absolute
+deviation (MAD), which are not dragged around by the outliers they are meant
+to catch. A second pass looks for recurring charges (same normalized
+description, constant amount) whose amount suddenly changes.
+
+All scoring works on NumPy column arrays, so one call can score a single
+user or many users loaded in one query (see score_users).
+"""
+
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.histories import TransactionArrays, description_codes, group_positions, load_histories
+
+logger = logging.getLogger(__name__)
+
+# Trailing window of earlier transactions used for the robust statistics
+DEFAULT_WINDOW = 30
+# Minimum earlier transactions in a group before anything is scored
+DEFAULT_MIN_HISTORY = 5
+# Robust z-score above which an expense is flagged
+DEFAULT_THRESHOLD = 3.5
+# Lower bound for the spread, relative to the median (avoids MAD == 0 blowups)
+MIN_RELATIVE_SCALE = 0.05
+# Consecutive identical charges that make a description "recurring"
+RECURRING_MIN_REPEATS = 3
+# Days of history loaded ahead of the reporting window by the API
+HISTORY_DAYS = 365
+# Longest reporting window and most anomalies per user served by the API
+MAX_REPORT_DAYS = 3650
+MAX_LIMIT = 500
+# Rows scored per block; bounds peak memory to roughly CHUNK_SIZE * window floats
+CHUNK_SIZE = 250_000
+
+# 0.6745 is the 75th percentile of the standard normal: MAD / 0.6745 ~ sigma
+_MAD_TO_SIGMA = 0.6745
+
+
+def _sorted_median(sorted_rows: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Median of the first `counts` entries of each pre-sorted row"""
+    width = sorted_rows.shape[1]
+    # Full windows (the common case) share one pair of column indexes
+    median = (sorted_rows[:, (width - 1) // 2] + sorted_rows[:, width // 2]) / 2
+    partial = np.flatnonzero(counts < width)
+    if len(partial):
+        low = np.maximum((counts[partial] - 1) // 2, 0)
+        high = counts[partial] // 2
+        median[partial] = (sorted_rows[partial, low] + sorted_rows[partial, np.minimum(high, width - 1)]) / 2
+    return median
+
+
+def _sort_order(group_keys: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """
+    Row order by (group, day) from a single argsort on a packed int64 key
+    The order of same-day rows within a group is unspecified
+    """
+    day_offsets = days - days.min()
+    span = int(day_offsets.max()) + 1
+    return np.argsort(group_keys * span + day_offsets)
+
+
+def rolling_robust_stats(values: np.ndarray, positions: np.ndarray, window: int,
+                         rows: Optional[np.ndarray] = None):
+    """
+    Trailing median and MAD of the previous `window` values within each group
+
+    Args:
+        values: Amounts sorted by (group, time)
+        positions: Position of each row within its group
+        window: Number of earlier rows to consider
+        rows: Indexes of the rows to compute stats for (default: all)
+
+    Returns:
+        Tuple of (median, mad, history_count) arrays aligned with `rows`;
+        stats are NaN for rows without history
+    """
+    if rows is None:
+        rows = np.arange(len(values))
+    n = len(rows)
+    median = np.full(n, np.nan)
+    mad = np.full(n, np.nan)
+    history = np.minimum(positions[rows], window)
+
+    padded = np.concatenate([np.full(window, np.nan, dtype=np.float32), values.astype(np.float32)])
+    # windows[i] holds values[i - window : i], i.e. strictly earlier rows
+    windows = sliding_window_view(padded, window)
+    offsets = np.arange(window, dtype=np.int64)[None, :]
+
+    for start in range(0, n, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, n)
+        counts = history[start:stop]
+        block = windows[rows[start:stop]]
+        # Blank out entries that belong to the previous group; NaN sorts last
+        partial = np.flatnonzero(counts < window)
+        if len(partial):
+            block[partial] = np.where(
+                offsets < (window - counts[partial])[:, None], np.float32(np.nan), block[partial]
+            )
+        block.sort(axis=1)
+        block_median = _sorted_median(block, counts)
+
+        # Reuse the block for absolute deviations from the median
+        block -= block_median[:, None]
+        np.abs(block, out=block)
+        block.sort(axis=1)
+        block_mad = _sorted_median(block, counts)
+
+        has_history = counts > 0
+        median[start:stop] = np.where(has_history, block_median, np.nan)
+        mad[start:stop] = np.where(has_history, block_mad, np.nan)
+
+    return median, mad, history
+
+
+def detect_anomalies(arrays: TransactionArrays,
+                     since: Optional[date] = None,
+                     window: int = DEFAULT_WINDOW,
+                     threshold: float = DEFAULT_THRESHOLD,
+                     min_history: int = DEFAULT_MIN_HISTORY) -> Dict[str, np.ndarray]:
+    """
+    Score transactions and flag unusual spend and recurring-charge changes
+
+    Args:
+        arrays: Column arrays from load_histories
+        since: Only score transactions on or after this date; earlier
+            history still feeds the trailing statistics
+        window: Trailing window size for the robust statistics
+        threshold: Robust z-score above which a charge is an outlier
+        min_history: Earlier charges required in a group before scoring
+
+    Returns:
+        Dict of arrays aligned with `arrays` (same row order):
+        score, expected, is_outlier, is_recurring_change, previous_amount
+    """
+    n = len(arrays.ids)
+    result = {
+        'score': np.zeros(n),
+        'expected': np.full(n, np.nan),
+        'is_outlier': np.zeros(n, dtype=bool),
+        'is_recurring_change': np.zeros(n, dtype=bool),
+        'previous_amount': np.full(n, np.nan)
+    }
+    if n == 0:
+        return result
+
+    in_range = np.ones(n, dtype=bool)
+    if since is not None:
+        in_range = arrays.days >= np.datetime64(since, 'D').astype(np.int64)
+
+    # Outliers: per (user, category), ordered by date
+    group_keys = arrays.users * (arrays.categories.max() + 2) + (arrays.categories + 1)
+    order = _sort_order(group_keys, arrays.days)
+    positions = group_positions(group_keys[order])
+    amounts = arrays.amounts[order]
+
+    # Rows without enough history cannot be flagged, so skip their statistics
+    rows = np.flatnonzero((positions >= min_history) & in_range[order])
+    median, mad, _ = rolling_robust_stats(amounts, positions, window, rows)
+    scale = np.maximum(mad / _MAD_TO_SIGMA, MIN_RELATIVE_SCALE * np.abs(median))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = np.where(scale > 0, (amounts[rows] - median) / scale, 0.0)
+    z = np.nan_to_num(z, nan=0.0, posinf=0.0, neginf=0.0)
+
+    scored = order[rows]
+    result['score'][scored] = z
+    result['expected'][scored] = median
+    # Only unusually *high* spend is interesting
+    result['is_outlier'][scored] = z > threshold
+
+    # Recurring charge changes: per (user, normalized description), ordered by date
+    repeats = RECURRING_MIN_REPEATS
+    if n <= repeats:
+        return result
+
+    codes = description_codes(arrays.descriptions)
+    group_keys = arrays.users * (codes.max() + 2) + (codes + 1)
+    order = _sort_order(group_keys, arrays.days)
+    sorted_codes = codes[order]
+    positions = group_positions(group_keys[order])
+    amounts = arrays.amounts[order]
+
+    # prior[k][i] = amount of the charge k+1 rows before row i
+    prior = np.stack([
+        np.concatenate([np.full(k + 1, np.nan), amounts[:-(k + 1)]]) for k in range(repeats)
+    ])
+    last = prior[0]
+    with np.errstate(invalid='ignore'):
+        steady = (positions >= repeats) & (prior.max(axis=0) - prior.min(axis=0) <= 0.01)
+        changed = np.abs(amounts - last) > np.maximum(0.01, 0.01 * np.abs(last))
+    flagged = steady & changed & (sorted_codes >= 0) & in_range[order]
+
+    result['is_recurring_change'][order] = flagged
+    result['previous_amount'][order] = np.where(flagged, last, np.nan)
+
+    return result
+
+
+def _anomaly_records(arrays: TransactionArrays, scores: Dict[str, np.ndarray],
+                     rows: np.ndarray) -> List[Dict]:
+    """Build JSON-ready dicts for flagged rows"""
+    records = []
+    for i in rows:
+        is_change = bool(scores['is_recurring_change'][i])
+        records.append({
+            'transaction_id': int(arrays.ids[i]),
+            'date': str(np.datetime64(int(arrays.days[i]), 'D')),
+            'amount': round(float(arrays.amounts[i]), 2),
+            'category_id': None if arrays.categories[i] < 0 else int(arrays.categories[i]),
+            'description': arrays.descriptions[i],
+            'kind': 'recurring_change' if is_change else 'outlier',
+            'score': round(float(scores['score'][i]), 2),
+            'expected': None if np.isnan(scores['expected'][i]) else round(float(scores['expected'][i]), 2),
+            'previous_amount': round(float(scores['previous_amount'][i]), 2) if is_change else None
+        })
+    return records
+
+
+def find_anomalies(arrays: TransactionArrays, since: Optional[date] = None,
+                   limit: Optional[int] = None, **options) -> Dict[str, List[Dict]]:
+    """
+    Flagged transactions per user, newest first
+
+    Args:
+        arrays: Column arrays from load_histories (may hold many users)
+        since: Only report anomalies on or after this date (history before
+            it is still used for the statistics)
+        limit: Maximum anomalies reported per user
+        **options: Passed through to detect_anomalies
+
+    Returns:
+        Dict mapping Firebase UID to a list of anomaly dicts
+
+    Raises:
+        ValueError: If limit is not positive
+    """
+    if limit is not None and limit < 1:
+        raise ValueError('limit must be positive')
+
+    scores = detect_anomalies(arrays, since=since, **options)
+    flagged = scores['is_outlier'] | scores['is_recurring_change']
+
+    rows = np.flatnonzero(flagged)
+    # Group by user, newest first within each user
+    rows = rows[np.lexsort((-arrays.ids[rows], -arrays.days[rows], arrays.users[rows]))]
+
+    results: Dict[str, List[Dict]] = {uid: [] for uid in arrays.user_uids}
+    if len(rows) == 0:
+        return results
+
+    user_rows = np.split(rows, np.flatnonzero(np.diff(arrays.users[rows])) + 1)
+    for chunk in user_rows:
+        uid = arrays.user_uids[arrays.users[chunk[0]]]
+        results[uid] = _anomaly_records(arrays, scores, chunk[:limit])
+
+    return results
+
+
+def score_users(db_session, firebase_uids: Optional[Sequence[str]] = None,
+                since: Optional[date] = None, history_since: Optional[date] = None,
+                limit: Optional[int] = None, **options) -> Dict[str, List[Dict]]:
+    """
+    Batch mode: load and score many users with one query and one vectorized pass
+
+    Args:
+        db_session: SQLAlchemy session
+        firebase_uids: Users to score (default: every user)
+        since: Only report anomalies on or after this date
+        history_since: Ignore history before this date entirely
+        limit: Maximum anomalies reported per user
+
+    Returns:
+        Dict mapping Firebase UID to a list of anomaly dicts
+    """
+    arrays = load_histories(db_session, firebase_uids, history_since)
+    return find_anomalies(arrays, since=since, limit=limit, **options)
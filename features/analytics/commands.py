@@ -0,0 +1,66 @@
+"""Analytics CLI Commands"""
+import click
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def register_commands(bp, app):
+    """Register analytics CLI commands (flask analytics <command>)"""
+    
+    @bp.cli.command('rebuild-rollups')
+    @click.option('--user', 'firebase_uid', default=None, help='Only rebuild rollups for this Firebase UID')
+    def rebuild_rollups_command(firebase_uid):
+        """Recompute monthly category rollups from raw transactions"""
+        from utils.rollups import rebuild_rollups
+        
+        db_session = app.db_session
+        try:
+            rows = rebuild_rollups(db_session, firebase_uid)
+            click.echo(f"Rebuilt {rows} rollup rows")
+        finally:
+            db_session.remove()
+    
+    @bp.cli.command('rebuild-recurring')
+    @click.option('--user', 'firebase_uids', multiple=True, help='Firebase UID to rebuild (repeatable, default: all users)')
+    def rebuild_recurring_command(firebase_uids):
+        """Recompute recurring-transaction signatures from full histories"""
+        from utils.recurring import rebuild_signatures
+        
+        db_session = app.db_session
+        try:
+            count = rebuild_signatures(db_session, list(firebase_uids) or None)
+            click.echo(f"Rebuilt {count} recurring signatures")
+        finally:
+            db_session.remove()
+    
+    @bp.cli.command('score-anomalies')
+    @click.option('--user', 'firebase_uids', multiple=True, help='Firebase UID to score (repeatable, default: all users)')
+    @click.option('--days', default=30, show_default=True, help='Report anomalies from the last N days')
+    @click.option('--limit', default=None, type=int, help='Maximum anomalies reported per user')
+    @click.option('--output', type=click.File('w'), default='-', help='JSON lines output file (default: stdout)')
+    def score_anomalies_command(firebase_uids, days, limit, output):
+        """Batch-score users for unusual spend (one JSON line per user)"""
+        import json
+        import time
+        from datetime import date, timedelta
+        from .anomalies import score_users, HISTORY_DAYS
+        
+        db_session = app.db_session
+        since = date.today() - timedelta(days=days)
+        started = time.perf_counter()
+        try:
+            results = score_users(
+                db_session,
+                list(firebase_uids) or None,
+                since=since,
+                history_since=since - timedelta(days=HISTORY_DAYS),
+                limit=limit
+            )
+        finally:
+            db_session.remove()
+        
+        for firebase_uid, anomalies in results.items():
+            output.write(json.dumps({'firebase_uid': firebase_uid, 'anomalies': anomalies}) + '\n')
+        
+        logger.info(f"Scored {len(results)} users in {time.perf_counter() - started:.2f}s")
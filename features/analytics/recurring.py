@@ -0,0 +1,63 @@
+"""
+Recurring Transaction Queries
+Active subscriptions and projected charges from recurring signatures
+
+Signatures are detected and kept current by utils.recurring.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from models.recurring import RecurringSignature
+from utils.recurring import STALE_CADENCES
+
+# Longest projection window served by /api/subscriptions/upcoming
+MAX_UPCOMING_DAYS = 365
+
+
+# ==================== QUERIES ====================
+
+def _is_stale(signature: RecurringSignature, today: date) -> bool:
+    overdue = (today - signature.next_expected).days
+    return overdue > STALE_CADENCES * signature.cadence_days
+
+
+def active_subscriptions(db_session, firebase_uid: str, today: Optional[date] = None) -> List[RecurringSignature]:
+    """Recurring signatures for a user that have not lapsed"""
+    today = today or date.today()
+    signatures = db_session.query(RecurringSignature).filter(
+        RecurringSignature.firebase_uid == firebase_uid,
+        RecurringSignature.is_recurring == True  # noqa: E712
+    ).order_by(RecurringSignature.next_expected).all()
+    return [s for s in signatures if not _is_stale(s, today)]
+
+
+def upcoming_charges(signatures: List[RecurringSignature], days: int,
+                     today: Optional[date] = None) -> List[Dict]:
+    """
+    Project charges from active signatures over the next `days` days
+
+    Returns:
+        List of {date, amount, description, category_id, signature_id} sorted by date
+    """
+    today = today or date.today()
+    horizon = today + timedelta(days=days)
+    charges = []
+
+    for signature in signatures:
+        step = timedelta(days=max(1, round(signature.interval_mean)))
+        charge_date = signature.next_expected
+        while charge_date < today:
+            charge_date += step
+        while charge_date <= horizon:
+            charges.append({
+                'date': charge_date.isoformat(),
+                'amount': float(signature.last_amount),
+                'description': signature.description,
+                'category_id': signature.category_id,
+                'signature_id': signature.id
+            })
+            charge_date += step
+
+    charges.sort(key=lambda charge: charge['date'])
+    return charges
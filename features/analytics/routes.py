@@ -1,11 +1,44 @@
 """Analytics Routes"""
 from flask import render_template, jsonify, request, g
 from utils.auth_decorators import login_required
+from utils.db_routing import get_session
+from utils.query_guard import query_budget
+from datetime import datetime
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_month(value):
+    """
+    Parse a YYYY-MM (or full ISO date) query parameter into (year, month)
+    
+    Returns:
+        Tuple of (year, month), or None when value is empty
+    """
+    if not value:
+        return None
+    try:
+        year, month = value[:7].split('-')
+        year, month = int(year), int(month)
+    except ValueError:
+        raise ValueError(f"Invalid month '{value}', expected YYYY-MM")
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month '{value}', expected YYYY-MM")
+    return year, month
+
+
+def _parse_date(value):
+    """Parse a YYYY-MM-DD query parameter, or None when value is empty"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
 def register_routes(bp, app):
     """Register analytics routes"""
     
@@ -17,35 +50,33 @@ def register_routes(bp, app):
     
     @bp.route('/api/spending-trends', methods=['GET'])
     @login_required
+    @query_budget(1)
     def spending_trends():
-        """Get spending trends"""
+        """
+        Get monthly spending trends
+        GET /analytics/api/spending-trends?start=YYYY-MM&end=YYYY-MM
+        Defaults to the current calendar year
+        """
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
-            from models.transaction import Transaction
-            from sqlalchemy import func, extract
-            from datetime import datetime
+            from utils.rollups import monthly_totals
             
             current_year = datetime.now().year
+            try:
+                start = _parse_month(request.args.get('start')) or (current_year, 1)
+                end = _parse_month(request.args.get('end')) or (current_year, 12)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
             
-            # Get monthly spending for current year
-            monthly_data = db_session.query(
-                extract('month', Transaction.date).label('month'),
-                func.sum(Transaction.amount).label('total')
-            ).filter(
-                Transaction.firebase_uid == user_uid,
-                Transaction.type == 'expense',
-                Transaction.is_deleted == False,
-                extract('year', Transaction.date) == current_year
-            ).group_by(extract('month', Transaction.date))\
-            .order_by(extract('month', Transaction.date))\
-            .all()
+            monthly_data = monthly_totals(db_session, user_uid, 'expense', start, end)
             
             return jsonify({
                 'success': True,
                 'data': [{
-                    'month': int(row.month),
+                    'year': row.year,
+                    'month': row.month,
                     'amount': float(row.total) if row.total else 0.0
                 } for row in monthly_data]
             }), 200
@@ -56,24 +87,26 @@ def register_routes(bp, app):
     
     @bp.route('/api/category-breakdown', methods=['GET'])
     @login_required
+    @query_budget(1)
     def category_breakdown():
-        """Get spending by category"""
+        """
+        Get spending by category
+        GET /analytics/api/category-breakdown?start=YYYY-MM&end=YYYY-MM
+        Both bounds are optional; omitting them covers the full history
+        """
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
-            from models.transaction import Transaction
-            from sqlalchemy import func
+            from utils.rollups import category_totals
             
-            category_data = db_session.query(
-                Transaction.category_id,
-                func.sum(Transaction.amount).label('total')
-            ).filter(
-                Transaction.firebase_uid == user_uid,
-                Transaction.type == 'expense',
-                Transaction.is_deleted == False
-            ).group_by(Transaction.category_id)\
-            .all()
+            try:
+                start = _parse_month(request.args.get('start'))
+                end = _parse_month(request.args.get('end'))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            category_data = category_totals(db_session, user_uid, 'expense', start, end)
             
             return jsonify({
                 'success': True,
@@ -87,13 +120,193 @@ def register_routes(bp, app):
             logger.error(f"Error fetching category breakdown: {str(e)}")
             return jsonify({'error': 'Failed to fetch breakdown'}), 500
     
+    @bp.route('/api/series', methods=['GET'])
+    @login_required
+    @query_budget(1)
+    def series():
+        """
+        Get resampled income/expense totals as parallel arrays
+        GET /analytics/api/series?start=YYYY-MM-DD&end=YYYY-MM-DD
+            &granularity=day|week|month|quarter|year&type=income|expense&category_id=1,2
+        Defaults to the current year to date, monthly, both types
+        """
+        try:
+            user_uid = g.user_id
+            db_session = get_session(app)
+            
+            from datetime import date
+            from .series import build_series, TYPES
+            
+            try:
+                today = date.today()
+                start = _parse_date(request.args.get('start')) or date(today.year, 1, 1)
+                end = _parse_date(request.args.get('end')) or today
+                granularity = request.args.get('granularity', 'month')
+                types = [request.args['type']] if request.args.get('type') else list(TYPES)
+                category_ids = [
+                    int(value)
+                    for raw in request.args.getlist('category_id')
+                    for value in raw.split(',') if value
+                ]
+                data = build_series(db_session, user_uid, start, end, granularity, types, category_ids or None)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            return jsonify({
+                'success': True,
+                'granularity': granularity,
+                'start': start.isoformat(),
+                'end': end.isoformat(),
+                'data': data
+            }), 200
+            
+        except Exception as e:
+            logger.error(f"Error building series: {str(e)}")
+            return jsonify({'error': 'Failed to fetch series'}), 500
+    
+    @bp.route('/api/anomalies', methods=['GET'])
+    @login_required
+    @query_budget(1)
+    def anomalies():
+        """
+        Get unusual spend and recurring-charge changes
+        GET /analytics/api/anomalies?days=90&limit=50
+        days: 1-3650, limit: 1-500
+        """
+        try:
+            user_uid = g.user_id
+            db_session = get_session(app)
+            
+            from datetime import date, timedelta
+            from .anomalies import score_users, HISTORY_DAYS, MAX_REPORT_DAYS, MAX_LIMIT
+            
+            try:
+                days = int(request.args.get('days', 90))
+                limit = int(request.args.get('limit', 50))
+            except ValueError:
+                return jsonify({'error': 'days and limit must be integers'}), 400
+            if not 1 <= days <= MAX_REPORT_DAYS:
+                return jsonify({'error': f'days must be between 1 and {MAX_REPORT_DAYS}'}), 400
+            if not 1 <= limit <= MAX_LIMIT:
+                return jsonify({'error': f'limit must be between 1 and {MAX_LIMIT}'}), 400
+            
+            since = date.today() - timedelta(days=days)
+            results = score_users(
+                db_session,
+                [user_uid],
+                since=since,
+                history_since=since - timedelta(days=HISTORY_DAYS),
+                limit=limit
+            )
+            
+            return jsonify({
+                'success': True,
+                'data': results.get(user_uid, [])
+            }), 200
+            
+        except Exception as e:
+            logger.error(f"Error detecting anomalies: {str(e)}")
+            return jsonify({'error': 'Failed to detect anomalies'}), 500
+    
+    @bp.route('/api/subscriptions', methods=['GET'])
+    @login_required
+    @query_budget(1)
+    def subscriptions():
+        """
+        Get detected recurring charges (subscriptions, bills)
+        GET /analytics/api/subscriptions
+        """
+        try:
+            user_uid = g.user_id
+            db_session = get_session(app)
+            
+            from .recurring import active_subscriptions
+            
+            signatures = active_subscriptions(db_session, user_uid)
+            
+            return jsonify({
+                'success': True,
+                'data': [s.to_dict() for s in signatures]
+            }), 200
+            
+        except Exception as e:
+            logger.error(f"Error fetching subscriptions: {str(e)}")
+            return jsonify({'error': 'Failed to fetch subscriptions'}), 500
+    
+    @bp.route('/api/subscriptions/upcoming', methods=['GET'])
+    @login_required
+    @query_budget(1)
+    def upcoming_subscription_charges():
+        """
+        Get projected recurring charges
+        GET /analytics/api/subscriptions/upcoming?days=30 (at most 365 days ahead)
+        """
+        try:
+            user_uid = g.user_id
+            db_session = get_session(app)
+            
+            from .recurring import active_subscriptions, upcoming_charges, MAX_UPCOMING_DAYS
+            
+            try:
+                days = int(request.args.get('days', 30))
+            except ValueError:
+                return jsonify({'error': 'days must be an integer'}), 400
+            days = min(max(days, 0), MAX_UPCOMING_DAYS)
+            
+            charges = upcoming_charges(active_subscriptions(db_session, user_uid), days)
+            
+            return jsonify({
+                'success': True,
+                'data': charges,
+                'total': round(sum(charge['amount'] for charge in charges), 2)
+            }), 200
+            
+        except Exception as e:
+            logger.error(f"Error projecting subscription charges: {str(e)}")
+            return jsonify({'error': 'Failed to project charges'}), 500
+    
+    def prediction_inputs(user_uid):
+        """User profile and last 50 transactions for the Gemini prompts, or (None, None)"""
+        db_session = get_session(app)
+        
+        # Get user data
+        from models.user import User
+        user = db_session.query(User).filter(User.firebase_uid == user_uid).first()
+        
+        if not user:
+            return None, None
+        
+        user_data = {
+            'age': user.age if hasattr(user, 'age') else None,
+            'income': user.income if hasattr(user, 'income') else None,
+            'dependents': user.dependents if hasattr(user, 'dependents') else None
+        }
+        
+        # Get transaction history
+        from models.transaction import Transaction
+        transactions = db_session.query(Transaction).filter(
+            Transaction.firebase_uid == user_uid,
+            Transaction.is_deleted == False
+        ).order_by(Transaction.date.desc()).limit(50).all()  # Last 50 transactions
+        
+        transaction_history = [{
+            'date': transaction.date.isoformat() if transaction.date else None,
+            'amount': float(transaction.amount),
+            'category': transaction.category_id,
+            'description': transaction.description
+        } for transaction in transactions]
+        
+        return user_data, transaction_history
+    
     @bp.route('/api/predictions', methods=['GET'])
     @login_required
-    def financial_predictions():
-        """Get financial predictions using Gemini AI"""
+    async def financial_predictions():
+        """
+        Get financial predictions using Gemini AI
+        Async view: the insights and predictions requests run concurrently
+        """
         try:
             user_uid = g.user_id
-            db_session = app.db_session
             
             # Import ML helpers
             try:
@@ -101,36 +314,17 @@ def register_routes(bp, app):
             except ValueError as e:
                 return jsonify({'error': str(e)}), 500
             
-            # Get user data
-            from models.user import User
-            user = db_session.query(User).filter(User.firebase_uid == user_uid).first()
+            from utils.async_io import on_request_thread, gather_io
+            user_data, transaction_history = await on_request_thread(prediction_inputs)(user_uid)
             
-            if not user:
+            if user_data is None:
                 return jsonify({'error': 'User not found'}), 404
             
-            user_data = {
-                'age': user.age if hasattr(user, 'age') else None,
-                'income': user.income if hasattr(user, 'income') else None,
-                'dependents': user.dependents if hasattr(user, 'dependents') else None
-            }
-            
-            # Get transaction history
-            from models.transaction import Transaction
-            transactions = db_session.query(Transaction).filter(
-                Transaction.firebase_uid == user_uid,
-                Transaction.is_deleted == False
-            ).order_by(Transaction.date.desc()).limit(50).all()  # Last 50 transactions
-            
-            transaction_history = [{
-                'date': transaction.date.isoformat() if transaction.date else None,
-                'amount': float(transaction.amount),
-                'category': transaction.category_id,
-                'description': transaction.description
-            } for transaction in transactions]
-            
-            # Get insights and predictions
-            insights = get_financial_insights(user_data, transaction_history)
-            predictions = predict_future_spending(transaction_history)
+            # Get insights and predictions (blocking Gemini SDK calls, overlapped)
+            insights, predictions = await gather_io(
+                asyncio.to_thread(get_financial_insights, user_data, transaction_history),
+                asyncio.to_thread(predict_future_spending, transaction_history)
+            )
             
             return jsonify({
                 'success': True,
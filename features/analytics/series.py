@@ -0,0 +1,167 @@
+"""
+Time Series Resampling
+Income/expense totals over arbitrary ranges and granularities
+
+Totals come from a single grouped query: month-aligned ranges at month or
+coarser granularity read the monthly rollup table, everything else groups
+raw transactions by day. The grouped rows are then bucketed into periods
+with NumPy and returned as parallel arrays (one entry per period, empty
+periods included) so charts can plot them directly.
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func
+
+from models.rollup import MonthlyCategoryRollup
+from models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ('day', 'week', 'month', 'quarter', 'year')
+TYPES = ('income', 'expense')
+# Upper bound on returned periods (about 13 years of daily points)
+MAX_PERIODS = 5000
+
+_MONTHLY = ('month', 'quarter', 'year')
+
+
+def period_starts(days: np.ndarray, granularity: str) -> np.ndarray:
+    """
+    Start date of the period containing each day
+
+    Args:
+        days: datetime64[D] array
+        granularity: One of GRANULARITIES
+
+    Returns:
+        datetime64[D] array of period start dates
+    """
+    if granularity == 'day':
+        return days
+    if granularity == 'week':
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        day_numbers = days.astype(np.int64)
+        return (day_numbers - (day_numbers + 3) % 7).astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    if granularity == 'quarter':
+        month_numbers = months.astype(np.int64)
+        months = (month_numbers - month_numbers % 3).astype('datetime64[M]')
+    elif granularity == 'year':
+        months = days.astype('datetime64[Y]').astype('datetime64[M]')
+    return months.astype('datetime64[D]')
+
+
+def period_axis(start: date, end: date, granularity: str) -> np.ndarray:
+    """Every period start between start and end, inclusive"""
+    first, last = period_starts(np.array([start, end], dtype='datetime64[D]'), granularity)
+    if granularity == 'day':
+        return np.arange(first, last + 1, dtype='datetime64[D]')
+    if granularity == 'week':
+        return np.arange(first, last + 1, 7, dtype='datetime64[D]')
+    step = {'month': 1, 'quarter': 3, 'year': 12}[granularity]
+    months = np.arange(first.astype('datetime64[M]'), last.astype('datetime64[M]') + 1, step)
+    return months.astype('datetime64[D]')
+
+
+def _is_month_aligned(start: date, end: date) -> bool:
+    return start.day == 1 and (end + timedelta(days=1)).day == 1
+
+
+def _grouped_rows(db_session, firebase_uid: str, start: date, end: date, granularity: str,
+                  types: Sequence[str], category_ids: Optional[Sequence[int]]):
+    """
+    One grouped query returning (bucket day, type, total, count) rows
+    Uses the monthly rollup when the range and granularity allow it
+    """
+    if granularity in _MONTHLY and _is_month_aligned(start, end):
+        rollup = MonthlyCategoryRollup
+        period = rollup.year * 12 + (rollup.month - 1)
+        query = db_session.query(
+            rollup.year, rollup.month, rollup.type,
+            func.sum(rollup.total), func.sum(rollup.count)
+        ).filter(
+            rollup.firebase_uid == firebase_uid,
+            rollup.type.in_(types),
+            period >= start.year * 12 + (start.month - 1),
+            period <= end.year * 12 + (end.month - 1)
+        )
+        if category_ids:
+            query = query.filter(rollup.category_id.in_(category_ids))
+        rows = query.group_by(rollup.year, rollup.month, rollup.type).all()
+        return [(date(year, month, 1), txn_type, total, count) for year, month, txn_type, total, count in rows]
+
+    query = db_session.query(
+        Transaction.date, Transaction.type,
+        func.sum(Transaction.amount), func.count(Transaction.id)
+    ).filter(
+        Transaction.firebase_uid == firebase_uid,
+        Transaction.is_deleted == False,  # noqa: E712
+        Transaction.type.in_(types),
+        Transaction.date >= start,
+        Transaction.date <= end
+    )
+    if category_ids:
+        query = query.filter(Transaction.category_id.in_(category_ids))
+    return query.group_by(Transaction.date, Transaction.type).all()
+
+
+def build_series(db_session, firebase_uid: str, start: date, end: date,
+                 granularity: str = 'month', types: Sequence[str] = TYPES,
+                 category_ids: Optional[Sequence[int]] = None) -> Dict[str, List]:
+    """
+    Resampled income/expense totals as parallel arrays
+
+    Args:
+        db_session: SQLAlchemy session
+        firebase_uid: User to report on
+        start: First day (inclusive)
+        end: Last day (inclusive)
+        granularity: One of GRANULARITIES
+        types: Transaction types to include
+        category_ids: Restrict to these categories (default: all)
+
+    Returns:
+        Dict with 'period' (ISO period start dates) plus '<type>' totals and
+        '<type>_count' counts for each requested type, all the same length
+
+    Raises:
+        ValueError: On an invalid granularity, type or range
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+    if any(t not in TYPES for t in types):
+        raise ValueError(f"type must be one of: {', '.join(TYPES)}")
+    if end < start:
+        raise ValueError('end must not be before start')
+
+    axis = period_axis(start, end, granularity)
+    if len(axis) > MAX_PERIODS:
+        raise ValueError(f"Range too large for '{granularity}' granularity (max {MAX_PERIODS} periods)")
+
+    rows = _grouped_rows(db_session, firebase_uid, start, end, granularity, types, category_ids)
+
+    series: Dict[str, List] = {'period': [str(day) for day in axis]}
+    if not rows:
+        for txn_type in types:
+            series[txn_type] = [0.0] * len(axis)
+            series[f'{txn_type}_count'] = [0] * len(axis)
+        return series
+
+    days, row_types, totals, counts = zip(*rows)
+    buckets = np.searchsorted(axis, period_starts(np.array(days, dtype='datetime64[D]'), granularity))
+    row_types = np.array(row_types, dtype=object)
+    totals = np.array([float(total or 0) for total in totals])
+    counts = np.array(counts, dtype=np.float64)
+
+    for txn_type in types:
+        mask = row_types == txn_type
+        total = np.bincount(buckets[mask], weights=totals[mask], minlength=len(axis))
+        count = np.bincount(buckets[mask], weights=counts[mask], minlength=len(axis))
+        series[txn_type] = np.round(total.astype(np.float64), 2).tolist()
+        series[f'{txn_type}_count'] = count.astype(np.int64).tolist()
+
+    return series
@@ -7,6 +7,7 @@ from flask import request, jsonify, render_template, redirect, url_for, session
 from firebase_admin import auth
 from models.user import User, UserSettings
 from utils.validators import validate_email, validate_password
+from utils.db_routing import get_session
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,6 +38,7 @@ def register_routes(bp, app):
         POST /auth/api/register
         Body: {email, password, display_name}
         """
+        db_session = None
         try:
             data = request.get_json()
             email = data.get('email', '').strip()
@@ -61,7 +63,7 @@ def register_routes(bp, app):
             )
             
             # Create local user record
-            db_session = app.db_session
+            db_session = get_session(app)
             new_user = User(
                 firebase_uid=user.uid,
                 email=email,
@@ -92,8 +94,8 @@ def register_routes(bp, app):
             return jsonify({'error': 'Email already registered'}), 400
         except Exception as e:
             logger.error(f"Registration error: {str(e)}")
-            if app.db_session:
-                app.db_session.rollback()
+            if db_session:
+                db_session.rollback()
             return jsonify({'error': 'Registration failed'}), 500
     
     @bp.route('/api/verify-token', methods=['POST'])
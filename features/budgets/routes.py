@@ -1,6 +1,8 @@
 """Budgets Routes"""
 from flask import render_template, jsonify, request, g
 from utils.auth_decorators import login_required
+from utils.db_routing import get_session
+from utils.query_guard import query_budget
 from models.budget import Budget
 from datetime import datetime, timedelta
 import logging
@@ -8,6 +10,18 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _usage(budget_id, limit, spent):
+    spent = float(spent) if spent else 0.0
+    limit = float(limit)
+    return {
+        'budget_id': budget_id,
+        'limit': limit,
+        'spent': spent,
+        'remaining': limit - spent,
+        'percentage': (spent / limit * 100) if limit > 0 else 0
+    }
+
+
 def register_routes(bp, app):
     """Register budget routes"""
     
@@ -19,11 +33,12 @@ def register_routes(bp, app):
     
     @bp.route('/api/list', methods=['GET'])
     @login_required
+    @query_budget(1)
     def list_budgets():
         """Get all budgets"""
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
             budgets = db_session.query(Budget)\
                 .filter(Budget.firebase_uid == user_uid)\
@@ -54,7 +69,7 @@ def register_routes(bp, app):
         db_session = None
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             data = request.get_json()
             
             required = ['category_id', 'limit_amount', 'period', 'start_date']
@@ -114,7 +129,7 @@ def register_routes(bp, app):
         db_session = None
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             data = request.get_json()
             
             budget = db_session.query(Budget)\
@@ -149,7 +164,7 @@ def register_routes(bp, app):
         db_session = None
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
             budget = db_session.query(Budget)\
                 .filter(Budget.id == budget_id, Budget.firebase_uid == user_uid)\
@@ -172,13 +187,49 @@ def register_routes(bp, app):
                 db_session.rollback()
             return jsonify({'error': 'Failed to delete budget'}), 500
     
+    @bp.route('/api/usage', methods=['GET'])
+    @login_required
+    @query_budget(1)
+    def list_budget_usage():
+        """Get usage/spending of all budgets in one query"""
+        try:
+            user_uid = g.user_id
+            db_session = get_session(app)
+            
+            from models.transaction import Transaction
+            from sqlalchemy import func, and_
+            
+            rows = db_session.query(Budget.id, Budget.limit_amount, func.sum(Transaction.amount))\
+                .outerjoin(Transaction, and_(
+                    Transaction.firebase_uid == Budget.firebase_uid,
+                    Transaction.category_id == Budget.category_id,
+                    Transaction.type == 'expense',
+                    Transaction.is_deleted == False,
+                    Transaction.date >= Budget.start_date,
+                    Transaction.date <= Budget.end_date
+                ))\
+                .filter(Budget.firebase_uid == user_uid)\
+                .group_by(Budget.id, Budget.limit_amount)\
+                .order_by(Budget.id)\
+                .all()
+            
+            return jsonify({
+                'success': True,
+                'data': [_usage(budget_id, limit, spent) for budget_id, limit, spent in rows]
+            }), 200
+            
+        except Exception as e:
+            logger.error(f"Error getting budget usage: {str(e)}")
+            return jsonify({'error': 'Failed to fetch budget usage'}), 500
+    
     @bp.route('/api/usage/<int:budget_id>', methods=['GET'])
     @login_required
+    @query_budget(2)
     def get_budget_usage(budget_id):
         """Get budget usage/spending"""
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
             budget = db_session.query(Budget)\
                 .filter(Budget.id == budget_id, Budget.firebase_uid == user_uid)\
@@ -202,18 +253,10 @@ def register_routes(bp, app):
                         Transaction.date <= budget.end_date
                     )
                 ).scalar()
-            spent = float(spent) if spent else 0.0
-            limit = float(budget.limit_amount)
             
             return jsonify({
                 'success': True,
-                'data': {
-                    'budget_id': budget.id,
-                    'limit': limit,
-                    'spent': spent,
-                    'remaining': limit - spent,
-                    'percentage': (spent / limit * 100) if limit > 0 else 0
-                }
+                'data': _usage(budget.id, budget.limit_amount, spent)
             }), 200
             
         except Exception as e:
@@ -1,6 +1,8 @@
 """Dashboard Routes"""
 from flask import render_template, jsonify, request, g
 from utils.auth_decorators import login_required
+from utils.db_routing import get_session
+from utils.query_guard import query_budget
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,11 +19,12 @@ def register_routes(bp, app):
     
     @bp.route('/api/stats', methods=['GET'])
     @login_required
+    @query_budget(4)
     def get_stats():
         """Get dashboard statistics"""
         try:
             user_uid = g.user_id  # Set by login_required decorator
-            db_session = app.db_session
+            db_session = get_session(app)
             
             # Get total balance (sum of all transactions)
             from models.transaction import Transaction
@@ -80,11 +83,12 @@ def register_routes(bp, app):
     
     @bp.route('/api/recent-transactions', methods=['GET'])
     @login_required
+    @query_budget(1)
     def get_recent_transactions():
         """Get recent transactions"""
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
             from models.transaction import Transaction
             
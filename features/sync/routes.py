@@ -1,10 +1,14 @@
 """
 Cloud Sync Routes
 API endpoints for cloud synchronization
+
+Push, pull and auto-sync are async views: the Firestore round trips for
+transactions, budgets and settings overlap instead of running back to back.
 """
 
 from flask import jsonify, g
 from utils.auth_decorators import login_required
+from utils.db_routing import get_session
 from utils.cloud_sync import cloud_sync
 import logging
 
@@ -36,7 +40,7 @@ def register_routes(bp, app):
     
     @bp.route('/api/push', methods=['POST'])
     @login_required
-    def push_to_cloud():
+    async def push_to_cloud():
         """
         Push local data to cloud
         POST /sync/api/push
@@ -49,9 +53,9 @@ def register_routes(bp, app):
                 }), 503
             
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
-            result = cloud_sync.sync_user_data(user_uid, db_session)
+            result = await cloud_sync.sync_user_data_async(user_uid, db_session)
             
             if result['success']:
                 return jsonify({
@@ -71,7 +75,7 @@ def register_routes(bp, app):
     
     @bp.route('/api/pull', methods=['POST'])
     @login_required
-    def pull_from_cloud():
+    async def pull_from_cloud():
         """
         Pull data from cloud to local
         POST /sync/api/pull
@@ -84,9 +88,9 @@ def register_routes(bp, app):
                 }), 503
             
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
-            result = cloud_sync.pull_from_cloud(user_uid, db_session)
+            result = await cloud_sync.pull_from_cloud_async(user_uid, db_session)
             
             if result['success']:
                 return jsonify({
@@ -106,17 +110,17 @@ def register_routes(bp, app):
     
     @bp.route('/api/auto-sync', methods=['POST'])
     @login_required
-    def auto_sync():
+    async def auto_sync():
         """
         Automatic bidirectional sync
         POST /sync/api/auto-sync
         """
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
             # Push local changes to cloud
-            push_result = cloud_sync.sync_user_data(user_uid, db_session)
+            push_result = await cloud_sync.sync_user_data_async(user_uid, db_session)
             
             if not push_result['success']:
                 return jsonify({
@@ -0,0 +1,34 @@
+"""Transactions CLI Commands"""
+import click
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def register_commands(bp, app):
+    """Register transaction CLI commands (flask transactions <command>)"""
+    
+    @bp.cli.command('train-categorizer')
+    @click.option('--min-examples', default=5, show_default=True, help='Skip categories with fewer labeled transactions')
+    @click.option('--output', default=None, help='Model path (default: CATEGORIZER_MODEL_PATH)')
+    def train_categorizer_command(min_examples, output):
+        """Retrain the transaction auto-categorizer from categorized history"""
+        import time
+        from utils.categorizer import train_model, save_model
+        
+        path = output or app.config['CATEGORIZER_MODEL_PATH']
+        db_session = app.db_session
+        started = time.perf_counter()
+        try:
+            model = train_model(db_session, min_examples=min_examples)
+        finally:
+            db_session.remove()
+        
+        if model is None:
+            raise click.ClickException('Not enough categorized transactions to train a model')
+        
+        save_model(model, path)
+        click.echo(
+            f"Trained on {model['trained_rows']} transactions, {len(model['classes'])} categories "
+            f"in {time.perf_counter() - started:.1f}s -> {path}"
+        )
@@ -1,7 +1,10 @@
 """Transactions Routes"""
 from flask import render_template, jsonify, request, g
 from utils.auth_decorators import login_required
+from utils.db_routing import get_session
+from utils.query_guard import query_budget
 from models.transaction import Transaction
+from utils.categorizer import auto_categorize
 from datetime import datetime
 import logging
 
@@ -19,11 +22,12 @@ def register_routes(bp, app):
     
     @bp.route('/api/list', methods=['GET'])
     @login_required
+    @query_budget(2)
     def list_transactions():
         """Get all transactions with optional filters"""
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
             # Get query parameters
             page = int(request.args.get('page', 1))
@@ -76,7 +80,7 @@ def register_routes(bp, app):
         db_session = None
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             data = request.get_json()
             
             # Validate required fields
@@ -96,6 +100,9 @@ def register_routes(bp, app):
                 is_deleted=False
             )
             
+            # Suggest a category when none was chosen
+            auto_categorize(db_session, [transaction])
+            
             db_session.add(transaction)
             db_session.commit()
             
@@ -106,7 +113,8 @@ def register_routes(bp, app):
                     'id': transaction.id,
                     'amount': float(transaction.amount),  # type: ignore[arg-type]
                     'type': transaction.type,
-                    'date': transaction.date.isoformat()
+                    'date': transaction.date.isoformat(),
+                    'category_id': transaction.category_id
                 }
             }), 201
             
@@ -123,7 +131,7 @@ def register_routes(bp, app):
         db_session = None
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             data = request.get_json()
             
             transaction = db_session.query(Transaction)\
@@ -166,7 +174,7 @@ def register_routes(bp, app):
         db_session = None
         try:
             user_uid = g.user_id
-            db_session = app.db_session
+            db_session = get_session(app)
             
             transaction = db_session.query(Transaction)\
                 .filter(Transaction.id == transaction_id, Transaction.firebase_uid == user_uid)\
@@ -0,0 +1,92 @@
+"""
+Gunicorn Configuration
+Production profile for Money Matrix
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden from the environment:
+
+    WEB_CONCURRENCY       worker processes (default: 2 x CPUs + 1, gevent: CPUs)
+    GUNICORN_WORKER_CLASS sync | gthread | gevent (default: gthread)
+    GUNICORN_THREADS      threads per gthread worker (default: 4)
+    GUNICORN_CONNECTIONS  concurrent connections per gevent worker (default: 100)
+    GUNICORN_PRELOAD      import the app once in the master, then fork (default: true;
+                          false for gevent, which must patch before the app is imported)
+    GUNICORN_TIMEOUT, GUNICORN_KEEPALIVE, GUNICORN_MAX_REQUESTS
+    PORT                  bind port (default: 5000)
+    PROMETHEUS_MULTIPROC_DIR  shared metrics directory for /metrics (default:
+                          <tmp>/money_matrix_metrics_<port>; its .db files are
+                          removed at startup)
+
+gevent is not in requirements.txt; install it ('pip install gevent') to use
+that worker class. benchmarks/load_modes.py compares the worker classes.
+"""
+
+import os
+import tempfile
+import multiprocessing
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class == 'gevent':
+    workers = _env_int('WEB_CONCURRENCY', cpu_count)
+    worker_connections = _env_int('GUNICORN_CONNECTIONS', 100)
+else:
+    workers = _env_int('WEB_CONCURRENCY', cpu_count * 2 + 1)
+threads = _env_int('GUNICORN_THREADS', 4 if worker_class == 'gthread' else 1)
+
+# Load the app (imports, schema check, feature loading) once in the master so
+# workers fork with it already in memory: faster boots and shared pages
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false' if worker_class == 'gevent' else 'true').lower() == 'true'
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# Recycle workers periodically to bound memory growth; jitter avoids
+# every worker restarting at once
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+# Prometheus multiprocess mode: every process (master included, when
+# preloading) writes its metrics to files in this directory and /metrics
+# aggregates them. Set before the app, and so prometheus_client, is imported;
+# stale files from a previous run would be counted, so start empty.
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(tempfile.gettempdir(), f"money_matrix_metrics_{os.getenv('PORT', 5000)}")
+)
+os.makedirs(metrics_dir, exist_ok=True)
+for filename in os.listdir(metrics_dir):
+    if filename.endswith('.db'):
+        os.remove(os.path.join(metrics_dir, filename))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    """Give each worker its own DB pool and Firebase clients when preloaded"""
+    if not server.cfg.preload_app:
+        return
+    import wsgi
+    from app import reinit_after_fork
+    reinit_after_fork(wsgi.app)
+
+
+def child_exit(server, worker):
+    """Drop an exited worker's live gauges from /metrics"""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -7,5 +7,8 @@ from .base import Base
 from .user import User, UserSettings
 from .transaction import Transaction, Category
 from .budget import Budget
+from .rollup import MonthlyCategoryRollup
+from .recurring import RecurringSignature
+from .schema import SchemaVersion
 
-__all__ = ['Base', 'User', 'UserSettings', 'Transaction', 'Category', 'Budget']
+__all__ = ['Base', 'User', 'UserSettings', 'Transaction', 'Category', 'Budget', 'MonthlyCategoryRollup', 'RecurringSignature', 'SchemaVersion']
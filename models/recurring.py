@@ -0,0 +1,53 @@
+"""
+Recurring Transaction Signature Model
+"""
+
+from sqlalchemy import Column, Integer, String, Numeric, Date, Boolean, Float, Index, UniqueConstraint
+from .base import Base
+
+
+class RecurringSignature(Base):
+    """
+    One row per (user, normalized description, amount band)
+    Interval statistics are kept incrementally so cadence can be
+    re-evaluated on each new charge without rescanning history
+    """
+    __tablename__ = 'recurring_signatures'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    firebase_uid = Column(String(128), nullable=False)
+    signature = Column(String(255), nullable=False)
+    description = Column(String(500))  # Most recent raw description
+    category_id = Column(Integer, nullable=True)
+    amount_band = Column(Integer, nullable=False)
+    last_amount = Column(Numeric(10, 2), nullable=False)
+    occurrences = Column(Integer, nullable=False, default=1)
+    first_seen = Column(Date, nullable=False)
+    last_seen = Column(Date, nullable=False)
+    interval_count = Column(Integer, nullable=False, default=0)
+    interval_mean = Column(Float, nullable=False, default=0.0)
+    interval_m2 = Column(Float, nullable=False, default=0.0)  # Welford sum of squared deviations
+    cadence_days = Column(Integer, nullable=True)  # Nominal cadence when recurring
+    next_expected = Column(Date, nullable=True)
+    is_recurring = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        UniqueConstraint('firebase_uid', 'signature', name='uq_recurring_user_signature'),
+        Index('ix_recurring_user_active', 'firebase_uid', 'is_recurring', 'next_expected'),
+    )
+
+    def __repr__(self):
+        return f"<RecurringSignature {self.signature} every {self.cadence_days}d>"
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'description': self.description,
+            'category_id': self.category_id,
+            'amount': str(self.last_amount),
+            'occurrences': self.occurrences,
+            'cadence_days': self.cadence_days,
+            'first_seen': self.first_seen.isoformat() if self.first_seen else None,
+            'last_seen': self.last_seen.isoformat() if self.last_seen else None,
+            'next_expected': self.next_expected.isoformat() if self.next_expected else None
+        }
@@ -0,0 +1,46 @@
+"""
+Analytics Rollup Models
+Materialized aggregates maintained alongside transactions
+"""
+
+from sqlalchemy import Column, Integer, String, Numeric, Index, func, literal_column
+from .base import Base
+
+
+class MonthlyCategoryRollup(Base):
+    """
+    Monthly totals per (user, category, type)
+    Kept in step with the transactions table by utils.rollups
+    """
+    __tablename__ = 'monthly_category_rollups'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    firebase_uid = Column(String(128), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    category_id = Column(Integer, nullable=True)  # NULL = uncategorized
+    type = Column(String(10), nullable=False)  # 'income' or 'expense'
+    total = Column(Numeric(14, 2), nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_rollup_user_period', 'firebase_uid', 'year', 'month'),
+        # One row per bucket, and the conflict target of the upsert in
+        # utils.rollups. NULLs never collide in a unique index, so the
+        # uncategorized bucket is keyed as category 0 (ids start at 1)
+        Index('uq_rollup_bucket', 'firebase_uid', 'year', 'month',
+              func.coalesce(category_id, literal_column('0')), 'type', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<MonthlyCategoryRollup {self.year}-{self.month:02d} {self.type} ${self.total}>"
+
+    def to_dict(self):
+        return {
+            'year': self.year,
+            'month': self.month,
+            'category_id': self.category_id,
+            'type': self.type,
+            'total': str(self.total),
+            'count': self.count
+        }
@@ -0,0 +1,22 @@
+"""
+Schema Version Model
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from .base import Base
+
+
+class SchemaVersion(Base):
+    """
+    One row per applied migration (see utils/schema.py)
+    The highest version is the database's current schema version
+    """
+    __tablename__ = 'schema_version'
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(100), nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SchemaVersion {self.version} {self.name}>"
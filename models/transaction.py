@@ -2,7 +2,7 @@
 Transaction and Category Models
 """
 
-from sqlalchemy import Column, Integer, String, Numeric, Date, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, Date, Boolean, ForeignKey, Index
 from decimal import Decimal
 from .base import Base, TimestampMixin
 
@@ -46,6 +46,11 @@ class Transaction(Base, TimestampMixin):
     date = Column(Date, nullable=False, index=True)
     is_deleted = Column(Boolean, default=False)
     
+    __table_args__ = (
+        # Per-user date-range scans (listing, series, anomaly histories)
+        Index('ix_transactions_user_date', 'firebase_uid', 'date'),
+    )
+    
     def __repr__(self):
         return f"<Transaction {self.type} ${self.amount}>"
     
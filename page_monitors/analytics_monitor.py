@@ -5,15 +5,24 @@ Monitors UI, logic, and user experience for the analytics page
 
 import sys
 import os
-sys.path.append("S:\\MONEY_MATRIX\\MONEY_MATRIX")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from page_monitors.base_monitor import PageMonitor
+from page_monitors.base_monitor import PageMonitor, Endpoint
 
 class AnalyticsMonitor(PageMonitor):
     """Monitor for the Analytics page"""
     
-    def __init__(self):
-        super().__init__("Analytics")
+    PAGE_PATH = '/analytics'
+    API_ENDPOINTS = [
+        Endpoint('/analytics/api/spending-trends'),
+        Endpoint('/analytics/api/category-breakdown'),
+        Endpoint('/analytics/api/series?granularity=month'),
+        Endpoint('/analytics/api/anomalies'),
+        Endpoint('/analytics/api/subscriptions')
+    ]
+    
+    def __init__(self, target=None, iterations=None):
+        super().__init__("Analytics", target, iterations)
     
     def monitor_ui(self):
         """Monitor UI elements and components on the analytics page"""
@@ -48,7 +57,7 @@ class AnalyticsMonitor(PageMonitor):
             'api_integration': True,
             'error_handling': True,
             'session_management': True,
-            'api_endpoints_accessible': True
+            'api_endpoints_accessible': self.api_endpoints_accessible()
         }
     
     def monitor_ux(self):
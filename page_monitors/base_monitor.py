@@ -1,18 +1,189 @@
 """
 Base Monitor Class for Money Matrix Pages
 Provides common functionality for monitoring UI, logic, and user experience
+
+Performance metrics come from real HTTP probes. Each monitor names its page
+(PAGE_PATH) and the JSON APIs behind it (API_ENDPOINTS); monitor_performance()
+requests each of them MONITOR_ITERATIONS times and records response time,
+payload size and, in-process, template render time, as p50/p95/p99.
+
+Probe target:
+- default: the app itself through Flask's test client (create_app with
+  MONITOR_CONFIG, default 'development' so API calls use the demo user)
+- MONITOR_BASE_URL=https://host: a running server; set MONITOR_AUTH_TOKEN
+  to send a Firebase ID token. Render time and process resource usage are
+  only available in-process.
+
+All times are in milliseconds.
 """
 
+import os
+import sys
 import time
 import json
+import http.client
 from datetime import datetime
 from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+    resource = None
+
+MONITOR_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(MONITOR_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+DEFAULT_ITERATIONS = 20
+
+
+class Endpoint(NamedTuple):
+    """A JSON API called by a page; expect lists the statuses that count as success"""
+    path: str
+    method: str = 'GET'
+    json: Optional[Dict] = None
+    expect: Tuple[int, ...] = (200,)
+
+    @property
+    def label(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+# ==================== PROBE TARGETS ====================
+
+class AppTarget:
+    """Drives a Flask app in-process through its test client"""
+
+    in_process = True
+
+    def __init__(self, app, track_render: bool = True):
+        from flask import before_render_template, template_rendered
+
+        self.app = app
+        self.client = app.test_client()
+        self.name = 'test-client'
+        self._render_started = None
+        self._render_ms = 0.0 if track_render else None
+        if track_render:
+            before_render_template.connect(self._before_render, app)
+            template_rendered.connect(self._after_render, app)
+
+    @classmethod
+    def from_env(cls) -> 'AppTarget':
+        from app import create_app
+        return cls(create_app(os.getenv('MONITOR_CONFIG', 'development')))
+
+    def _before_render(self, sender, template, context, **extra):
+        self._render_started = time.perf_counter()
+
+    def _after_render(self, sender, template, context, **extra):
+        if self._render_started is not None:
+            self._render_ms += (time.perf_counter() - self._render_started) * 1000
+            self._render_started = None
+
+    def clone(self) -> 'AppTarget':
+        """Independent client for another thread (template signals are app-wide, so no render timing)"""
+        return AppTarget(self.app, track_render=False)
+
+    def request(self, method: str, path: str, json_body: Optional[Dict] = None) -> Dict:
+        if self._render_ms is not None:
+            self._render_ms = 0.0
+        started = time.perf_counter()
+        response = self.client.open(path, method=method, json=json_body)
+        body = response.get_data()
+        elapsed = (time.perf_counter() - started) * 1000
+        return {'status': response.status_code, 'ms': elapsed, 'bytes': len(body), 'render_ms': self._render_ms}
+
+    def close(self):
+        pass
+
+
+class LiveTarget:
+    """Drives a running server over a keep-alive HTTP connection"""
+
+    in_process = False
+
+    def __init__(self, base_url: str, auth_token: Optional[str] = None, timeout: float = 30):
+        parts = urlsplit(base_url)
+        self.name = base_url
+        self.auth_token = auth_token
+        self.timeout = timeout
+        self.prefix = parts.path.rstrip('/')
+        self.headers = {'Authorization': f'Bearer {auth_token}'} if auth_token else {}
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self._connect = lambda: connection_class(parts.netloc, timeout=timeout)
+        self.connection = self._connect()
+
+    def clone(self) -> 'LiveTarget':
+        """Own connection for another thread"""
+        return LiveTarget(self.name, self.auth_token, self.timeout)
+
+    def request(self, method: str, path: str, json_body: Optional[Dict] = None) -> Dict:
+        headers = dict(self.headers)
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body)
+            headers['Content-Type'] = 'application/json'
+
+        started = time.perf_counter()
+        try:
+            self.connection.request(method, self.prefix + path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = self._connect()
+            return {'status': 0, 'ms': (time.perf_counter() - started) * 1000, 'bytes': 0, 'render_ms': None}
+        elapsed = (time.perf_counter() - started) * 1000
+        return {'status': response.status, 'ms': elapsed, 'bytes': len(payload), 'render_ms': None}
+
+    def close(self):
+        self.connection.close()
+
+
+def create_target(base_url: Optional[str] = None):
+    """Live target for base_url / MONITOR_BASE_URL, otherwise the app in-process"""
+    base_url = base_url or os.getenv('MONITOR_BASE_URL')
+    if base_url:
+        return LiveTarget(base_url, os.getenv('MONITOR_AUTH_TOKEN'))
+    return AppTarget.from_env()
+
+
+def latency_summary(samples: List[float]) -> Dict:
+    """p50/p95/p99/mean/min/max of a list of milliseconds"""
+    if not samples:
+        return {'p50': None, 'p95': None, 'p99': None, 'mean': None, 'min': None, 'max': None}
+    values = np.array(samples)
+    return {
+        'p50': round(float(np.percentile(values, 50)), 3),
+        'p95': round(float(np.percentile(values, 95)), 3),
+        'p99': round(float(np.percentile(values, 99)), 3),
+        'mean': round(float(values.mean()), 3),
+        'min': round(float(values.min()), 3),
+        'max': round(float(values.max()), 3)
+    }
+
+
+# ==================== MONITOR ====================
 
 class PageMonitor(ABC):
     """Abstract base class for page monitoring"""
-    
-    def __init__(self, page_name):
+
+    # Page URL and the JSON APIs it calls; set by each monitor
+    PAGE_PATH: Optional[str] = None
+    API_ENDPOINTS: List[Endpoint] = []
+
+    def __init__(self, page_name, target=None, iterations=None):
         self.page_name = page_name
+        self.target = target
+        self.iterations = iterations or int(os.getenv('MONITOR_ITERATIONS', DEFAULT_ITERATIONS))
         self.metrics = {
             'page_name': page_name,
             'timestamp': datetime.now().isoformat(),
@@ -21,50 +192,134 @@ class PageMonitor(ABC):
             'ux_metrics': {},
             'performance_metrics': {}
         }
-    
+
     @abstractmethod
     def monitor_ui(self):
         """Monitor UI elements and components"""
         pass
-    
+
     @abstractmethod
     def monitor_logic(self):
         """Monitor business logic and data flow"""
         pass
-    
+
     @abstractmethod
     def monitor_ux(self):
         """Monitor user experience metrics"""
         pass
-    
+
+    def probe(self, method: str, path: str, json_body: Optional[Dict] = None,
+              expect: Tuple[int, ...] = (200,)) -> Dict:
+        """
+        Request one URL repeatedly (after one warm-up request)
+
+        Returns:
+            {status, iterations, errors, payload_bytes, response_ms, render_ms}
+        """
+        self.target.request(method, path, json_body)  # Warm-up: lazy imports, caches
+
+        samples, render_samples, errors = [], [], 0
+        status, payload_bytes = None, 0
+        for _ in range(self.iterations):
+            result = self.target.request(method, path, json_body)
+            status, payload_bytes = result['status'], result['bytes']
+            samples.append(result['ms'])
+            if result['render_ms'] is not None:
+                render_samples.append(result['render_ms'])
+            if result['status'] not in expect:
+                errors += 1
+
+        return {
+            'status': status,
+            'iterations': self.iterations,
+            'errors': errors,
+            'payload_bytes': payload_bytes,
+            'response_ms': latency_summary(samples),
+            'render_ms': latency_summary(render_samples) if any(render_samples) else None
+        }
+
     def monitor_performance(self):
-        """Monitor performance metrics"""
+        """Probe the page and its APIs and record real timings"""
+        owns_target = self.target is None
+        if owns_target:
+            self.target = create_target()
+
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        try:
+            page = self.probe('GET', self.PAGE_PATH) if self.PAGE_PATH else None
+            apis = {
+                endpoint.label: self.probe(endpoint.method, endpoint.path, endpoint.json, endpoint.expect)
+                for endpoint in self.API_ENDPOINTS
+            }
+        finally:
+            if owns_target:
+                self.target.close()
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+
+        in_process = getattr(self.target, 'in_process', False)
         self.metrics['performance_metrics'] = {
-            'response_time': 0,
-            'render_time': 0,
-            'memory_usage': 0,
-            'cpu_usage': 0
+            'response_time': page['response_ms']['p50'] if page else None,
+            'render_time': page['render_ms']['p50'] if page and page['render_ms'] else None,
+            # Peak RSS of the monitoring process (includes the app when probing in-process)
+            'memory_usage': self._peak_rss_mb() if in_process else None,
+            'cpu_usage': round(cpu / wall * 100, 1) if in_process and wall else None,
+            'target': self.target.name,
+            'iterations': self.iterations,
+            'page': dict(page, path=self.PAGE_PATH) if page else None,
+            'api': apis
         }
-    
+
+    @staticmethod
+    def _peak_rss_mb() -> Optional[float]:
+        if not RESOURCE_AVAILABLE:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+    # ==================== PROBE RESULTS ====================
+
+    def page_loaded(self) -> bool:
+        """Page returned 200 on every probe"""
+        page = self.metrics['performance_metrics'].get('page')
+        return bool(page) and page['status'] == 200 and page['errors'] == 0
+
+    def api_endpoints_accessible(self) -> bool:
+        """Every API returned an expected status on every probe"""
+        apis = self.metrics['performance_metrics'].get('api', {})
+        return all(api['errors'] == 0 for api in apis.values())
+
+    def page_load_time(self) -> Optional[float]:
+        """Median page response time (ms)"""
+        return self.metrics['performance_metrics'].get('response_time')
+
+    def api_time(self, label: str) -> Optional[float]:
+        """Median response time of one API (ms), e.g. api_time('POST /budgets/api/create')"""
+        api = self.metrics['performance_metrics'].get('api', {}).get(label)
+        return api['response_ms']['p50'] if api else None
+
     def collect_metrics(self):
-        """Collect all metrics from the page"""
+        """Collect all metrics from the page (performance first: the others read its probes)"""
+        self.monitor_performance()
         self.monitor_ui()
         self.monitor_logic()
         self.monitor_ux()
-        self.monitor_performance()
         return self.metrics
-    
+
     def save_metrics(self, filepath=None):
         """Save metrics to a file"""
         if filepath is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filepath = f"S:\\MONEY_MATRIX\\MONEY_MATRIX\\page_monitors\\{self.page_name}_metrics_{timestamp}.json"
-        
+            output_dir = os.getenv('MONITOR_OUTPUT_DIR', MONITOR_DIR)
+            os.makedirs(output_dir, exist_ok=True)
+            filepath = os.path.join(output_dir, f"{self.page_name}_metrics_{timestamp}.json")
+
         with open(filepath, 'w') as f:
             json.dump(self.metrics, f, indent=2)
-        
+
         print(f"Metrics saved to {filepath}")
-    
+
     def print_summary(self):
         """Print a summary of the metrics"""
         print(f"\n=== {self.page_name} Page Monitoring Summary ===")
@@ -72,15 +327,24 @@ class PageMonitor(ABC):
         print("\nUI Metrics:")
         for key, value in self.metrics['ui_metrics'].items():
             print(f"  {key}: {value}")
-        
+
         print("\nLogic Metrics:")
         for key, value in self.metrics['logic_metrics'].items():
             print(f"  {key}: {value}")
-        
+
         print("\nUX Metrics:")
         for key, value in self.metrics['ux_metrics'].items():
             print(f"  {key}: {value}")
-        
-        print("\nPerformance Metrics:")
-        for key, value in self.metrics['performance_metrics'].items():
-            print(f"  {key}: {value}")
\ No newline at end of file
+
+        performance = self.metrics['performance_metrics']
+        print(f"\nPerformance Metrics ({performance.get('target')}, {performance.get('iterations')} iterations):")
+        for key in ('response_time', 'render_time', 'memory_usage', 'cpu_usage'):
+            print(f"  {key}: {performance.get(key)}")
+
+        rows = ([(f"GET {performance['page']['path']}", performance['page'])] if performance.get('page') else [])
+        rows += list(performance.get('api', {}).items())
+        for label, result in rows:
+            latency = result['response_ms']
+            print(f"  {label:<48} {result['status']}  {result['payload_bytes']:>7}B  "
+                  f"p50 {latency['p50']}ms  p95 {latency['p95']}ms  p99 {latency['p99']}ms"
+                  f"{'  errors ' + str(result['errors']) if result['errors'] else ''}")
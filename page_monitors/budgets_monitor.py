@@ -5,15 +5,20 @@ Monitors UI, logic, and user experience for the budgets page
 
 import sys
 import os
-sys.path.append("S:\\MONEY_MATRIX\\MONEY_MATRIX")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from page_monitors.base_monitor import PageMonitor
+from page_monitors.base_monitor import PageMonitor, Endpoint
 
 class BudgetsMonitor(PageMonitor):
     """Monitor for the Budgets page"""
     
-    def __init__(self):
-        super().__init__("Budgets")
+    PAGE_PATH = '/budgets'
+    API_ENDPOINTS = [
+        Endpoint('/budgets/api/list')
+    ]
+    
+    def __init__(self, target=None, iterations=None):
+        super().__init__("Budgets", target, iterations)
     
     def monitor_ui(self):
         """Monitor UI elements and components on the budgets page"""
@@ -48,7 +53,7 @@ class BudgetsMonitor(PageMonitor):
             'api_integration': True,
             'error_handling': True,
             'session_management': True,
-            'api_endpoints_accessible': True
+            'api_endpoints_accessible': self.api_endpoints_accessible()
         }
     
     def monitor_ux(self):
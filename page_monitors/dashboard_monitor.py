@@ -5,15 +5,21 @@ Monitors UI, logic, and user experience for the dashboard page
 
 import sys
 import os
-sys.path.append("S:\\MONEY_MATRIX\\MONEY_MATRIX")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from page_monitors.base_monitor import PageMonitor
+from page_monitors.base_monitor import PageMonitor, Endpoint
 
 class DashboardMonitor(PageMonitor):
     """Monitor for the Dashboard page"""
     
-    def __init__(self):
-        super().__init__("Dashboard")
+    PAGE_PATH = '/dashboard'
+    API_ENDPOINTS = [
+        Endpoint('/dashboard/api/stats'),
+        Endpoint('/dashboard/api/recent-transactions')
+    ]
+    
+    def __init__(self, target=None, iterations=None):
+        super().__init__("Dashboard", target, iterations)
     
     def monitor_ui(self):
         """Monitor UI elements and components on the dashboard page"""
@@ -38,7 +44,7 @@ class DashboardMonitor(PageMonitor):
         """Monitor business logic and data flow on the dashboard page"""
         self.metrics['logic_metrics'] = {
             'user_authentication_verified': True,
-            'data_loading_success': True,
+            'data_loading_success': self.page_loaded() and self.api_endpoints_accessible(),
             'api_data_fetching': True,
             'real_time_updates': True,
             'chart_data_rendering': True,
@@ -47,13 +53,13 @@ class DashboardMonitor(PageMonitor):
             'analytics_data_processing': True,
             'error_handling': True,
             'session_management': True,
-            'api_endpoints_accessible': True
+            'api_endpoints_accessible': self.api_endpoints_accessible()
         }
     
     def monitor_ux(self):
         """Monitor user experience metrics on the dashboard page"""
         self.metrics['ux_metrics'] = {
-            'dashboard_load_time': 0.0,
+            'dashboard_load_time': self.page_load_time(),
             'data_refresh_rate': 0.0,
             'user_engagement_time': 0.0,
             'feature_usage_rate': 0.0,
@@ -5,15 +5,20 @@ Monitors UI, logic, and user experience for the home page
 
 import sys
 import os
-sys.path.append("S:\\MONEY_MATRIX\\MONEY_MATRIX")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from page_monitors.base_monitor import PageMonitor
+from page_monitors.base_monitor import PageMonitor, Endpoint
 
 class HomeMonitor(PageMonitor):
     """Monitor for the Home page"""
     
-    def __init__(self):
-        super().__init__("Home")
+    PAGE_PATH = '/'
+    API_ENDPOINTS = [
+        Endpoint('/api/config/firebase')
+    ]
+    
+    def __init__(self, target=None, iterations=None):
+        super().__init__("Home", target, iterations)
     
     def monitor_ui(self):
         """Monitor UI elements and components on the home page"""
@@ -36,11 +41,11 @@ class HomeMonitor(PageMonitor):
     def monitor_logic(self):
         """Monitor business logic and data flow on the home page"""
         self.metrics['logic_metrics'] = {
-            'page_load_success': True,
+            'page_load_success': self.page_loaded(),
             'static_assets_loaded': True,
             'links_functional': True,
             'forms_validation': True,
-            'api_endpoints_accessible': True,
+            'api_endpoints_accessible': self.api_endpoints_accessible(),
             'database_connections': True,
             'authentication_redirects': True,
             'content_rendering': True
@@ -49,7 +54,7 @@ class HomeMonitor(PageMonitor):
     def monitor_ux(self):
         """Monitor user experience metrics on the home page"""
         self.metrics['ux_metrics'] = {
-            'page_load_time': 0.0,
+            'page_load_time': self.page_load_time(),
             'user_engagement': 0.0,
             'bounce_rate': 0.0,
             'conversion_rate': 0.0,
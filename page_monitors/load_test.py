@@ -0,0 +1,294 @@
+"""
+Load Test Mode for Money Matrix Page Monitors
+Concurrent request generation over the dashboard, transactions, budgets
+and analytics APIs
+
+Workers (threads, each with its own client or connection) pick endpoints
+from a weighted mix until the duration runs out. The report has overall and
+per-endpoint throughput, error rates, p50/p95/p99 and a latency histogram,
+and can be compared against a saved baseline report:
+
+    python page_monitors/run_all_monitors.py --load --concurrency 16 --duration 30
+    python page_monitors/run_all_monitors.py --load --save-baseline baseline.json
+    python page_monitors/run_all_monitors.py --load --baseline baseline.json --tolerance 10
+
+The endpoints come from each monitor's API_ENDPOINTS; --mix sets the weight
+of each page (split evenly across its endpoints), e.g. dashboard=3,analytics=1.
+"""
+
+import os
+import json
+import time
+import random
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from page_monitors.base_monitor import MONITOR_DIR, Endpoint, latency_summary
+from page_monitors.dashboard_monitor import DashboardMonitor
+from page_monitors.transactions_monitor import TransactionsMonitor
+from page_monitors.budgets_monitor import BudgetsMonitor
+from page_monitors.analytics_monitor import AnalyticsMonitor
+
+LOAD_PAGES = {
+    'dashboard': DashboardMonitor,
+    'transactions': TransactionsMonitor,
+    'budgets': BudgetsMonitor,
+    'analytics': AnalyticsMonitor,
+}
+
+DEFAULT_MIX = {'dashboard': 3, 'transactions': 3, 'budgets': 2, 'analytics': 2}
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def parse_mix(value: Optional[str]) -> Dict[str, float]:
+    """
+    Parse 'dashboard=3,analytics=1' into page weights
+
+    Raises:
+        ValueError: Unknown page or invalid weight
+    """
+    if not value:
+        return dict(DEFAULT_MIX)
+
+    mix = {}
+    for item in value.split(','):
+        page, _, weight = item.partition('=')
+        page = page.strip().lower()
+        if page not in LOAD_PAGES:
+            raise ValueError(f"Unknown page '{page}' in mix (choose from {', '.join(LOAD_PAGES)})")
+        mix[page] = float(weight) if weight else 1.0
+        if mix[page] < 0:
+            raise ValueError(f"Negative weight for '{page}'")
+    return mix
+
+
+def weighted_endpoints(mix: Dict[str, float]) -> List[Tuple[Endpoint, float]]:
+    """Endpoints of the mixed pages with each page's weight split across them"""
+    endpoints = []
+    for page, weight in mix.items():
+        page_endpoints = LOAD_PAGES[page].API_ENDPOINTS
+        for endpoint in page_endpoints:
+            if weight > 0:
+                endpoints.append((endpoint, weight / len(page_endpoints)))
+    if not endpoints:
+        raise ValueError('Request mix has no endpoints with positive weight')
+    return endpoints
+
+
+def histogram(samples: List[float]) -> Dict[str, int]:
+    """Latency counts per bucket, keyed '<=1ms', ..., '>5000ms'"""
+    counts = Counter()
+    for value in samples:
+        for bound in HISTOGRAM_BUCKETS_MS:
+            if value <= bound:
+                counts[f'<={bound}ms'] += 1
+                break
+        else:
+            counts[f'>{HISTOGRAM_BUCKETS_MS[-1]}ms'] += 1
+    labels = [f'<={bound}ms' for bound in HISTOGRAM_BUCKETS_MS] + [f'>{HISTOGRAM_BUCKETS_MS[-1]}ms']
+    return {label: counts[label] for label in labels}
+
+
+def _summarize(samples: List[float], errors: int, statuses: Counter, elapsed: float) -> Dict:
+    total = len(samples)
+    return {
+        'requests': total,
+        'errors': errors,
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'throughput_rps': round(total / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': latency_summary(samples),
+        'histogram': histogram(samples),
+        'status_codes': {str(code): count for code, count in sorted(statuses.items())}
+    }
+
+
+def run_load(target, concurrency: int = 8, duration: float = 30.0, mix: Optional[Dict[str, float]] = None,
+             warmup: bool = True, seed: int = 0) -> Dict:
+    """
+    Drive a probe target from concurrent workers for a fixed duration
+
+    Args:
+        target: AppTarget or LiveTarget (cloned per worker)
+        concurrency: Worker threads
+        duration: Seconds of load
+        mix: Page weights (default DEFAULT_MIX)
+        warmup: Request every endpoint once before the clock starts
+        seed: Seed for the per-worker endpoint choice
+
+    Returns:
+        Load report (settings, overall and per-endpoint results)
+    """
+    mix = mix or dict(DEFAULT_MIX)
+    endpoints = weighted_endpoints(mix)
+    labels = [endpoint.label for endpoint, _ in endpoints]
+    weights = [weight for _, weight in endpoints]
+
+    if warmup:
+        for endpoint, _ in endpoints:
+            target.request(endpoint.method, endpoint.path, endpoint.json)
+
+    # Per-worker records, merged after the run (no locking on the hot path)
+    records = [[] for _ in range(concurrency)]
+    clients = [target.clone() for _ in range(concurrency)]
+    barrier = threading.Barrier(concurrency + 1)
+    stop_at = [0.0]
+
+    def worker(slot: int):
+        client = clients[slot]
+        rng = random.Random(seed + slot)
+        barrier.wait()
+        while time.perf_counter() < stop_at[0]:
+            index = rng.choices(range(len(endpoints)), weights)[0]
+            endpoint = endpoints[index][0]
+            result = client.request(endpoint.method, endpoint.path, endpoint.json)
+            records[slot].append((index, result['status'], result['ms']))
+
+    threads = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    started = time.perf_counter()
+    stop_at[0] = started + duration
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    for client in clients:
+        client.close()
+
+    all_samples, all_errors, all_statuses = [], 0, Counter()
+    per_endpoint = {label: ([], [0], Counter()) for label in labels}
+    for slot_records in records:
+        for index, status, ms in slot_records:
+            endpoint = endpoints[index][0]
+            samples, errors, statuses = per_endpoint[endpoint.label]
+            samples.append(ms)
+            statuses[status] += 1
+            all_samples.append(ms)
+            all_statuses[status] += 1
+            if status not in endpoint.expect:
+                errors[0] += 1
+                all_errors += 1
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'target': target.name,
+        'settings': {'concurrency': concurrency, 'duration_s': duration, 'mix': mix},
+        'elapsed_s': round(elapsed, 3),
+        'overall': _summarize(all_samples, all_errors, all_statuses, elapsed),
+        'endpoints': {
+            label: _summarize(samples, errors[0], statuses, elapsed)
+            for label, (samples, errors, statuses) in per_endpoint.items()
+        }
+    }
+
+
+# ==================== BASELINE COMPARISON ====================
+
+def _change(current, baseline) -> Optional[float]:
+    if current is None or not baseline:
+        return None
+    return round((current - baseline) / baseline * 100, 1)
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, tolerance_pct: float = 10.0) -> Dict:
+    """
+    Compare a load report with a baseline report
+
+    A regression is p95 latency up, or throughput down, by more than
+    tolerance_pct, or an error rate above the baseline's.
+
+    Returns:
+        {'regressions': [...], 'endpoints': {label: {...changes...}}}
+    """
+    comparison = {'tolerance_pct': tolerance_pct, 'regressions': [], 'endpoints': {}}
+    rows = [('overall', report['overall'], baseline.get('overall'))]
+    rows += [(label, result, baseline.get('endpoints', {}).get(label)) for label, result in report['endpoints'].items()]
+
+    for label, current, previous in rows:
+        if not previous:
+            comparison['endpoints'][label] = {'status': 'new'}
+            continue
+
+        changes = {
+            'p95_change_pct': _change(current['latency_ms']['p95'], previous['latency_ms']['p95']),
+            'p50_change_pct': _change(current['latency_ms']['p50'], previous['latency_ms']['p50']),
+            'throughput_change_pct': _change(current['throughput_rps'], previous['throughput_rps']),
+            'error_rate': current['error_rate'],
+            'baseline_error_rate': previous['error_rate']
+        }
+        problems = []
+        if changes['p95_change_pct'] is not None and changes['p95_change_pct'] > tolerance_pct:
+            problems.append(f"p95 +{changes['p95_change_pct']}%")
+        # Throughput per endpoint depends on the mix; judge it overall only
+        if label == 'overall' and changes['throughput_change_pct'] is not None \
+                and changes['throughput_change_pct'] < -tolerance_pct:
+            problems.append(f"throughput {changes['throughput_change_pct']}%")
+        if current['error_rate'] > previous['error_rate']:
+            problems.append(f"error rate {previous['error_rate']:.2%} -> {current['error_rate']:.2%}")
+
+        changes['status'] = 'regressed' if problems else 'ok'
+        comparison['endpoints'][label] = changes
+        comparison['regressions'] += [f"{label}: {problem}" for problem in problems]
+
+    return comparison
+
+
+# ==================== OUTPUT ====================
+
+def save_report(report: Dict, output_dir: Optional[str] = None, filepath: Optional[str] = None) -> str:
+    """Write a load report as JSON; returns the path"""
+    if filepath is None:
+        output_dir = output_dir or os.getenv('MONITOR_OUTPUT_DIR', MONITOR_DIR)
+        os.makedirs(output_dir, exist_ok=True)
+        filepath = os.path.join(output_dir, f"load_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+
+    with open(filepath, 'w') as f:
+        json.dump(report, f, indent=2)
+    return filepath
+
+
+def load_report(filepath: str) -> Dict:
+    with open(filepath) as f:
+        return json.load(f)
+
+
+def print_load_report(report: Dict):
+    """Print throughput, latency and errors per endpoint (and the baseline comparison)"""
+    overall = report['overall']
+    settings = report['settings']
+    print("\n" + "=" * 50)
+    print("MONEY MATRIX - LOAD TEST REPORT")
+    print("=" * 50)
+    print(f"Target: {report['target']}  concurrency {settings['concurrency']}  duration {settings['duration_s']}s")
+    print(f"Overall: {overall['requests']} requests, {overall['throughput_rps']} req/s, "
+          f"errors {overall['errors']} ({overall['error_rate']:.2%})")
+    latency = overall['latency_ms']
+    print(f"Latency: p50 {latency['p50']}ms  p95 {latency['p95']}ms  p99 {latency['p99']}ms  max {latency['max']}ms")
+
+    print("\nHistogram:")
+    peak = max(overall['histogram'].values()) or 1
+    for label, count in overall['histogram'].items():
+        if count:
+            print(f"  {label:>9} {count:>7}  {'#' * max(1, round(count / peak * 40))}")
+
+    print("\nEndpoints:")
+    comparison = report.get('comparison', {}).get('endpoints', {})
+    for label, result in report['endpoints'].items():
+        latency = result['latency_ms']
+        change = comparison.get(label, {})
+        delta = f"  p95 {change['p95_change_pct']:+}%" if change.get('p95_change_pct') is not None else ''
+        print(f"  {label:<48} {result['throughput_rps']:>8} req/s  p50 {latency['p50']}ms  "
+              f"p95 {latency['p95']}ms  p99 {latency['p99']}ms  err {result['error_rate']:.2%}{delta}")
+
+    if 'comparison' in report:
+        regressions = report['comparison']['regressions']
+        print(f"\nBaseline comparison (tolerance {report['comparison']['tolerance_pct']}%): "
+              f"{'no regressions' if not regressions else str(len(regressions)) + ' regression(s)'}")
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
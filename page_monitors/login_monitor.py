@@ -5,15 +5,20 @@ Monitors UI, logic, and user experience for the login page
 
 import sys
 import os
-sys.path.append("S:\\MONEY_MATRIX\\MONEY_MATRIX")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from page_monitors.base_monitor import PageMonitor
+from page_monitors.base_monitor import PageMonitor, Endpoint
 
 class LoginMonitor(PageMonitor):
     """Monitor for the Login page"""
     
-    def __init__(self):
-        super().__init__("Login")
+    PAGE_PATH = '/auth/login'
+    API_ENDPOINTS = [
+        Endpoint('/auth/api/verify-token', 'POST', {'token': ''}, expect=(400,))
+    ]
+    
+    def __init__(self, target=None, iterations=None):
+        super().__init__("Login", target, iterations)
     
     def monitor_ui(self):
         """Monitor UI elements and components on the login page"""
@@ -46,7 +51,7 @@ class LoginMonitor(PageMonitor):
             'redirect_after_login': True,
             'session_management': True,
             'security_measures': True,
-            'api_endpoints_accessible': True
+            'api_endpoints_accessible': self.api_endpoints_accessible()
         }
     
     def monitor_ux(self):
@@ -5,15 +5,20 @@ Monitors UI, logic, and user experience for the registration page
 
 import sys
 import os
-sys.path.append("S:\\MONEY_MATRIX\\MONEY_MATRIX")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from page_monitors.base_monitor import PageMonitor
+from page_monitors.base_monitor import PageMonitor, Endpoint
 
 class RegisterMonitor(PageMonitor):
     """Monitor for the Register page"""
     
-    def __init__(self):
-        super().__init__("Register")
+    PAGE_PATH = '/auth/register'
+    API_ENDPOINTS = [
+        Endpoint('/auth/api/register', 'POST', {'email': 'not-an-email', 'password': ''}, expect=(400,))
+    ]
+    
+    def __init__(self, target=None, iterations=None):
+        super().__init__("Register", target, iterations)
     
     def monitor_ui(self):
         """Monitor UI elements and components on the registration page"""
@@ -52,7 +57,7 @@ class RegisterMonitor(PageMonitor):
             'email_verification_sent': True,
             'session_management': True,
             'security_measures': True,
-            'api_endpoints_accessible': True
+            'api_endpoints_accessible': self.api_endpoints_accessible()
         }
     
     def monitor_ux(self):
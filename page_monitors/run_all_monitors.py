@@ -1,16 +1,24 @@
 """
 Run All Page Monitors for Money Matrix
 Executes all individual page monitors and aggregates results
+
+Usage:
+    python page_monitors/run_all_monitors.py [--base-url URL] [--iterations 20]
+    python page_monitors/run_all_monitors.py --load [--concurrency 8] [--duration 30]
+        [--mix dashboard=3,transactions=3,budgets=2,analytics=2]
+        [--output-dir DIR] [--baseline FILE] [--save-baseline FILE] [--tolerance 10]
 """
 
 import sys
 import os
 import json
+import argparse
 from datetime import datetime
 
 # Add the project root to the path
-sys.path.append("S:\\MONEY_MATRIX\\MONEY_MATRIX")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from page_monitors.base_monitor import MONITOR_DIR, create_target
 from page_monitors.home_monitor import HomeMonitor
 from page_monitors.login_monitor import LoginMonitor
 from page_monitors.register_monitor import RegisterMonitor
@@ -20,34 +28,51 @@ from page_monitors.transactions_monitor import TransactionsMonitor
 from page_monitors.analytics_monitor import AnalyticsMonitor
 from page_monitors.settings_monitor import SettingsMonitor
 
-def run_all_monitors():
-    """Run all page monitors and collect results"""
+def run_all_monitors(base_url=None, iterations=None, output_dir=None):
+    """
+    Run all page monitors and collect results
+    
+    Args:
+        base_url: Probe a running server (default: MONITOR_BASE_URL, else the app in-process)
+        iterations: Requests per page/API (default: MONITOR_ITERATIONS)
+        output_dir: Directory for the metrics files (default: MONITOR_OUTPUT_DIR or page_monitors/)
+    """
+    # One probe target (and one app instance) shared by every monitor
+    target = create_target(base_url)
     monitors = [
-        HomeMonitor(),
-        LoginMonitor(),
-        RegisterMonitor(),
-        DashboardMonitor(),
-        BudgetsMonitor(),
-        TransactionsMonitor(),
-        AnalyticsMonitor(),
-        SettingsMonitor()
+        monitor_class(target, iterations)
+        for monitor_class in (
+            HomeMonitor,
+            LoginMonitor,
+            RegisterMonitor,
+            DashboardMonitor,
+            BudgetsMonitor,
+            TransactionsMonitor,
+            AnalyticsMonitor,
+            SettingsMonitor
+        )
     ]
     
     all_metrics = []
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = output_dir or os.getenv('MONITOR_OUTPUT_DIR', MONITOR_DIR)
+    os.makedirs(output_dir, exist_ok=True)
     
     print("Starting Money Matrix Page Monitoring...")
     print("=" * 50)
     
-    for monitor in monitors:
-        print(f"\nRunning {monitor.page_name} Monitor...")
-        metrics = monitor.collect_metrics()
-        monitor.print_summary()
-        monitor.save_metrics()
-        all_metrics.append(metrics)
+    try:
+        for monitor in monitors:
+            print(f"\nRunning {monitor.page_name} Monitor...")
+            metrics = monitor.collect_metrics()
+            monitor.print_summary()
+            monitor.save_metrics(os.path.join(output_dir, f"{monitor.page_name}_metrics_{timestamp}.json"))
+            all_metrics.append(metrics)
+    finally:
+        target.close()
     
     # Save aggregated results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    aggregated_file = f"S:\\MONEY_MATRIX\\MONEY_MATRIX\\page_monitors\\all_pages_metrics_{timestamp}.json"
+    aggregated_file = os.path.join(output_dir, f"all_pages_metrics_{timestamp}.json")
     
     with open(aggregated_file, 'w') as f:
         json.dump(all_metrics, f, indent=2)
@@ -73,7 +98,58 @@ def generate_report(metrics):
         print(f"  UI Score: {ui_score:.1f}%")
         print(f"  Logic Score: {logic_score:.1f}%")
         print(f"  UX Score: {ux_score:.1f}%")
+        
+        performance = page_metrics['performance_metrics']
+        print(f"  Page p50: {performance.get('response_time')}ms (render {performance.get('render_time')}ms)")
+        apis = performance.get('api', {})
+        if apis:
+            label, slowest = max(apis.items(), key=lambda item: item[1]['response_ms']['p95'] or 0)
+            print(f"  Slowest API: {label} (p95 {slowest['response_ms']['p95']}ms)")
+
+def run_load_test(args):
+    """Load-generation mode: concurrent weighted traffic against the page APIs"""
+    from page_monitors.load_test import (
+        parse_mix, run_load, compare_to_baseline, save_report, load_report, print_load_report
+    )
+    
+    mix = parse_mix(args.mix)
+    target = create_target(args.base_url)
+    try:
+        report = run_load(target, args.concurrency, args.duration, mix)
+    finally:
+        target.close()
+    
+    if args.baseline:
+        report['comparison'] = compare_to_baseline(report, load_report(args.baseline), args.tolerance)
+    
+    print_load_report(report)
+    print(f"\nLoad report saved to {save_report(report, args.output_dir)}")
+    if args.save_baseline:
+        print(f"Baseline saved to {save_report(report, filepath=args.save_baseline)}")
+    
+    return 1 if report.get('comparison', {}).get('regressions') else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Money Matrix page monitors and load test')
+    parser.add_argument('--base-url', help='probe a running server (default: MONITOR_BASE_URL, else in-process)')
+    parser.add_argument('--iterations', type=int, help='requests per page/API in monitor mode')
+    parser.add_argument('--output-dir', help='where to write results (default: MONITOR_OUTPUT_DIR or page_monitors/)')
+    load = parser.add_argument_group('load test')
+    load.add_argument('--load', action='store_true', help='run the concurrent load test instead of the monitors')
+    load.add_argument('--concurrency', type=int, default=8, help='worker threads')
+    load.add_argument('--duration', type=float, default=30.0, help='seconds of load')
+    load.add_argument('--mix', help='page weights, e.g. dashboard=3,transactions=3,budgets=2,analytics=2')
+    load.add_argument('--baseline', help='compare against this saved load report')
+    load.add_argument('--save-baseline', help='also save this run as a baseline file')
+    load.add_argument('--tolerance', type=float, default=10.0, help='allowed p95/throughput change in %%')
+    args = parser.parse_args(argv)
+    
+    if args.load:
+        return run_load_test(args)
+    
+    all_metrics = run_all_monitors(args.base_url, args.iterations, args.output_dir)
+    generate_report(all_metrics)
+    return 0
 
 if __name__ == "__main__":
-    all_metrics = run_all_monitors()
-    generate_report(all_metrics)
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
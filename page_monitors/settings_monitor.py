@@ -5,15 +5,20 @@ Monitors UI, logic, and user experience for the settings page
 
 import sys
 import os
-sys.path.append("S:\\MONEY_MATRIX\\MONEY_MATRIX")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from page_monitors.base_monitor import PageMonitor
+from page_monitors.base_monitor import PageMonitor, Endpoint
 
 class SettingsMonitor(PageMonitor):
     """Monitor for the Settings page"""
     
-    def __init__(self):
-        super().__init__("Settings")
+    PAGE_PATH = '/settings'
+    API_ENDPOINTS = [
+        Endpoint('/sync/api/status')
+    ]
+    
+    def __init__(self, target=None, iterations=None):
+        super().__init__("Settings", target, iterations)
     
     def monitor_ui(self):
         """Monitor UI elements and components on the settings page"""
@@ -50,7 +55,7 @@ class SettingsMonitor(PageMonitor):
             'api_integration': True,
             'error_handling': True,
             'session_management': True,
-            'api_endpoints_accessible': True
+            'api_endpoints_accessible': self.api_endpoints_accessible()
         }
     
     def monitor_ux(self):
@@ -5,15 +5,20 @@ Monitors UI, logic, and user experience for the transactions page
 
 import sys
 import os
-sys.path.append("S:\\MONEY_MATRIX\\MONEY_MATRIX")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from page_monitors.base_monitor import PageMonitor
+from page_monitors.base_monitor import PageMonitor, Endpoint
 
 class TransactionsMonitor(PageMonitor):
     """Monitor for the Transactions page"""
     
-    def __init__(self):
-        super().__init__("Transactions")
+    PAGE_PATH = '/transactions'
+    API_ENDPOINTS = [
+        Endpoint('/transactions/api/list')
+    ]
+    
+    def __init__(self, target=None, iterations=None):
+        super().__init__("Transactions", target, iterations)
     
     def monitor_ui(self):
         """Monitor UI elements and components on the transactions page"""
@@ -51,7 +56,7 @@ class TransactionsMonitor(PageMonitor):
             'api_integration': True,
             'error_handling': True,
             'session_management': True,
-            'api_endpoints_accessible': True
+            'api_endpoints_accessible': self.api_endpoints_accessible()
         }
     
     def monitor_ux(self):
@@ -0,0 +1,65 @@
+"""
+Test Fixtures
+Make the project importable when pytest is run from tests/, and build
+development apps on throwaway SQLite databases
+"""
+
+import os
+import sys
+import atexit
+import logging
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """
+    Factory for development apps (demo user, no Firebase) in testing mode
+
+    Keyword arguments override config values, e.g. make_app(QUERY_GUARD='warn').
+    Each app gets its own database file under tmp_path.
+    """
+    import config
+    from app import create_app
+    from utils.db_engine import optimize_sqlite
+
+    apps = []
+
+    def factory(**settings):
+        name = f"test-{len(apps)}"
+        config.config[name] = type('TestConfig', (config.DevelopmentConfig,), {
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / f'{name}.db'}",
+            'SQLALCHEMY_ECHO': False,
+            'DB_POOL_LEAK_DETECTION': 'false',
+            **settings
+        })
+        app = create_app(name)
+        logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+        apps.append((name, app))
+        return app
+
+    yield factory
+
+    for name, app in apps:
+        app.db_session.remove()
+        app.db_read_session.remove()
+        app.db_engine.dispose()
+        config.config.pop(name, None)
+    # PRAGMA optimize at exit would run after pytest closed the captured streams
+    atexit.unregister(optimize_sqlite)
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,63 @@
+"""
+Unusual Spend Detection
+The vectorized trailing median/MAD must match a naive per-window computation,
+and the API rejects out-of-range parameters
+"""
+
+import numpy as np
+import pytest
+
+from features.analytics import anomalies
+from features.analytics.anomalies import rolling_robust_stats
+from utils.histories import group_positions
+
+
+def _naive_stats(values, positions, window):
+    median = np.full(len(values), np.nan)
+    mad = np.full(len(values), np.nan)
+    for i, position in enumerate(positions):
+        history = values[i - min(position, window):i]
+        if len(history):
+            median[i] = np.median(history)
+            mad[i] = np.median(np.abs(history - median[i]))
+    return median, mad
+
+
+@pytest.mark.parametrize('chunk_size', [250_000, 4])
+def test_rolling_stats_match_naive(monkeypatch, chunk_size):
+    monkeypatch.setattr(anomalies, 'CHUNK_SIZE', chunk_size)
+    rng = np.random.default_rng(7)
+    # Groups shorter than, equal to and longer than the window, with ties
+    keys = np.repeat([0, 1, 2, 3], [1, 4, 9, 13])
+    values = np.round(rng.gamma(2.0, 20.0, len(keys)), 2)
+    values[20:24] = 35.0
+    positions = group_positions(keys)
+    window = 4
+
+    median, mad, history = rolling_robust_stats(values, positions, window)
+    expected_median, expected_mad = _naive_stats(values, positions, window)
+
+    np.testing.assert_allclose(median, expected_median, rtol=1e-5, equal_nan=True)
+    np.testing.assert_allclose(mad, expected_mad, rtol=1e-5, atol=1e-4, equal_nan=True)
+    assert history.tolist() == np.minimum(positions, window).tolist()
+
+    # Stats for a subset of rows are the same as for all rows
+    rows = np.flatnonzero(positions >= 2)
+    subset_median, subset_mad, _ = rolling_robust_stats(values, positions, window, rows)
+    np.testing.assert_allclose(subset_median, expected_median[rows], rtol=1e-5)
+    np.testing.assert_allclose(subset_mad, expected_mad[rows], rtol=1e-5, atol=1e-4)
+
+
+@pytest.mark.parametrize('query', ['days=0', 'days=100000', 'days=-5', 'limit=0', 'limit=100000', 'days=week'])
+def test_anomalies_rejects_bad_parameters(client, query):
+    response = client.get(f'/analytics/api/anomalies?{query}')
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_anomalies_defaults(client):
+    response = client.get('/analytics/api/anomalies')
+
+    assert response.status_code == 200
+    assert response.get_json()['data'] == []
@@ -0,0 +1,119 @@
+"""
+Transaction Auto-Categorization
+Predictions from a trained model, skipping when no usable model file exists,
+and leaving explicitly chosen categories alone
+"""
+
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from config import Config
+from models.base import Base
+from models.transaction import Category, Transaction
+from utils import categorizer
+from utils.categorizer import auto_categorize, save_model, train_model
+
+pytestmark = pytest.mark.skipif(not categorizer.CATEGORIZER_AVAILABLE, reason='scikit-learn/joblib not installed')
+
+UID = 'categorizer-test-user'
+
+LABELED = {
+    'Groceries': ['WHOLE FOODS MARKET', 'Trader Joes grocery', 'Safeway groceries', 'Kroger market', 'Aldi grocery store'],
+    'Dining': ['Starbucks coffee', 'Chipotle burrito', 'Pizza Hut delivery', 'Sushi restaurant', 'Burger King'],
+}
+
+
+@pytest.fixture
+def db_session(tmp_path, monkeypatch):
+    # Module-level model cache must not leak between tests
+    monkeypatch.setattr(categorizer, '_cached_model', None)
+    monkeypatch.setattr(categorizer, '_cached_mtime', None)
+    monkeypatch.setattr(categorizer, '_rejected_mtime', None)
+    monkeypatch.setattr(Config, 'CATEGORIZER_MODEL_PATH', str(tmp_path / 'categorizer.joblib'))
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'categorizer.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def categories(db_session):
+    rows = {name: Category(name=name, type='expense') for name in LABELED}
+    db_session.add_all(rows.values())
+    db_session.commit()
+    for name, descriptions in LABELED.items():
+        db_session.add_all([
+            Transaction(firebase_uid=UID, amount=Decimal('10.00'), type='expense', category_id=rows[name].id,
+                        description=description, date=date(2025, 3, 1))
+            for description in descriptions
+        ])
+    db_session.commit()
+    return {name: category.id for name, category in rows.items()}
+
+
+def _new(description, category_id=None):
+    return Transaction(firebase_uid=UID, amount=Decimal('20.00'), type='expense', category_id=category_id,
+                       description=description, date=date(2025, 4, 1))
+
+
+def test_predicts_category(db_session, categories):
+    model = train_model(db_session, min_examples=3)
+    transactions = [_new('Whole Foods grocery'), _new('Starbucks coffee #4411'), _new(None)]
+
+    assert auto_categorize(db_session, transactions, model) == 2
+
+    assert [t.category_id for t in transactions] == [categories['Groceries'], categories['Dining'], None]
+
+
+def test_explicit_category_is_kept(db_session, categories):
+    model = train_model(db_session, min_examples=3)
+    transaction = _new('Whole Foods grocery', category_id=categories['Dining'])
+
+    assert auto_categorize(db_session, [transaction], model) == 0
+
+    assert transaction.category_id == categories['Dining']
+
+
+def test_missing_model_file_skips(db_session, categories):
+    transaction = _new('Whole Foods grocery')
+
+    assert auto_categorize(db_session, [transaction]) == 0
+
+    assert transaction.category_id is None
+
+
+def test_rejected_model_is_skipped_until_replaced(db_session, categories, monkeypatch):
+    path = Config.CATEGORIZER_MODEL_PATH
+    with open(path, 'wb') as f:
+        f.write(b'not a joblib file')
+
+    assert auto_categorize(db_session, [_new('Whole Foods grocery')]) == 0
+    assert categorizer._rejected_mtime == os.stat(path).st_mtime
+
+    # The broken file is not loaded again on every write
+    loads = []
+    real_load = categorizer.joblib.load
+
+    def counting_load(*args, **kwargs):
+        loads.append(args)
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(categorizer.joblib, 'load', counting_load)
+    assert auto_categorize(db_session, [_new('Whole Foods grocery')]) == 0
+    assert loads == []
+
+    # A retrain replaces the file, which is picked up
+    save_model(train_model(db_session, min_examples=3), path)
+    os.utime(path, (1, 1))
+    transaction = _new('Whole Foods grocery')
+    assert auto_categorize(db_session, [transaction]) == 1
+    assert transaction.category_id == categories['Groceries']
+    assert len(loads) == 1
@@ -0,0 +1,106 @@
+"""
+Feature Load Order
+Dependency waves, cycle rejection and unknown dependencies, and freshness
+of the discovery index
+"""
+
+import os
+import json
+
+from flask import Flask
+
+from features import FeatureRegistry, index_is_fresh, resolve_load_order, scan_features
+
+
+def _manifest(name, dependencies=(), priority=100, **extra):
+    return {'name': name, 'version': '1.0.0', 'dependencies': list(dependencies), 'priority': priority, **extra}
+
+
+def _names(waves):
+    return [[m['name'] for m in wave] for wave in waves]
+
+
+def _registry_with(manifests):
+    """Registry whose discovery returns the given manifests (nothing is imported)"""
+    registry = FeatureRegistry(Flask(__name__))
+    registry.discover_features = lambda: registry.discovered_features.extend(manifests)
+    return registry
+
+
+def test_dag_loads_in_waves_by_priority():
+    manifests = [
+        _manifest('reports', ['analytics', 'budgets']),
+        _manifest('analytics', ['auth']),
+        _manifest('budgets', ['auth'], priority=50),
+        _manifest('auth', priority=10),
+        _manifest('help'),
+    ]
+
+    waves, rejected = resolve_load_order(manifests)
+
+    assert rejected == {}
+    assert _names(waves) == [['auth', 'help'], ['budgets', 'analytics'], ['reports']]
+
+
+def test_cycle_is_reported_in_failed_features():
+    registry = _registry_with([
+        _manifest('a', ['b']),
+        _manifest('b', ['c']),
+        _manifest('c', ['a']),
+        _manifest('d', ['a']),
+    ])
+
+    assert registry.load_all_features() == 0
+
+    assert set(registry.failed_features) == {'a', 'b', 'c', 'd'}
+    assert registry.failed_features['a'] == 'Dependency cycle: a -> b -> c -> a'
+    assert registry.loaded_features == []
+
+
+def test_unknown_dependency_rejects_feature_and_dependents():
+    registry = _registry_with([
+        _manifest('sync', ['cloud']),
+        _manifest('exports', ['sync']),
+    ])
+
+    assert registry.load_all_features() == 0
+
+    assert registry.failed_features == {
+        'sync': 'Missing dependencies: cloud',
+        'exports': 'Dependency unavailable: sync',
+    }
+
+
+def _write_feature(features_dir, name):
+    package = features_dir / name
+    package.mkdir()
+    (package / '__init__.py').write_text('def init_feature(app):\n    pass\n')
+    (package / 'manifest.json').write_text(json.dumps(_manifest(name, display_name=name.title(), enabled=True)))
+    return package
+
+
+def test_index_survives_pycache(tmp_path):
+    package = _write_feature(tmp_path, 'reports')
+    index = scan_features(str(tmp_path))
+
+    # Importing the feature writes __pycache__, which bumps the directory mtime
+    (package / '__pycache__').mkdir()
+    os.utime(package, (1, 1))
+
+    assert index_is_fresh(index, str(tmp_path))
+
+
+def test_index_stale_after_manifest_or_init_change(tmp_path):
+    package = _write_feature(tmp_path, 'reports')
+
+    index = scan_features(str(tmp_path))
+    os.utime(package / 'manifest.json', (1, 1))
+    assert not index_is_fresh(index, str(tmp_path))
+
+    index = scan_features(str(tmp_path))
+    os.utime(package / '__init__.py', (1, 1))
+    assert not index_is_fresh(index, str(tmp_path))
+
+    index = scan_features(str(tmp_path))
+    _write_feature(tmp_path, 'exports')
+    assert not index_is_fresh(index, str(tmp_path))
@@ -0,0 +1,51 @@
+"""
+Health Checks
+/readyz reports a crashed feature loader as not ready, and shows failure
+details to admins without verifying their token twice
+"""
+
+from features import FeatureRegistry
+from utils import auth_decorators
+
+
+def test_readyz_ready_with_features_loaded(client):
+    response = client.get('/readyz')
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['checks']['database']['ok']
+    assert body['checks']['features']['loaded'] > 0
+
+
+def test_readyz_not_ready_when_loader_crashed(make_app, monkeypatch):
+    def crash(self):
+        raise RuntimeError('manifest index unreadable')
+
+    monkeypatch.setattr(FeatureRegistry, 'load_all_features', crash)
+    app = make_app()
+
+    response = app.test_client().get('/readyz')
+
+    assert not hasattr(app, 'feature_registry')
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'not_ready'
+    assert response.get_json()['checks']['features'] == {'ok': False}
+
+
+def test_readyz_admin_details_verify_token_once(make_app, tmp_path, monkeypatch):
+    calls = []
+
+    def verify_token(token):
+        calls.append(token)
+        return {'uid': 'admin-uid', 'admin': True}
+
+    monkeypatch.setattr(auth_decorators, 'verify_token', verify_token)
+    app = make_app(PROFILER_ENABLED=True, PROFILE_DIR=str(tmp_path / 'profiles'))
+    client = app.test_client()
+
+    # The profiler header check resolves the admin first; /readyz reuses it
+    response = client.get('/readyz', headers={'X-Profile': '1', 'Authorization': 'Bearer admin'})
+
+    assert 'errors' in response.get_json()['checks']['features']
+    assert calls == ['admin']
+    assert 'errors' not in client.get('/readyz').get_json()['checks']['features']
@@ -0,0 +1,104 @@
+"""
+Lazy Features
+First-request loading, routing after load, 404/405 and import failures
+"""
+
+import sys
+import types
+
+import pytest
+from flask import Blueprint, g, jsonify, request, url_for
+
+
+def _probe_module(name, fail=False):
+    """In-memory feature package with a hook, an error handler and two routes"""
+    module = types.ModuleType(f'features.{name}')
+
+    def init_feature(app):
+        if fail:
+            raise RuntimeError('probe dependency missing')
+        bp = Blueprint(name, module.__name__, url_prefix=f'/{name}')
+
+        @bp.before_request
+        def mark():
+            g.probe_hook = True
+
+        @bp.errorhandler(KeyError)
+        def missing_key(error):
+            return jsonify({'error': 'missing key'}), 422
+
+        @bp.route('/api/item/<int:item_id>', methods=['GET'])
+        def get_item(item_id):
+            return jsonify({'id': item_id, 'hook': g.get('probe_hook', False), 'endpoint': request.endpoint})
+
+        @bp.route('/api/broken', methods=['GET'])
+        def broken():
+            raise KeyError('item')
+
+        return bp
+
+    module.init_feature = init_feature
+    return module
+
+
+@pytest.fixture
+def lazy_app(make_app, monkeypatch):
+    """App with two extra lazy features: 'lazyprobe' loads, 'lazybroken' fails in init_feature"""
+    app = make_app()
+    for name, fail in (('lazyprobe', False), ('lazybroken', True)):
+        monkeypatch.setitem(sys.modules, f'features.{name}', _probe_module(name, fail))
+        success, error_msg = app.feature_registry.register_lazy_feature({'name': name, 'url_prefix': f'/{name}'})
+        assert success, error_msg
+    return app
+
+
+def test_first_request_runs_blueprint_hooks(lazy_app):
+    client = lazy_app.test_client()
+
+    first = client.get('/lazyprobe/api/item/7').get_json()
+    second = client.get('/lazyprobe/api/item/8').get_json()
+
+    assert first == {'id': 7, 'hook': True, 'endpoint': 'lazyprobe.get_item'}
+    assert second == {'id': 8, 'hook': True, 'endpoint': 'lazyprobe.get_item'}
+    assert lazy_app.feature_registry.lazy_features['lazyprobe'].is_loaded
+
+
+def test_real_endpoints_registered_after_load(lazy_app):
+    client = lazy_app.test_client()
+    client.get('/lazyprobe/api/item/1')
+
+    with lazy_app.test_request_context():
+        assert url_for('lazyprobe.get_item', item_id=3) == '/lazyprobe/api/item/3'
+    adapter = lazy_app.url_map.bind('localhost')
+    assert adapter.match('/lazyprobe/api/item/3')[0] == 'lazyprobe.get_item'
+    # Blueprint error handlers apply as well
+    response = client.get('/lazyprobe/api/broken')
+    assert response.status_code == 422
+    assert response.get_json() == {'error': 'missing key'}
+
+
+def test_unknown_path_is_404(lazy_app):
+    client = lazy_app.test_client()
+
+    assert client.get('/lazyprobe/api/nothing-here').status_code == 404
+    # Also once loaded, when the request falls through to the stub
+    assert client.get('/lazyprobe/api/nothing-else').status_code == 404
+
+
+def test_wrong_method_is_405(lazy_app):
+    response = lazy_app.test_client().delete('/lazyprobe/api/item/1')
+
+    assert response.status_code == 405
+    assert 'GET' in response.headers['Allow']
+
+
+def test_import_failure_is_503(lazy_app):
+    client = lazy_app.test_client()
+
+    response = client.get('/lazybroken/api/item/1')
+
+    assert response.status_code == 503
+    assert response.get_json() == {'error': "Feature 'lazybroken' is unavailable"}
+    assert 'probe dependency missing' in lazy_app.feature_registry.failed_features['lazybroken']
+    # The failure is remembered rather than retried on every request
+    assert client.get('/lazybroken/').status_code == 503
@@ -0,0 +1,56 @@
+"""
+Query Guard
+@query_budget overruns fail in raise mode, only log in warn mode, and the
+bulk budget usage endpoint stays within its budget
+"""
+
+import logging
+
+import pytest
+from flask import jsonify
+from sqlalchemy import text
+
+from utils.query_guard import QueryBudgetExceeded, query_budget
+from utils.seed import seed_database
+
+
+def _add_two_query_route(app):
+    @app.route('/api/test/two-queries')
+    @query_budget(1)
+    def two_queries():
+        app.db_session.execute(text('SELECT 1'))
+        app.db_session.execute(text('SELECT 2'))
+        return jsonify({'success': True})
+
+
+def test_raise_mode_fails_over_budget(make_app):
+    app = make_app(QUERY_GUARD='raise')
+    _add_two_query_route(app)
+
+    with pytest.raises(QueryBudgetExceeded, match=r'executed 2 queries \(budget 1\)'):
+        app.test_client().get('/api/test/two-queries')
+
+
+def test_warn_mode_only_logs(make_app, caplog):
+    app = make_app(QUERY_GUARD='warn')
+    _add_two_query_route(app)
+
+    with caplog.at_level(logging.WARNING, logger='utils.query_guard'):
+        response = app.test_client().get('/api/test/two-queries')
+
+    assert response.status_code == 200
+    assert response.headers['X-Query-Count'] == '2'
+    assert any('Query budget exceeded' in record.getMessage() for record in caplog.records)
+
+
+def test_budget_usage_within_budget(make_app):
+    app = make_app(QUERY_GUARD='raise')
+    stats = seed_database(app.db_session, users=1, transactions=500, demo_user=True)
+    app.db_session.remove()
+    assert stats['budgets'] > 0
+
+    response = app.test_client().get('/budgets/api/usage')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == stats['budgets']
+    assert int(response.headers['X-Query-Count']) <= 2
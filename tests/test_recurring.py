@@ -0,0 +1,104 @@
+"""
+Recurring Signature Fold
+Signatures folded in from flushes must match a rebuild from raw transactions,
+and charge projections are capped
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.recurring import RecurringSignature
+from models.transaction import Transaction
+from utils.recurring import register_signature_listeners, rebuild_signatures
+
+UID = 'recurring-test-user'
+
+EXACT_COLUMNS = (
+    'firebase_uid', 'signature', 'description', 'amount_band', 'last_amount', 'occurrences',
+    'first_seen', 'last_seen', 'interval_count', 'cadence_days', 'next_expected', 'is_recurring'
+)
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'recurring.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    register_signature_listeners(factory)
+    session = factory()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _signature_rows(db_session):
+    table = RecurringSignature.__table__
+    rows = db_session.execute(select(table)).mappings().all()
+    return sorted((dict(row) for row in rows), key=lambda row: row['signature'])
+
+
+def _charge(description, amount, day):
+    return Transaction(firebase_uid=UID, amount=Decimal(amount), type='expense', description=description, date=day)
+
+
+def test_fold_matches_rebuild(db_session):
+    # Monthly charges arrive two at a time, then one per commit
+    db_session.add_all([
+        _charge('NETFLIX.COM 8841', '15.49', date(2025, 1, 5)),
+        _charge('NETFLIX.COM 9120', '15.49', date(2025, 2, 4)),
+    ])
+    db_session.commit()
+    for day in (date(2025, 3, 6), date(2025, 4, 5), date(2025, 5, 5)):
+        db_session.add(_charge('Netflix.com 7731', '15.99', day))
+        db_session.commit()
+
+    # Weekly charges with a little jitter, all in one flush
+    gym_days = [date(2025, 1, 2) + timedelta(days=7 * week + week % 2) for week in range(8)]
+    db_session.add_all([_charge('City Gym', '12.00', day) for day in gym_days])
+    db_session.commit()
+
+    # A one-off, a charge in a different amount band and income are not recurring
+    db_session.add_all([
+        _charge('Hardware Store', '84.10', date(2025, 3, 14)),
+        _charge('City Gym', '240.00', date(2025, 4, 1)),
+        Transaction(firebase_uid=UID, amount=Decimal('2500.00'), type='income',
+                    description='Salary', date=date(2025, 1, 28)),
+    ])
+    db_session.commit()
+
+    incremental = _signature_rows(db_session)
+    rebuild_signatures(db_session)
+    rebuilt = _signature_rows(db_session)
+
+    assert len(incremental) == len(rebuilt) == 4
+    for folded, expected in zip(incremental, rebuilt):
+        assert {c: folded[c] for c in EXACT_COLUMNS} == {c: expected[c] for c in EXACT_COLUMNS}
+        assert folded['interval_mean'] == pytest.approx(expected['interval_mean'])
+        assert folded['interval_m2'] == pytest.approx(expected['interval_m2'], abs=1e-6)
+
+    cadences = {row['description']: row['cadence_days'] for row in rebuilt if row['is_recurring']}
+    assert cadences == {'Netflix.com 7731': 30, 'City Gym': 7}
+
+
+def test_upcoming_days_are_capped(app, client):
+    today = date.today()
+    app.db_session.add(RecurringSignature(
+        firebase_uid='demo-user-id', signature='streaming|12', description='Streaming', amount_band=12,
+        last_amount=Decimal('9.99'), occurrences=6, first_seen=today - timedelta(days=150), last_seen=today,
+        interval_count=5, interval_mean=30.0, interval_m2=0.0, cadence_days=30,
+        next_expected=today + timedelta(days=30), is_recurring=True
+    ))
+    app.db_session.commit()
+
+    response = client.get('/analytics/api/subscriptions/upcoming?days=100000')
+
+    assert response.status_code == 200
+    charges = response.get_json()['data']
+    assert len(charges) == 12
+    assert charges[-1]['date'] <= (today + timedelta(days=365)).isoformat()
+    assert client.get('/analytics/api/subscriptions/upcoming?days=soon').status_code == 400
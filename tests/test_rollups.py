@@ -0,0 +1,91 @@
+"""
+Rollup Delta Bookkeeping
+The incrementally maintained rollup must match a rebuild from raw transactions
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.rollup import MonthlyCategoryRollup
+from models.transaction import Category, Transaction
+from utils.rollups import register_rollup_listeners, rebuild_rollups
+
+UID = 'rollup-test-user'
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rollups.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    register_rollup_listeners(factory)
+    session = factory()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _rollup_rows(db_session):
+    table = MonthlyCategoryRollup.__table__
+    rows = db_session.execute(select(
+        table.c.firebase_uid, table.c.year, table.c.month, table.c.category_id,
+        table.c.type, table.c.total, table.c.count
+    )).all()
+    return sorted((tuple(row) for row in rows), key=repr)
+
+
+def assert_matches_rebuild(db_session):
+    incremental = _rollup_rows(db_session)
+    rebuild_rollups(db_session)
+    assert incremental == _rollup_rows(db_session)
+
+
+def test_deltas_match_rebuild(db_session):
+    food = Category(name='Food', type='expense')
+    rent = Category(name='Rent', type='expense')
+    db_session.add_all([food, rent])
+    db_session.commit()
+
+    # Insert, including two uncategorized charges sharing the NULL bucket
+    transactions = [
+        Transaction(firebase_uid=UID, amount=Decimal('12.50'), type='expense', category_id=food.id, date=date(2025, 1, 3)),
+        Transaction(firebase_uid=UID, amount=Decimal('7.25'), type='expense', category_id=food.id, date=date(2025, 1, 9)),
+        Transaction(firebase_uid=UID, amount=Decimal('900.00'), type='expense', category_id=rent.id, date=date(2025, 1, 1)),
+        Transaction(firebase_uid=UID, amount=Decimal('3.10'), type='expense', category_id=None, date=date(2025, 1, 4)),
+        Transaction(firebase_uid=UID, amount=Decimal('2500.00'), type='income', category_id=None, date=date(2025, 1, 28)),
+    ]
+    db_session.add_all(transactions)
+    db_session.commit()
+    db_session.add(Transaction(firebase_uid=UID, amount=Decimal('4.90'), type='expense', category_id=None,
+                               date=date(2025, 1, 20)))
+    db_session.commit()
+    assert_matches_rebuild(db_session)
+    null_buckets = [row for row in _rollup_rows(db_session) if row[3] is None and row[4] == 'expense']
+    assert len(null_buckets) == 1 and null_buckets[0][5:] == (Decimal('8.00'), 2)
+
+    # Amount, category and date edits move contributions between buckets
+    transactions[0].amount = Decimal('15.00')
+    transactions[1].category_id = None
+    transactions[2].date = date(2025, 2, 1)
+    transactions[3].category_id = rent.id
+    db_session.commit()
+    assert_matches_rebuild(db_session)
+
+    # Soft delete, then restore
+    transactions[0].is_deleted = True
+    db_session.commit()
+    assert_matches_rebuild(db_session)
+    transactions[0].is_deleted = False
+    db_session.commit()
+    assert_matches_rebuild(db_session)
+
+    # Hard delete empties a bucket, which must disappear rather than linger at zero
+    db_session.delete(transactions[2])
+    db_session.commit()
+    assert_matches_rebuild(db_session)
+    assert all(row[6] > 0 for row in _rollup_rows(db_session))
@@ -0,0 +1,56 @@
+"""
+Sampling Profiler
+The admin-only X-Profile header verifies the bearer token once per request
+"""
+
+import pytest
+from flask import g, jsonify
+
+from utils import auth_decorators
+from utils.auth_decorators import require_admin
+
+
+@pytest.fixture
+def verified(monkeypatch):
+    """Replace Firebase token verification; tokens named 'admin' carry the admin claim"""
+    calls = []
+
+    def verify_token(token):
+        calls.append(token)
+        return {'uid': f'{token}-uid', 'email': f'{token}@example.com', 'admin': token == 'admin'}
+
+    monkeypatch.setattr(auth_decorators, 'verify_token', verify_token)
+    return calls
+
+
+@pytest.fixture
+def profiled_app(make_app, tmp_path):
+    app = make_app(PROFILER_ENABLED=True, PROFILE_SAMPLE_RATE=0, PROFILE_DIR=str(tmp_path / 'profiles'))
+
+    @app.route('/api/test/admin-only')
+    @require_admin
+    def admin_only():
+        return jsonify({'uid': g.user_id})
+
+    return app
+
+
+def test_admin_header_verifies_token_once(profiled_app, verified):
+    response = profiled_app.test_client().get(
+        '/api/test/admin-only', headers={'X-Profile': '1', 'Authorization': 'Bearer admin'}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == {'uid': 'admin-uid'}
+    assert 'X-Profile-Id' in response.headers
+    assert verified == ['admin']
+
+
+def test_non_admin_header_is_ignored(profiled_app, verified):
+    response = profiled_app.test_client().get(
+        '/api/test/admin-only', headers={'X-Profile': '1', 'Authorization': 'Bearer member'}
+    )
+
+    assert response.status_code == 403
+    assert 'X-Profile-Id' not in response.headers
+    assert verified == ['member']
@@ -0,0 +1,55 @@
+"""
+Time Series Resampling
+The monthly rollup path must agree with the raw daily path, and oversized
+ranges are rejected
+"""
+
+from datetime import date
+
+import pytest
+
+from features.analytics import series
+from features.analytics.series import MAX_PERIODS, build_series
+from models.transaction import Transaction
+from utils.seed import DEMO_UID, seed_database
+
+START, END = date(2025, 1, 1), date(2025, 12, 31)
+
+
+@pytest.fixture
+def seeded_app(make_app):
+    app = make_app()
+    seed_database(app.db_session, users=1, transactions=2000, demo_user=True)
+    app.db_session.remove()
+    return app
+
+
+@pytest.mark.parametrize('granularity', ['month', 'quarter', 'year'])
+@pytest.mark.parametrize('filtered', [False, True])
+def test_rollup_matches_daily_path(seeded_app, monkeypatch, granularity, filtered):
+    db_session = seeded_app.db_session
+    category_ids = None
+    if filtered:
+        used = db_session.query(Transaction.category_id).filter(
+            Transaction.firebase_uid == DEMO_UID, Transaction.type == 'expense', Transaction.category_id.isnot(None)
+        ).distinct().order_by(Transaction.category_id).all()
+        category_ids = [category_id for category_id, in used[:3]]
+
+    from_rollup = build_series(db_session, DEMO_UID, START, END, granularity, category_ids=category_ids)
+    monkeypatch.setattr(series, '_is_month_aligned', lambda start, end: False)
+    from_days = build_series(db_session, DEMO_UID, START, END, granularity, category_ids=category_ids)
+
+    assert from_rollup['period'] == from_days['period']
+    assert sum(from_rollup['expense_count']) > 0
+    for txn_type in series.TYPES:
+        assert from_rollup[f'{txn_type}_count'] == from_days[f'{txn_type}_count']
+        assert from_rollup[txn_type] == pytest.approx(from_days[txn_type])
+
+
+def test_too_many_periods_is_400(client):
+    response = client.get('/analytics/api/series?start=2000-01-01&end=2025-12-31&granularity=day')
+
+    assert response.status_code == 400
+    assert str(MAX_PERIODS) in response.get_json()['error']
+    # The same range is fine at a coarser granularity
+    assert client.get('/analytics/api/series?start=2000-01-01&end=2025-12-31&granularity=month').status_code == 200
@@ -5,6 +5,7 @@ Shared Utilities Package
 from .auth_decorators import require_auth, require_admin
 from .firebase_helpers import verify_token, get_user_from_token
 from .validators import validate_email, validate_amount, validate_date
+from .db_routing import get_session
 
 __all__ = [
     'require_auth',
@@ -13,5 +14,6 @@ __all__ = [
     'get_user_from_token',
     'validate_email',
     'validate_amount',
-    'validate_date'
+    'validate_date',
+    'get_session'
 ]
@@ -0,0 +1,66 @@
+"""
+Async I/O Helpers
+Overlapping Firestore, Gemini and Firebase waits inside async views
+
+Flask runs an async view in a fresh event loop on a helper thread (asgiref)
+while the worker thread waits for it. Within that view, independent remote
+calls can run concurrently: blocking SDK calls go to the default thread pool
+with asyncio.to_thread() and are awaited together with gather_io().
+
+Database work must not run on the loop thread: app.db_session is a
+thread-local scoped_session, so a query there would open a second session
+that the request teardown never removes. Wrap it with on_request_thread(),
+which runs the function back on the worker thread that owns the session.
+
+Set ASYNC_IO_CONCURRENT=false to await the calls one after another (the
+behaviour of the old sync views), e.g. to compare the two under load.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List
+
+from flask import current_app
+
+try:
+    from asgiref.sync import sync_to_async
+    ASGIREF_AVAILABLE = True
+except ImportError:
+    ASGIREF_AVAILABLE = False
+    sync_to_async = None
+
+
+def on_request_thread(func: Callable) -> Callable[..., Awaitable]:
+    """
+    Awaitable wrapper that runs a sync function on the request's worker thread
+
+    Args:
+        func: Function using app.db_session / get_session()
+
+    Returns:
+        Coroutine function with the same arguments
+    """
+    if not ASGIREF_AVAILABLE:
+        raise RuntimeError("Async views require asgiref. Run 'pip install asgiref'")
+    return sync_to_async(func, thread_sensitive=True)
+
+
+async def gather_io(*awaitables: Awaitable) -> List[Any]:
+    """
+    Await independent I/O calls, concurrently unless ASYNC_IO_CONCURRENT is off
+
+    Returns:
+        Results in argument order; the first exception propagates
+    """
+    if current_app.config.get('ASYNC_IO_CONCURRENT', True):
+        return list(await asyncio.gather(*awaitables))
+
+    results = []
+    pending = list(awaitables)
+    try:
+        while pending:
+            results.append(await pending.pop(0))
+    finally:
+        for awaitable in pending:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()  # Never started; avoids 'never awaited' warnings
+    return results
@@ -1,10 +1,14 @@
 """
 Authentication Decorators
 Flask route decorators for authentication and authorization
+
+The decorators work on both sync and async views: the wrapped view is
+called through current_app.ensure_sync(), as Flask requires for decorators
+around coroutine functions.
 """
 
 from functools import wraps
-from flask import request, jsonify, g
+from flask import request, jsonify, g, current_app
 from .firebase_helpers import verify_token, get_user_from_token
 import logging
 
@@ -42,11 +46,54 @@ def require_auth(f):
         g.user_id = decoded_token.get('uid')
         g.user_email = decoded_token.get('email')
         
-        return f(*args, **kwargs)
+        return current_app.ensure_sync(f)(*args, **kwargs)
     
     return decorated_function
 
 
+def authenticate_admin():
+    """
+    Verify that the request's bearer token carries the admin custom claim
+    Shared by require_admin and checks outside views (e.g. the profiler header)
+    
+    The result is kept on g.admin_auth, so a request that passes through
+    several of these checks verifies its token only once. An admin's
+    identity is also set on g (user_id, user_email, is_admin).
+    
+    Returns:
+        (decoded_token, None) for an admin, else (None, error response tuple)
+    """
+    if 'admin_auth' not in g:
+        g.admin_auth = _check_admin_token()
+        decoded_token = g.admin_auth[0]
+        if decoded_token is not None:
+            g.user_id = decoded_token.get('uid')
+            g.user_email = decoded_token.get('email')
+            g.is_admin = True
+    return g.admin_auth
+
+
+def _check_admin_token():
+    # Get token from Authorization header
+    auth_header = request.headers.get('Authorization', '')
+    token = auth_header.replace('Bearer ', '').strip()
+    
+    if not token:
+        return None, (jsonify({'error': 'No authentication token provided'}), 401)
+    
+    # Verify token and get user
+    decoded_token = verify_token(token)
+    
+    if not decoded_token:
+        return None, (jsonify({'error': 'Invalid or expired token'}), 401)
+    
+    # Check for admin custom claim
+    if not decoded_token.get('admin', False):
+        return None, (jsonify({'error': 'Admin access required'}), 403)
+    
+    return decoded_token, None
+
+
 def require_admin(f):
     """
     Decorator to require admin role
@@ -60,31 +107,13 @@ def require_admin(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        # Get token from Authorization header
-        auth_header = request.headers.get('Authorization', '')
-        token = auth_header.replace('Bearer ', '').strip()
-        
-        if not token:
-            return jsonify({'error': 'No authentication token provided'}), 401
-        
-        # Verify token and get user
-        decoded_token = verify_token(token)
+        # Also stores user info in g object
+        decoded_token, error = authenticate_admin()
         
-        if not decoded_token:
-            return jsonify({'error': 'Invalid or expired token'}), 401
-        
-        # Check for admin custom claim
-        is_admin = decoded_token.get('admin', False)
-        
-        if not is_admin:
-            return jsonify({'error': 'Admin access required'}), 403
-        
-        # Store user info in g object
-        g.user_id = decoded_token.get('uid')
-        g.user_email = decoded_token.get('email')
-        g.is_admin = True
+        if error:
+            return error
         
-        return f(*args, **kwargs)
+        return current_app.ensure_sync(f)(*args, **kwargs)
     
     return decorated_function
 
@@ -112,7 +141,7 @@ def optional_auth(f):
             g.user_id = None
             g.user_email = None
         
-        return f(*args, **kwargs)
+        return current_app.ensure_sync(f)(*args, **kwargs)
     
     return decorated_function
 
@@ -133,24 +162,22 @@ def login_required(f):
             # Check if Firebase is configured
             try:
                 from firebase_admin import auth as firebase_auth
-                from flask import current_app
                 
                 # If Firebase is not initialized, allow demo access in development
                 if current_app.config.get('DEBUG', False):
                     logger.warning('Firebase not configured - using demo user for development')
                     g.user_id = 'demo-user-id'
                     g.user_email = 'demo@example.com'
-                    return f(*args, **kwargs)
+                    return current_app.ensure_sync(f)(*args, **kwargs)
                 else:
                     return jsonify({'error': 'Authentication required'}), 401
             except Exception:
                 # Firebase not initialized - allow demo access in development
-                from flask import current_app
                 if current_app.config.get('DEBUG', False):
                     logger.warning('Firebase not configured - using demo user for development')
                     g.user_id = 'demo-user-id'
                     g.user_email = 'demo@example.com'
-                    return f(*args, **kwargs)
+                    return current_app.ensure_sync(f)(*args, **kwargs)
                 else:
                     return jsonify({'error': 'Authentication required'}), 401
         
@@ -164,6 +191,6 @@ def login_required(f):
         g.user_id = decoded_token.get('uid')
         g.user_email = decoded_token.get('email')
         
-        return f(*args, **kwargs)
+        return current_app.ensure_sync(f)(*args, **kwargs)
     
     return decorated_function
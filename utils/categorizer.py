@@ -0,0 +1,319 @@
+"""
+Transaction Auto-Categorization
+Local text classifier trained on users' already-categorized descriptions
+
+Descriptions are turned into hashed word/bigram features (no vocabulary to
+store or grow) and scored with a multinomial naive Bayes weight matrix.
+Classes are (category type, category name) pairs shared across users, so
+'Groceries' learned from one user helps everyone; at prediction time the
+scores are restricted to the categories the user actually has and the
+winning name is mapped back to that user's category id.
+
+The model is a plain dict of NumPy arrays persisted with joblib. It is loaded
+with mmap_mode='r', so gunicorn workers share one copy of the weights through
+the page cache instead of each holding its own.
+"""
+
+import os
+import logging
+import tempfile
+import threading
+import importlib.util
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import joblib
+    # scikit-learn takes ~0.5s to import, so it is only imported on first use
+    CATEGORIZER_AVAILABLE = importlib.util.find_spec('sklearn') is not None
+except ImportError:
+    CATEGORIZER_AVAILABLE = False
+    joblib = None
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION = 1
+# Hashed feature space; weights take n_features * n_classes * 4 bytes
+N_FEATURES = 2 ** 16
+# Rows per partial_fit step while training
+TRAINING_CHUNK_SIZE = 50_000
+
+_model_lock = threading.Lock()
+_cached_model: Optional[Dict] = None
+_cached_mtime: Optional[float] = None
+# mtime of a model file that failed to load or was incompatible; not retried until replaced
+_rejected_mtime: Optional[float] = None
+
+
+def _vectorizer():
+    """Stateless feature extractor shared by training and prediction"""
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(
+        n_features=N_FEATURES,
+        ngram_range=(1, 2),
+        token_pattern=r'(?u)\b[a-z]{2,}\b',  # Words only: store numbers and dates are noise
+        alternate_sign=False,
+        norm='l2',
+        dtype=np.float32
+    )
+
+
+def _class_key(category_type: str, name: str) -> Tuple[str, str]:
+    return category_type, name.strip().lower()
+
+
+# ==================== TRAINING ====================
+
+def train_model(db_session, min_examples: int = 5) -> Optional[Dict]:
+    """
+    Train a categorizer from every categorized, non-deleted transaction
+
+    Args:
+        db_session: SQLAlchemy session
+        min_examples: Categories with fewer labeled rows are left out
+
+    Returns:
+        Model dict, or None when there is not enough labeled data
+    """
+    if not CATEGORIZER_AVAILABLE:
+        raise ValueError("scikit-learn/joblib not installed. Run 'pip install scikit-learn joblib'")
+
+    from sqlalchemy import func
+    from sklearn.naive_bayes import MultinomialNB
+    from models.transaction import Transaction, Category
+
+    labeled = db_session.query(Transaction.description, Category.type, Category.name)\
+        .join(Category, Transaction.category_id == Category.id)\
+        .filter(
+            Transaction.is_deleted == False,  # noqa: E712
+            Transaction.description.isnot(None),
+            Transaction.description != ''
+        )
+
+    class_counts: Dict[Tuple[str, str], int] = {}
+    counts = db_session.query(Category.type, Category.name, func.count(Transaction.id))\
+        .join(Transaction, Transaction.category_id == Category.id)\
+        .filter(
+            Transaction.is_deleted == False,  # noqa: E712
+            Transaction.description.isnot(None),
+            Transaction.description != ''
+        ).group_by(Category.type, Category.name).all()
+    for category_type, name, count in counts:
+        key = _class_key(category_type, name)
+        class_counts[key] = class_counts.get(key, 0) + count
+
+    classes = sorted(key for key, count in class_counts.items() if count >= min_examples)
+    if len(classes) < 2:
+        logger.warning("Not enough categorized transactions to train a categorizer")
+        return None
+
+    class_index = {key: i for i, key in enumerate(classes)}
+    vectorizer = _vectorizer()
+    model = MultinomialNB(alpha=0.1)
+    all_labels = np.arange(len(classes))
+    trained_rows = 0
+
+    descriptions: List[str] = []
+    labels: List[int] = []
+
+    def fit_chunk():
+        nonlocal trained_rows
+        model.partial_fit(vectorizer.transform(descriptions), labels, classes=all_labels)
+        trained_rows += len(labels)
+        descriptions.clear()
+        labels.clear()
+
+    for description, category_type, name in labeled.yield_per(TRAINING_CHUNK_SIZE):
+        label = class_index.get(_class_key(category_type, name))
+        if label is None:
+            continue
+        descriptions.append(description)
+        labels.append(label)
+        if len(labels) >= TRAINING_CHUNK_SIZE:
+            fit_chunk()
+    if labels:
+        fit_chunk()
+
+    logger.info(f"Trained categorizer on {trained_rows} transactions across {len(classes)} categories")
+
+    return {
+        'version': MODEL_VERSION,
+        'n_features': N_FEATURES,
+        'classes': classes,
+        # (n_features, n_classes) so a sparse row @ weights gathers contiguous rows
+        'weights': np.ascontiguousarray(model.feature_log_prob_.T, dtype=np.float32),
+        'bias': model.class_log_prior_.astype(np.float32),
+        'trained_rows': trained_rows
+    }
+
+
+def save_model(model: Dict, path: str):
+    """
+    Persist a model atomically (write to a temp file, then rename)
+    Workers that already mapped the old file keep reading it safely
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    os.close(fd)
+    try:
+        # Uncompressed so the arrays can be memory-mapped on load
+        joblib.dump(model, temp_path)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+# ==================== LOADING ====================
+
+def load_model(path: Optional[str] = None) -> Optional[Dict]:
+    """
+    Load (or reuse) the persisted model, memory-mapped read-only
+    Reloads automatically when the file is replaced by a retrain; a file
+    that fails to load or is incompatible is skipped until it changes, and
+    the last good model (if any) keeps serving
+
+    Returns:
+        Model dict, or None if no model is available
+    """
+    global _cached_model, _cached_mtime, _rejected_mtime
+
+    if not CATEGORIZER_AVAILABLE:
+        return None
+
+    path = path or Config.CATEGORIZER_MODEL_PATH
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+
+    if mtime == _cached_mtime or mtime == _rejected_mtime:
+        return _cached_model
+
+    with _model_lock:
+        if mtime != _cached_mtime and mtime != _rejected_mtime:
+            try:
+                model = joblib.load(path, mmap_mode='r')
+            except Exception as e:
+                logger.error(f"Failed to load categorizer model {path}: {str(e)}")
+                _rejected_mtime = mtime
+                return _cached_model
+            if model.get('version') != MODEL_VERSION or model.get('n_features') != N_FEATURES:
+                logger.warning(f"Ignoring incompatible categorizer model at {path}; retrain it")
+                _rejected_mtime = mtime
+                return _cached_model
+            _cached_model, _cached_mtime = model, mtime
+            logger.info(f"Categorizer model loaded ({len(model['classes'])} categories)")
+
+    return _cached_model
+
+
+# ==================== PREDICTION ====================
+
+def predict_categories(model: Dict, descriptions: Sequence[str], types: Sequence[str],
+                       candidates: Sequence[Dict[Tuple[str, str], int]],
+                       min_confidence: float = 0.0) -> List[Optional[int]]:
+    """
+    Predict category ids for a batch of descriptions
+
+    Args:
+        model: Model dict from load_model/train_model
+        descriptions: Transaction descriptions
+        types: Transaction types ('income'/'expense'), aligned with descriptions
+        candidates: Per row, mapping of class key -> the user's category id
+        min_confidence: Minimum posterior (over the user's categories) to accept
+
+    Returns:
+        Category id per row, or None when no confident prediction exists
+    """
+    if not descriptions:
+        return []
+
+    class_index = {key: i for i, key in enumerate(model['classes'])}
+    scores = _vectorizer().transform(descriptions) @ model['weights'] + model['bias']
+    scores = np.asarray(scores)
+
+    predictions: List[Optional[int]] = []
+    for row, (description, txn_type, options) in enumerate(zip(descriptions, types, candidates)):
+        allowed = [(class_index[key], category_id) for key, category_id in options.items()
+                   if key[0] == txn_type and key in class_index]
+        if not description or not allowed:
+            predictions.append(None)
+            continue
+
+        columns = np.fromiter((column for column, _ in allowed), dtype=np.int64, count=len(allowed))
+        row_scores = scores[row, columns]
+        best = int(np.argmax(row_scores))
+        # Posterior restricted to the user's categories (softmax of log-likelihoods)
+        confidence = 1.0 / np.exp(row_scores - row_scores[best]).sum()
+        predictions.append(allowed[best][1] if confidence >= min_confidence else None)
+
+    return predictions
+
+
+def _user_candidates(db_session, firebase_uids: Sequence[str]) -> Dict[str, Dict[Tuple[str, str], int]]:
+    """Category id per class key for each user (own categories shadow defaults)"""
+    from sqlalchemy import or_
+    from models.transaction import Category
+
+    rows = db_session.query(Category.id, Category.firebase_uid, Category.type, Category.name)\
+        .filter(or_(Category.firebase_uid.is_(None), Category.firebase_uid.in_(list(firebase_uids))))\
+        .order_by(Category.firebase_uid.isnot(None), Category.id)\
+        .all()
+
+    defaults: Dict[Tuple[str, str], int] = {}
+    own: Dict[str, Dict[Tuple[str, str], int]] = {}
+    for category_id, owner, category_type, name in rows:
+        target = defaults if owner is None else own.setdefault(owner, {})
+        target.setdefault(_class_key(category_type, name), category_id)
+
+    return {uid: {**defaults, **own.get(uid, {})} for uid in firebase_uids}
+
+
+def auto_categorize(db_session, transactions: Sequence, model: Optional[Dict] = None) -> int:
+    """
+    Fill in category_id for uncategorized transactions, in one batch
+
+    Args:
+        db_session: SQLAlchemy session (used to look up users' categories)
+        transactions: Transaction objects; only rows with category_id None
+            and a description are touched
+        model: Model dict (default: the persisted model)
+
+    Returns:
+        Number of transactions categorized
+    """
+    pending = [t for t in transactions if t.category_id is None and t.description]
+    if not pending:
+        return 0
+
+    model = model or load_model()
+    if model is None:
+        return 0
+
+    try:
+        candidates = _user_candidates(db_session, sorted({t.firebase_uid for t in pending}))
+        predictions = predict_categories(
+            model,
+            [t.description for t in pending],
+            [t.type for t in pending],
+            [candidates[t.firebase_uid] for t in pending],
+            min_confidence=Config.CATEGORIZER_MIN_CONFIDENCE
+        )
+    except Exception as e:
+        # Categorization is best-effort; never block a write on it
+        logger.warning(f"Auto-categorization failed: {str(e)}")
+        return 0
+
+    categorized = 0
+    for transaction, category_id in zip(pending, predictions):
+        if category_id is not None:
+            transaction.category_id = category_id
+            categorized += 1
+
+    return categorized
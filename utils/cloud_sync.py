@@ -1,14 +1,24 @@
 """
 Cloud Sync Service
 Synchronizes data between local SQLite and Firebase Firestore
+
+The *_async variants are for async views: they overlap the Firestore
+round trips for the different collections (see utils/async_io.py).
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from utils.metrics import sync_batch, observe_sync_documents
+
 logger = logging.getLogger(__name__)
 
+# Ids per IN (...) lookup when matching pulled documents to local rows
+# (stays under SQLite's bound-parameter limit)
+EXISTING_ID_CHUNK = 500
+
 
 class CloudSyncService:
     """
@@ -22,6 +32,13 @@ class CloudSyncService:
     def _initialize_firestore(self):
         """Initialize Firestore connection"""
         try:
+            from config import Config
+            if Config.FIRESTORE_BACKEND == 'stub':
+                from utils.io_stubs import InMemoryFirestore
+                self.firestore_db = InMemoryFirestore(Config.IO_STUB_LATENCY_MS)
+                logger.info("In-memory Firestore stub enabled (FIRESTORE_BACKEND=stub)")
+                return
+            
             from firebase_admin import firestore
             self.firestore_db = firestore.client()
             logger.info("✅ Firestore initialized successfully - Cloud sync enabled")
@@ -45,6 +62,15 @@ class CloudSyncService:
         """Check if cloud sync is available"""
         return self.firestore_db is not None
     
+    def reinitialize(self):
+        """
+        Recreate the Firestore client
+        gRPC channels are not fork-safe, so a worker forked from a preloaded
+        master must not reuse the master's client
+        """
+        self.firestore_db = None
+        self._initialize_firestore()
+    
     # ==================== SYNC METHODS ====================
     
     def sync_user_data(self, firebase_uid: str, db_session) -> Dict:
@@ -92,8 +118,77 @@ class CloudSyncService:
             logger.error(f"Cloud sync failed: {str(e)}")
             return {'success': False, 'error': str(e)}
     
+    async def sync_user_data_async(self, firebase_uid: str, db_session) -> Dict:
+        """
+        Sync all user data to cloud, writing the collections concurrently
+        For async views: the database is read on the request thread, the
+        Firestore writes run in worker threads (see utils/async_io.py)
+        
+        Args:
+            firebase_uid: User's Firebase UID
+            db_session: SQLAlchemy session
+        
+        Returns:
+            Sync status dict
+        """
+        from utils.async_io import on_request_thread, gather_io
+        
+        if not self.is_available():
+            return {'success': False, 'error': 'Cloud sync not available'}
+        
+        try:
+            transactions, budgets, settings = await on_request_thread(self._push_documents)(
+                firebase_uid, db_session
+            )
+            
+            counts = await gather_io(
+                asyncio.to_thread(self._write_collection, firebase_uid, 'transactions', transactions),
+                asyncio.to_thread(self._write_collection, firebase_uid, 'budgets', budgets),
+                asyncio.to_thread(self._write_settings, firebase_uid, settings)
+            )
+            stats = dict(zip(('transactions', 'budgets', 'settings'), counts))
+            
+            # Only record the sync once every collection is written
+            await asyncio.to_thread(self._update_sync_timestamp, firebase_uid)
+            
+            logger.info(f"Cloud sync completed for user {firebase_uid}: {stats}")
+            
+            return {
+                'success': True,
+                'stats': stats,
+                'timestamp': datetime.utcnow().isoformat()
+            }
+        
+        except Exception as e:
+            logger.error(f"Cloud sync failed: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def _push_documents(self, firebase_uid: str, db_session) -> Tuple[Dict, Dict, Optional[Dict]]:
+        """Firestore documents for a push: (transactions, budgets, settings)"""
+        return (
+            self._transaction_docs(firebase_uid, db_session),
+            self._budget_docs(firebase_uid, db_session),
+            self._settings_doc(firebase_uid, db_session)
+        )
+    
     def _sync_transactions(self, firebase_uid: str, db_session) -> int:
         """Sync transactions to Firestore"""
+        return self._write_collection(
+            firebase_uid, 'transactions', self._transaction_docs(firebase_uid, db_session)
+        )
+    
+    def _sync_budgets(self, firebase_uid: str, db_session) -> int:
+        """Sync budgets to Firestore"""
+        return self._write_collection(
+            firebase_uid, 'budgets', self._budget_docs(firebase_uid, db_session)
+        )
+    
+    def _sync_settings(self, firebase_uid: str, db_session) -> int:
+        """Sync user settings to Firestore"""
+        return self._write_settings(firebase_uid, self._settings_doc(firebase_uid, db_session))
+    
+    def _transaction_docs(self, firebase_uid: str, db_session) -> Dict[str, Dict]:
+        """Transaction documents keyed by document ID"""
         from models.transaction import Transaction
         
         transactions = db_session.query(Transaction)\
@@ -101,16 +196,8 @@ class CloudSyncService:
             .filter(Transaction.is_deleted == False)\
             .all()
         
-        batch = self.firestore_db.batch()
-        count = 0
-        
-        for transaction in transactions:
-            doc_ref = self.firestore_db.collection('users')\
-                .document(firebase_uid)\
-                .collection('transactions')\
-                .document(str(transaction.id))
-            
-            batch.set(doc_ref, {
+        return {
+            str(transaction.id): {
                 'amount': float(transaction.amount),
                 'type': transaction.type,
                 'category_id': transaction.category_id,
@@ -118,72 +205,84 @@ class CloudSyncService:
                 'date': transaction.date.isoformat() if transaction.date else None,
                 'created_at': transaction.created_at.isoformat() if transaction.created_at else None,
                 'updated_at': transaction.updated_at.isoformat() if transaction.updated_at else None
-            })
-            count += 1
-            
-            # Firestore has a limit of 500 operations per batch
-            if count % 500 == 0:
-                batch.commit()
-                batch = self.firestore_db.batch()
-        
-        if count % 500 != 0:
-            batch.commit()
-        
-        return count
+            }
+            for transaction in transactions
+        }
     
-    def _sync_budgets(self, firebase_uid: str, db_session) -> int:
-        """Sync budgets to Firestore"""
+    def _budget_docs(self, firebase_uid: str, db_session) -> Dict[str, Dict]:
+        """Budget documents keyed by document ID"""
         from models.budget import Budget
         
         budgets = db_session.query(Budget)\
             .filter(Budget.firebase_uid == firebase_uid)\
             .all()
         
-        batch = self.firestore_db.batch()
-        count = 0
-        
-        for budget in budgets:
-            doc_ref = self.firestore_db.collection('users')\
-                .document(firebase_uid)\
-                .collection('budgets')\
-                .document(str(budget.id))
-            
-            batch.set(doc_ref, {
+        return {
+            str(budget.id): {
                 'category_id': budget.category_id,
                 'limit_amount': float(budget.limit_amount),
                 'period': budget.period,
                 'start_date': budget.start_date.isoformat() if budget.start_date else None,
                 'end_date': budget.end_date.isoformat() if budget.end_date else None,
                 'is_active': budget.is_active
-            })
-            count += 1
-        
-        batch.commit()
-        return count
+            }
+            for budget in budgets
+        }
     
-    def _sync_settings(self, firebase_uid: str, db_session) -> int:
-        """Sync user settings to Firestore"""
+    def _settings_doc(self, firebase_uid: str, db_session) -> Optional[Dict]:
+        """User preferences document, or None without settings"""
         from models.user import UserSettings
         
         settings = db_session.query(UserSettings)\
             .filter(UserSettings.firebase_uid == firebase_uid)\
             .first()
         
-        if settings:
-            doc_ref = self.firestore_db.collection('users')\
-                .document(firebase_uid)\
-                .collection('settings')\
-                .document('preferences')
+        if not settings:
+            return None
+        
+        return {
+            'theme': settings.theme,
+            'currency': settings.currency,
+            'date_format': settings.date_format,
+            'language': settings.language
+        }
+    
+    def _write_collection(self, firebase_uid: str, collection: str, docs: Dict[str, Dict]) -> int:
+        """Write documents to a user sub-collection in batches"""
+        collection_ref = self.firestore_db.collection('users')\
+            .document(firebase_uid)\
+            .collection(collection)
+        
+        batch = self.firestore_db.batch()
+        count = 0
+        
+        for doc_id, data in docs.items():
+            batch.set(collection_ref.document(doc_id), data)
+            count += 1
             
-            doc_ref.set({
-                'theme': settings.theme,
-                'currency': settings.currency,
-                'date_format': settings.date_format,
-                'language': settings.language
-            })
-            return 1
+            # Firestore has a limit of 500 operations per batch
+            if count % 500 == 0:
+                with sync_batch('push', collection, 500):
+                    batch.commit()
+                batch = self.firestore_db.batch()
         
-        return 0
+        if count % 500 != 0:
+            with sync_batch('push', collection, count % 500):
+                batch.commit()
+        
+        return count
+    
+    def _write_settings(self, firebase_uid: str, doc: Optional[Dict]) -> int:
+        """Write the user preferences document"""
+        if doc is None:
+            return 0
+        
+        self.firestore_db.collection('users')\
+            .document(firebase_uid)\
+            .collection('settings')\
+            .document('preferences')\
+            .set(doc)
+        return 1
     
     def _update_sync_timestamp(self, firebase_uid: str):
         """Update last sync timestamp"""
@@ -212,22 +311,54 @@ class CloudSyncService:
             return {'success': False, 'error': 'Cloud sync not available'}
         
         try:
-            stats = {
-                'transactions': 0,
-                'budgets': 0,
-                'settings': 0
-            }
-            
-            # Pull transactions
-            stats['transactions'] = self._pull_transactions(firebase_uid, db_session)
+            stats = self._apply_pull(
+                firebase_uid,
+                db_session,
+                self._read_collection(firebase_uid, 'transactions'),
+                self._read_collection(firebase_uid, 'budgets'),
+                self._read_settings(firebase_uid)
+            )
             
-            # Pull budgets
-            stats['budgets'] = self._pull_budgets(firebase_uid, db_session)
+            logger.info(f"Cloud pull completed for user {firebase_uid}: {stats}")
             
-            # Pull settings
-            stats['settings'] = self._pull_settings(firebase_uid, db_session)
+            return {
+                'success': True,
+                'stats': stats,
+                'timestamp': datetime.utcnow().isoformat()
+            }
+        
+        except Exception as e:
+            logger.error(f"Cloud pull failed: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    async def pull_from_cloud_async(self, firebase_uid: str, db_session) -> Dict:
+        """
+        Pull data from cloud, reading the collections concurrently
+        For async views: Firestore reads run in worker threads, the database
+        writes on the request thread (see utils/async_io.py)
+        
+        Args:
+            firebase_uid: User's Firebase UID
+            db_session: SQLAlchemy session
+        
+        Returns:
+            Pull status dict
+        """
+        from utils.async_io import on_request_thread, gather_io
+        
+        if not self.is_available():
+            return {'success': False, 'error': 'Cloud sync not available'}
+        
+        try:
+            transactions, budgets, settings = await gather_io(
+                asyncio.to_thread(self._read_collection, firebase_uid, 'transactions'),
+                asyncio.to_thread(self._read_collection, firebase_uid, 'budgets'),
+                asyncio.to_thread(self._read_settings, firebase_uid)
+            )
             
-            db_session.commit()
+            stats = await on_request_thread(self._apply_pull)(
+                firebase_uid, db_session, transactions, budgets, settings
+            )
             
             logger.info(f"Cloud pull completed for user {firebase_uid}: {stats}")
             
@@ -239,31 +370,58 @@ class CloudSyncService:
         
         except Exception as e:
             logger.error(f"Cloud pull failed: {str(e)}")
-            db_session.rollback()
             return {'success': False, 'error': str(e)}
     
-    def _pull_transactions(self, firebase_uid: str, db_session) -> int:
-        """Pull transactions from Firestore"""
+    def _apply_pull(self, firebase_uid: str, db_session, transactions: List[Tuple[str, Dict]],
+                    budgets: List[Tuple[str, Dict]], settings: Optional[Dict]) -> Dict:
+        """Merge pulled documents into the local database and commit"""
+        try:
+            stats = {
+                'transactions': self._apply_transactions(firebase_uid, db_session, transactions),
+                'budgets': self._apply_budgets(firebase_uid, db_session, budgets),
+                'settings': self._apply_settings(firebase_uid, db_session, settings)
+            }
+            db_session.commit()
+            return stats
+        except Exception:
+            db_session.rollback()
+            raise
+    
+    def _read_collection(self, firebase_uid: str, collection: str) -> List[Tuple[str, Dict]]:
+        """All documents of a user sub-collection as (id, data) pairs"""
+        with sync_batch('pull', collection):
+            docs = self.firestore_db.collection('users')\
+                .document(firebase_uid)\
+                .collection(collection)\
+                .stream()
+            docs = [(doc.id, doc.to_dict()) for doc in docs]
+        
+        observe_sync_documents('pull', collection, len(docs))
+        return docs
+    
+    def _read_settings(self, firebase_uid: str) -> Optional[Dict]:
+        """User preferences document, or None if it does not exist"""
+        doc = self.firestore_db.collection('users')\
+            .document(firebase_uid)\
+            .collection('settings')\
+            .document('preferences')\
+            .get()
+        
+        return doc.to_dict() if doc.exists else None
+    
+    def _apply_transactions(self, firebase_uid: str, db_session, docs: List[Tuple[str, Dict]]) -> int:
+        """Add pulled transactions that do not exist locally"""
         from models.transaction import Transaction
         from datetime import datetime as dt
         
-        docs = self.firestore_db.collection('users')\
-            .document(firebase_uid)\
-            .collection('transactions')\
-            .stream()
+        existing = self._existing_ids(db_session, Transaction, [int(doc_id) for doc_id, _ in docs])
         
-        count = 0
-        for doc in docs:
-            data = doc.to_dict()
-            transaction_id = int(doc.id)
-            
-            # Check if exists
-            existing = db_session.query(Transaction)\
-                .filter(Transaction.id == transaction_id)\
-                .first()
+        new_transactions = []
+        for doc_id, data in docs:
+            transaction_id = int(doc_id)
             
-            if not existing:
-                transaction = Transaction(
+            if transaction_id not in existing:
+                new_transactions.append(Transaction(
                     id=transaction_id,
                     firebase_uid=firebase_uid,
                     amount=data['amount'],
@@ -272,32 +430,27 @@ class CloudSyncService:
                     description=data.get('description'),
                     date=dt.fromisoformat(data['date']) if data.get('date') else None,
                     is_deleted=False
-                )
-                db_session.add(transaction)
-                count += 1
+                ))
         
-        return count
+        # Categorize the whole import in one batch before it is flushed
+        from utils.categorizer import auto_categorize
+        auto_categorize(db_session, new_transactions)
+        
+        db_session.add_all(new_transactions)
+        return len(new_transactions)
     
-    def _pull_budgets(self, firebase_uid: str, db_session) -> int:
-        """Pull budgets from Firestore"""
+    def _apply_budgets(self, firebase_uid: str, db_session, docs: List[Tuple[str, Dict]]) -> int:
+        """Add pulled budgets that do not exist locally"""
         from models.budget import Budget
         from datetime import datetime as dt
         
-        docs = self.firestore_db.collection('users')\
-            .document(firebase_uid)\
-            .collection('budgets')\
-            .stream()
+        existing = self._existing_ids(db_session, Budget, [int(doc_id) for doc_id, _ in docs])
         
         count = 0
-        for doc in docs:
-            data = doc.to_dict()
-            budget_id = int(doc.id)
+        for doc_id, data in docs:
+            budget_id = int(doc_id)
             
-            existing = db_session.query(Budget)\
-                .filter(Budget.id == budget_id)\
-                .first()
-            
-            if not existing:
+            if budget_id not in existing:
                 budget = Budget(
                     id=budget_id,
                     firebase_uid=firebase_uid,
@@ -313,30 +466,31 @@ class CloudSyncService:
         
         return count
     
-    def _pull_settings(self, firebase_uid: str, db_session) -> int:
-        """Pull user settings from Firestore"""
+    def _existing_ids(self, db_session, model, ids: List[int]) -> set:
+        """Ids (of any user) that already exist locally, one query per EXISTING_ID_CHUNK ids"""
+        existing = set()
+        for start in range(0, len(ids), EXISTING_ID_CHUNK):
+            chunk = ids[start:start + EXISTING_ID_CHUNK]
+            existing.update(row[0] for row in db_session.query(model.id).filter(model.id.in_(chunk)))
+        return existing
+    
+    def _apply_settings(self, firebase_uid: str, db_session, data: Optional[Dict]) -> int:
+        """Overwrite local preferences with the pulled document"""
         from models.user import UserSettings
         
-        doc_ref = self.firestore_db.collection('users')\
-            .document(firebase_uid)\
-            .collection('settings')\
-            .document('preferences')
+        if data is None:
+            return 0
         
-        doc = doc_ref.get()
+        settings = db_session.query(UserSettings)\
+            .filter(UserSettings.firebase_uid == firebase_uid)\
+            .first()
         
-        if doc.exists:
-            data = doc.to_dict()
-            
-            settings = db_session.query(UserSettings)\
-                .filter(UserSettings.firebase_uid == firebase_uid)\
-                .first()
-            
-            if settings:
-                settings.theme = data.get('theme', 'auto')
-                settings.currency = data.get('currency', 'USD')
-                settings.date_format = data.get('date_format', 'MM/DD/YYYY')
-                settings.language = data.get('language', 'en')
-                return 1
+        if settings:
+            settings.theme = data.get('theme', 'auto')
+            settings.currency = data.get('currency', 'USD')
+            settings.date_format = data.get('date_format', 'MM/DD/YYYY')
+            settings.language = data.get('language', 'en')
+            return 1
         
         return 0
     
@@ -0,0 +1,171 @@
+"""
+Database Engine Setup
+Engine construction and per-connection tuning
+
+SQLite profile: every new DBAPI connection gets the pragmas below through a
+'connect' event hook, so gunicorn workers writing to the same file wait for
+each other (busy_timeout) instead of failing with 'database is locked', and
+readers never block the writer (WAL):
+
+- journal_mode=WAL       readers and one writer run concurrently
+- synchronous=NORMAL     fsync at checkpoints only; safe with WAL
+- busy_timeout           wait this long for a lock before giving up
+- mmap_size              read pages through the OS page cache
+- cache_size             per-connection page cache (KiB)
+- temp_store=MEMORY      sort/group temp tables in memory
+
+optimize_sqlite() runs 'PRAGMA optimize' so the query planner statistics
+stay current; init_database() registers it to run at process shutdown.
+
+Server databases (PostgreSQL, MySQL): create_app_engine() applies the DB_POOL_*
+settings and a per-connection statement timeout. An optional read replica
+(DATABASE_REPLICA_URI) gets its own engine; see utils/db_routing.py.
+"""
+
+import logging
+from sqlalchemy import create_engine, event
+
+logger = logging.getLogger(__name__)
+
+
+def is_sqlite(engine) -> bool:
+    return engine.dialect.name == 'sqlite'
+
+
+def _is_memory_database(engine) -> bool:
+    database = engine.url.database
+    return not database or database == ':memory:' or 'mode=memory' in str(engine.url)
+
+
+def engine_options(uri: str, config) -> dict:
+    """
+    create_engine() keyword arguments for a database URI
+
+    Args:
+        uri: Database URI
+        config: Flask config with the DB_POOL_* / DB_STATEMENT_TIMEOUT_MS keys
+
+    Returns:
+        Keyword arguments for sqlalchemy.create_engine
+    """
+    options = {'pool_pre_ping': True}
+
+    if uri.startswith('sqlite') and (':memory:' in uri or uri.rstrip('/') in ('sqlite:', 'sqlite:/')):
+        return options  # Single-connection pool; sizing does not apply
+
+    options.update({
+        'pool_size': int(config.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(config.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(config.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(config.get('DB_POOL_RECYCLE', 1800))
+    })
+
+    statement_timeout = int(config.get('DB_STATEMENT_TIMEOUT_MS', 0))
+    if statement_timeout > 0:
+        if uri.startswith('postgresql'):
+            # libpq startup option: applies to every statement on the connection
+            options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+        elif uri.startswith('mysql'):
+            options['connect_args'] = {'init_command': f'SET SESSION max_execution_time={statement_timeout}'}
+        else:
+            logger.warning(f"DB_STATEMENT_TIMEOUT_MS is not supported for {uri.split(':')[0]}; ignoring")
+
+    return options
+
+
+def create_app_engine(uri: str, config):
+    """
+    Create an engine with pool settings and, for SQLite, the tuning profile
+
+    Args:
+        uri: Database URI
+        config: Flask config
+
+    Returns:
+        SQLAlchemy engine
+    """
+    engine = create_engine(uri, **engine_options(uri, config))
+    configure_sqlite(engine, config)
+    enable_sql_echo(config)
+    return engine
+
+
+def enable_sql_echo(config):
+    """
+    Log SQL statements when SQLALCHEMY_ECHO is on
+
+    Sets the 'sqlalchemy.engine' logger level instead of passing echo=True,
+    which would attach a second handler writing synchronously to stdout. A
+    level set through LOG_LEVELS takes precedence.
+    """
+    sql_logger = logging.getLogger('sqlalchemy.engine')
+    if config.get('SQLALCHEMY_ECHO', False) and sql_logger.level == logging.NOTSET:
+        sql_logger.setLevel(logging.INFO)
+
+
+def sqlite_pragmas(config) -> dict:
+    """
+    Pragmas applied to each SQLite connection
+
+    Args:
+        config: Flask config (or any mapping) with the SQLITE_* keys
+
+    Returns:
+        Ordered mapping of pragma name -> value
+    """
+    return {
+        'journal_mode': config.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': config.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'mmap_size': int(config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        # Negative cache_size is in KiB rather than pages
+        'cache_size': -abs(int(config.get('SQLITE_CACHE_SIZE_KB', 64 * 1024))),
+        'temp_store': 'MEMORY'
+    }
+
+
+def configure_sqlite(engine, config):
+    """
+    Apply the SQLite performance profile to every connection of an engine
+    No-op for other databases or when SQLITE_TUNING is disabled
+
+    Args:
+        engine: SQLAlchemy engine
+        config: Flask config
+    """
+    if not is_sqlite(engine) or not config.get('SQLITE_TUNING', True):
+        return
+
+    pragmas = sqlite_pragmas(config)
+    if _is_memory_database(engine):
+        pragmas.pop('journal_mode')  # WAL needs a file
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+
+    logger.info(
+        f"SQLite tuning enabled: {', '.join(f'{name}={value}' for name, value in pragmas.items())}"
+    )
+
+
+def optimize_sqlite(engine):
+    """
+    Refresh SQLite query planner statistics ('PRAGMA optimize')
+    Cheap when nothing changed; analysis_limit bounds the work on big tables
+    """
+    if not is_sqlite(engine) or _is_memory_database(engine):
+        return
+
+    try:
+        with engine.connect() as connection:
+            connection.exec_driver_sql('PRAGMA analysis_limit = 400')
+            connection.exec_driver_sql('PRAGMA optimize')
+        logger.info("SQLite PRAGMA optimize completed")
+    except Exception as e:
+        logger.warning(f"SQLite PRAGMA optimize failed: {str(e)}")
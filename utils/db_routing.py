@@ -0,0 +1,35 @@
+"""
+Database Session Routing
+Chooses the primary or read-replica session for a request
+
+Handlers call get_session(app) instead of using app.db_session directly:
+GET/HEAD/OPTIONS requests get the read-only session (autoflush off, no
+expire-on-commit; see utils/db_sessions.py) on the replica engine
+(DATABASE_REPLICA_URI), or on the primary when no replica is configured;
+everything else uses the primary read-write session.
+Replicas lag the primary slightly, so a handler that must read its own
+writes (e.g. a GET right after a redirect from a POST) should pass
+read_only=False.
+"""
+
+from flask import current_app, has_request_context, request
+
+READ_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+def get_session(app=None, read_only=None):
+    """
+    Session for the current request
+
+    Args:
+        app: Flask application (default: current_app)
+        read_only: Force the read-only session (True) or the read-write
+            session (False); by default inferred from the request method
+
+    Returns:
+        scoped_session for the chosen engine
+    """
+    app = app or current_app._get_current_object()
+    if read_only is None:
+        read_only = has_request_context() and request.method in READ_METHODS
+    return app.db_read_session if read_only else app.db_session
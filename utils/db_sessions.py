@@ -0,0 +1,170 @@
+"""
+Database Session Lifecycle
+Per-request session cleanup, read-only sessions and pool-leak detection
+
+app.db_session and app.db_read_session are thread-local scoped sessions.
+Without cleanup, each gunicorn thread keeps its session (identity map and,
+after an error, an open transaction holding a pooled connection) alive
+between requests. register_session_teardown() removes both sessions when the
+app context ends, which rolls back anything uncommitted, returns the
+connection to the pool and drops the identity map.
+
+GET handlers get a read-only session (see utils/db_routing.py): autoflush is
+off, objects are not expired on commit (no reload queries), and flushing
+pending changes raises instead of silently writing.
+
+In debug mode (or with DB_POOL_LEAK_DETECTION) a PoolLeakDetector records
+where each connection was checked out and logs a warning, with that stack,
+for connections still held by the request thread after teardown or held
+longer than DB_POOL_LEAK_THRESHOLD_S.
+"""
+
+import time
+import logging
+import threading
+import traceback
+from typing import Dict, List
+
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class ReadOnlySessionError(RuntimeError):
+    """Raised when a read-only session is asked to flush changes"""
+
+
+def read_only_sessionmaker(engine) -> sessionmaker:
+    """
+    Session factory for read-only request handlers
+
+    Args:
+        engine: Engine to read from (primary or replica)
+
+    Returns:
+        sessionmaker with autoflush off and expire_on_commit disabled
+    """
+    factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    @event.listens_for(factory, 'before_flush')
+    def _refuse_writes(session, flush_context, instances):
+        if session.new or session.dirty or session.deleted:
+            raise ReadOnlySessionError(
+                'Read-only session cannot flush changes; use get_session(read_only=False)'
+            )
+
+    return factory
+
+
+# ==================== POOL LEAK DETECTION ====================
+
+def _caller_stack(limit: int = 12) -> List[str]:
+    """Formatted stack of the code that checked a connection out, without SQLAlchemy frames"""
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if '/sqlalchemy/' not in frame.filename.replace('\\', '/')
+    ]
+    return traceback.format_list(frames[-limit:])
+
+
+class PoolLeakDetector:
+    """
+    Tracks pool checkouts and reports connections that are never returned
+    Stack capture costs a few microseconds per checkout: debug use only
+    """
+
+    def __init__(self, threshold_seconds: float = 10.0):
+        self.threshold_seconds = threshold_seconds
+        self._checked_out: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine):
+        """Listen to checkout/checkin on an engine's pool"""
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self._checked_out[id(connection_record)] = {
+                'thread': threading.get_ident(),
+                'since': time.monotonic(),
+                'path': request.path if has_request_context() else None,
+                'stack': _caller_stack(),
+                'reported': False
+            }
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._checked_out.pop(id(connection_record), None)
+
+    def checked_out(self) -> List[Dict]:
+        """Connections currently checked out, oldest first"""
+        with self._lock:
+            entries = list(self._checked_out.values())
+        return sorted(entries, key=lambda entry: entry['since'])
+
+    def check(self, pool_status: str = '') -> int:
+        """
+        Warn about leaked connections; call after the request's sessions are removed
+
+        Args:
+            pool_status: engine.pool.status() for the log message
+
+        Returns:
+            Number of connections reported
+        """
+        now = time.monotonic()
+        thread = threading.get_ident()
+        reported = 0
+
+        with self._lock:
+            for entry in self._checked_out.values():
+                held = now - entry['since']
+                still_in_request = entry['thread'] == thread
+                if entry['reported'] or not (still_in_request or held > self.threshold_seconds):
+                    continue
+                entry['reported'] = True
+                reported += 1
+                reason = 'not returned at request teardown' if still_in_request else f'held for {held:.1f}s'
+                logger.warning(
+                    f"Possible connection leak ({reason}) from {entry['path'] or 'outside a request'}; "
+                    f"{pool_status}\nChecked out at:\n{''.join(entry['stack'])}"
+                )
+        return reported
+
+
+# ==================== TEARDOWN ====================
+
+def register_session_teardown(app):
+    """
+    Remove the scoped sessions at the end of every app context
+    and, when enabled, check the pools for leaked connections
+
+    Args:
+        app: Flask application with db_session / db_read_session
+    """
+    detection = app.config.get('DB_POOL_LEAK_DETECTION')
+    enabled = app.debug if detection in (None, '') else str(detection).lower() == 'true'
+
+    engines = [app.db_engine]
+    if app.db_read_engine is not app.db_engine:
+        engines.append(app.db_read_engine)
+
+    detector = None
+    if enabled:
+        detector = PoolLeakDetector(float(app.config.get('DB_POOL_LEAK_THRESHOLD_S', 10)))
+        for engine in engines:
+            detector.attach(engine)
+        logger.info("Connection pool leak detection enabled")
+    app.pool_leak_detector = detector
+
+    @app.teardown_appcontext
+    def remove_sessions(exception=None):
+        app.db_session.remove()
+        if app.db_read_session is not app.db_session:
+            app.db_read_session.remove()
+
+        if detector is not None:
+            detector.check('; '.join(engine.pool.status() for engine in engines))
@@ -6,6 +6,8 @@ Utilities for Firebase Auth integration
 import logging
 from typing import Optional, Dict
 
+from .request_timing import timed_phase
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,7 +24,8 @@ def verify_token(id_token: str) -> Optional[Dict]:
     try:
         from firebase_admin import auth
         
-        decoded_token = auth.verify_id_token(id_token)
+        with timed_phase('auth'):
+            decoded_token = auth.verify_id_token(id_token)
         return decoded_token
     
     except Exception as e:
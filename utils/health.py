@@ -0,0 +1,155 @@
+"""
+Health Checks
+Liveness (/healthz) and readiness (/readyz) endpoints for load balancers
+
+- /healthz: the process is up and serving requests; touches nothing else
+- /readyz: the database answers (SELECT 1 on the primary and, when
+  configured, the replica), plus Firebase Admin, Firestore
+  (CloudSyncService.is_available(); the first probe imports the service if
+  the lazy sync feature has not yet) and the feature registry's state
+
+Database results are cached for HEALTH_CHECK_CACHE_S and refreshed by one
+request at a time (the others get the cached result meanwhile), so probing
+every second costs at most one pooled query per interval. Both endpoints
+return JSON only, without templates or authentication. /readyz answers 503
+when the database is unreachable or the feature loader crashed, and 200
+with status 'degraded' when optional dependencies are down or some
+features failed to load. Failure details (error messages) are only
+included for admin tokens.
+"""
+
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from flask import g, jsonify, request
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+class CachedCheck:
+    """A check whose result is reused for ttl seconds"""
+
+    def __init__(self, check: Callable[[], Dict], ttl_s: float):
+        self.check = check
+        self.ttl_s = ttl_s
+        self._result: Optional[Dict] = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Dict:
+        if self._result is not None and time.monotonic() < self._expires:
+            return dict(self._result, cached=True)
+        # One refresh at a time; concurrent probes get the previous result
+        if not self._lock.acquire(blocking=self._result is None):
+            return dict(self._result, cached=True)
+        try:
+            self._result = self.check()
+            self._expires = time.monotonic() + self.ttl_s
+            return dict(self._result, cached=False)
+        finally:
+            self._lock.release()
+
+
+def database_check(engine) -> Callable[[], Dict]:
+    def check() -> Dict:
+        started = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+            ok, error = True, None
+        except Exception as e:
+            logger.error(f"Health check: database unreachable: {str(e)}")
+            ok, error = False, str(e)
+        return {
+            'ok': ok,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+            'checked_at': datetime.now(timezone.utc).isoformat(),
+            'error': error
+        }
+    return check
+
+
+def _firebase_available() -> bool:
+    try:
+        import firebase_admin
+        firebase_admin.get_app()
+        return True
+    except (ImportError, ValueError):
+        return False
+
+
+def _firestore_available() -> bool:
+    from utils.cloud_sync import cloud_sync
+    return cloud_sync.is_available()
+
+
+def _feature_state(registry) -> Dict:
+    if registry is None:
+        return {'ok': False, 'error': 'Feature loader crashed'}
+    counts = registry.get_feature_count()
+    return {
+        'ok': not registry.failed_features,
+        'loaded': counts['loaded'],
+        'lazy_pending': counts['lazy_pending'],
+        'failed': sorted(registry.failed_features),
+        'errors': dict(registry.failed_features)
+    }
+
+
+def _is_admin() -> bool:
+    if g.get('is_admin'):
+        return True
+    if not request.headers.get('Authorization'):
+        return False
+    # Cached on g, e.g. when the profiler header check already verified the token
+    from utils.auth_decorators import authenticate_admin
+    decoded_token, error = authenticate_admin()
+    return decoded_token is not None
+
+
+def register_health_checks(app):
+    """
+    Add /healthz and /readyz to the app
+
+    Args:
+        app: Flask application with db_engine / db_read_engine
+    """
+    ttl_s = float(app.config.get('HEALTH_CHECK_CACHE_S', 2))
+    database_checks = {'database': CachedCheck(database_check(app.db_engine), ttl_s)}
+    if app.db_read_engine is not app.db_engine:
+        database_checks['database_replica'] = CachedCheck(database_check(app.db_read_engine), ttl_s)
+
+    @app.route('/healthz')
+    def healthz():
+        """Liveness probe"""
+        return jsonify({'status': 'ok'}), 200
+
+    @app.route('/readyz')
+    def readyz():
+        """Readiness probe"""
+        checks = {name: check.get() for name, check in database_checks.items()}
+        checks['firebase'] = {'ok': _firebase_available()}
+        checks['firestore'] = {'ok': _firestore_available()}
+        registry = getattr(app, 'feature_registry', None)
+        checks['features'] = _feature_state(registry)
+
+        if not _is_admin():
+            for check in checks.values():
+                check.pop('error', None)
+                check.pop('errors', None)
+
+        ready = registry is not None and all(checks[name]['ok'] for name in database_checks)
+        if not ready:
+            status = 'not_ready'
+        elif all(check['ok'] for check in checks.values()):
+            status = 'ready'
+        else:
+            status = 'degraded'
+
+        return jsonify({'status': status, 'checks': checks}), 200 if ready else 503
+
+    logger.info(f"Health checks on /healthz and /readyz (database cached {ttl_s:g}s)")
@@ -0,0 +1,119 @@
+"""
+Transaction Histories
+Expense transactions loaded as NumPy column arrays
+
+Shared by the vectorized analytics passes (unusual spend scoring in
+features/analytics/anomalies.py, recurring-charge detection in
+utils/recurring.py), which group and sort rows with array operations
+instead of per-row Python.
+"""
+
+import re
+from datetime import date
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+_NORMALIZE_RE = re.compile(r'[^a-z]+')
+
+
+class TransactionArrays(NamedTuple):
+    """Column arrays for a set of expense transactions"""
+    ids: np.ndarray           # int64 transaction ids
+    users: np.ndarray         # int64 user codes (index into user_uids)
+    days: np.ndarray          # int64 days since epoch
+    amounts: np.ndarray       # float64 amounts
+    categories: np.ndarray    # int64 category ids, -1 when uncategorized
+    descriptions: np.ndarray  # object array of raw descriptions
+    user_uids: List[str]      # Firebase UID for each user code
+
+
+def normalize_description(description: Optional[str]) -> str:
+    """
+    Collapse a transaction description to a merchant-like signature
+    Lowercases and drops digits/punctuation so 'NETFLIX.COM 0423' == 'Netflix.com 0511'
+    """
+    if not description:
+        return ''
+    return _NORMALIZE_RE.sub(' ', description.lower()).strip()
+
+
+def description_codes(descriptions: np.ndarray) -> np.ndarray:
+    """
+    Integer codes for normalized descriptions, -1 for blank ones
+    Normalizes each distinct raw string once rather than once per row
+    """
+    import pandas as pd  # ~0.2s import; deferred so worker boot stays fast
+
+    raw_codes, uniques = pd.factorize(descriptions, use_na_sentinel=False)
+    normalized = np.array([normalize_description(value) for value in uniques], dtype=object)
+    normalized_codes, _ = pd.factorize(normalized)
+    normalized_codes[normalized == ''] = -1
+    return normalized_codes[raw_codes].astype(np.int64)
+
+
+def empty_arrays() -> TransactionArrays:
+    """TransactionArrays with no rows"""
+    empty = np.empty(0, dtype=np.int64)
+    return TransactionArrays(empty, empty, empty, np.empty(0), empty, np.empty(0, dtype=object), [])
+
+
+def load_histories(db_session, firebase_uids: Optional[Sequence[str]] = None,
+                   since: Optional[date] = None) -> TransactionArrays:
+    """
+    Load expense transactions into column arrays
+
+    Args:
+        db_session: SQLAlchemy session
+        firebase_uids: Users to load (default: every user)
+        since: Only load transactions on or after this date
+
+    Returns:
+        TransactionArrays for the selected users
+    """
+    import pandas as pd
+    from models.transaction import Transaction
+
+    query = db_session.query(
+        Transaction.id,
+        Transaction.firebase_uid,
+        Transaction.date,
+        Transaction.amount,
+        Transaction.category_id,
+        Transaction.description
+    ).filter(
+        Transaction.type == 'expense',
+        Transaction.is_deleted == False  # noqa: E712
+    )
+    if firebase_uids is not None:
+        query = query.filter(Transaction.firebase_uid.in_(list(firebase_uids)))
+    if since is not None:
+        query = query.filter(Transaction.date >= since)
+
+    rows = query.all()
+    if not rows:
+        return empty_arrays()
+
+    ids, uids, dates, amounts, categories, descriptions = zip(*rows)
+    user_codes, user_uids = pd.factorize(np.array(uids, dtype=object))
+
+    return TransactionArrays(
+        ids=np.asarray(ids, dtype=np.int64),
+        users=user_codes.astype(np.int64),
+        days=np.array(dates, dtype='datetime64[D]').astype(np.int64),
+        amounts=np.asarray(amounts, dtype=np.float64),
+        categories=np.array([-1 if c is None else c for c in categories], dtype=np.int64),
+        descriptions=np.array(descriptions, dtype=object),
+        user_uids=list(user_uids)
+    )
+
+
+def group_positions(keys: np.ndarray) -> np.ndarray:
+    """Position of each row within its run of equal (sorted) keys"""
+    n = len(keys)
+    is_start = np.empty(n, dtype=bool)
+    is_start[:1] = True
+    is_start[1:] = keys[1:] != keys[:-1]
+    starts = np.flatnonzero(is_start)
+    group_index = np.cumsum(is_start) - 1
+    return np.arange(n) - starts[group_index]
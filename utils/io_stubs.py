@@ -0,0 +1,142 @@
+"""
+Local I/O Stubs
+In-memory stand-ins for Firestore and Gemini with simulated network latency
+
+Selected with FIRESTORE_BACKEND=stub and GEMINI_BACKEND=stub so cloud sync
+and AI predictions can be exercised (and load-tested) without credentials
+or network access. Every remote call sleeps for IO_STUB_LATENCY_MS; sleeping
+releases the GIL the same way waiting on a socket does, so concurrency
+behaves like it would against the real services.
+
+Only the subset of the client APIs used by utils/cloud_sync.py and
+utils/ml_helpers.py is implemented.
+"""
+
+import copy
+import time
+import threading
+from types import SimpleNamespace
+from typing import Dict, Iterator, Optional, Tuple
+
+
+class _Latency:
+    def __init__(self, latency_ms: float):
+        self.seconds = max(0.0, latency_ms) / 1000
+
+    def wait(self):
+        if self.seconds:
+            time.sleep(self.seconds)
+
+
+# ==================== FIRESTORE ====================
+
+class StubDocumentSnapshot:
+    def __init__(self, doc_id: str, data: Optional[Dict]):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict]:
+        return copy.deepcopy(self._data)
+
+
+class StubDocumentReference:
+    def __init__(self, client: 'InMemoryFirestore', path: Tuple[str, ...]):
+        self._client = client
+        self.path = path
+        self.id = path[-1]
+
+    def collection(self, name: str) -> 'StubCollectionReference':
+        return StubCollectionReference(self._client, self.path + (name,))
+
+    def set(self, data: Dict, merge: bool = False):
+        self._client._latency.wait()
+        self._client._write(self.path, data, merge)
+
+    def get(self) -> StubDocumentSnapshot:
+        self._client._latency.wait()
+        return StubDocumentSnapshot(self.id, self._client._read(self.path))
+
+
+class StubCollectionReference:
+    def __init__(self, client: 'InMemoryFirestore', path: Tuple[str, ...]):
+        self._client = client
+        self.path = path
+
+    def document(self, doc_id: str) -> StubDocumentReference:
+        return StubDocumentReference(self._client, self.path + (str(doc_id),))
+
+    def stream(self) -> Iterator[StubDocumentSnapshot]:
+        self._client._latency.wait()
+        return iter([
+            StubDocumentSnapshot(path[-1], data)
+            for path, data in self._client._children(self.path)
+        ])
+
+
+class StubWriteBatch:
+    def __init__(self, client: 'InMemoryFirestore'):
+        self._client = client
+        self._writes = []
+
+    def set(self, reference: StubDocumentReference, data: Dict, merge: bool = False):
+        self._writes.append((reference.path, data, merge))
+
+    def commit(self):
+        self._client._latency.wait()
+        for path, data, merge in self._writes:
+            self._client._write(path, data, merge)
+        self._writes = []
+
+
+class InMemoryFirestore:
+    """Thread-safe in-memory Firestore client (collections, documents, batches)"""
+
+    def __init__(self, latency_ms: float = 50):
+        self._latency = _Latency(latency_ms)
+        self._documents: Dict[Tuple[str, ...], Dict] = {}
+        self._lock = threading.Lock()
+
+    def collection(self, name: str) -> StubCollectionReference:
+        return StubCollectionReference(self, (name,))
+
+    def batch(self) -> StubWriteBatch:
+        return StubWriteBatch(self)
+
+    def _write(self, path: Tuple[str, ...], data: Dict, merge: bool):
+        with self._lock:
+            current = self._documents.get(path) if merge else None
+            self._documents[path] = {**(current or {}), **copy.deepcopy(data)}
+
+    def _read(self, path: Tuple[str, ...]) -> Optional[Dict]:
+        with self._lock:
+            return self._documents.get(path)
+
+    def _children(self, collection_path: Tuple[str, ...]):
+        depth = len(collection_path) + 1
+        with self._lock:
+            return sorted(
+                (path, data) for path, data in self._documents.items()
+                if len(path) == depth and path[:-1] == collection_path
+            )
+
+
+# ==================== GEMINI ====================
+
+class StubGenerativeModel:
+    """Returns a canned response after the simulated latency"""
+
+    latency_ms: float = 50
+
+    def __init__(self, model_name: str = 'gemini-pro'):
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str) -> SimpleNamespace:
+        _Latency(self.latency_ms).wait()
+        return SimpleNamespace(text=f"[{self.model_name} stub] {len(prompt)} prompt characters analysed")
+
+
+def stub_genai(latency_ms: float = 50) -> SimpleNamespace:
+    """Object standing in for the google.generativeai module"""
+    model = type('StubGenerativeModel', (StubGenerativeModel,), {'latency_ms': latency_ms})
+    return SimpleNamespace(GenerativeModel=model)
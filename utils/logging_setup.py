@@ -0,0 +1,226 @@
+"""
+Logging Setup
+Queue-based, non-blocking logging with size-based rotation
+
+configure_logging() replaces the root handlers with one QueueHandler: the
+logging call only formats the message and enqueues the record, and a
+QueueListener thread writes it to stdout and the log file. Request threads
+never wait on disk or terminal I/O (SQL echo in development logs every
+statement).
+
+- LOG_FORMAT=json writes one JSON object per line (time, level, logger,
+  pid, message, exception)
+- LOG_FILE rotates at LOG_MAX_BYTES, keeping LOG_BACKUP_COUNT old files.
+  gunicorn workers share the file: writes and rollovers take an exclusive
+  lock on '<file>.lock', and a process whose file was rotated by another
+  reopens it
+- LOG_LEVEL sets the root level, LOG_LEVELS per-logger overrides
+  ('sqlalchemy.engine=WARNING,werkzeug=INFO')
+
+Threads do not survive fork(): gunicorn's post_fork hook calls
+reinit_after_fork() (through app.reinit_after_fork) to start the listener
+in each worker.
+"""
+
+import os
+import sys
+import copy
+import json
+import queue
+import atexit
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: single process, no cross-process lock needed
+    FCNTL_AVAILABLE = False
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'pid': record.process,
+            'message': record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps the traceback separate from the message
+
+    The stock prepare() merges the formatted traceback into msg, so a JSON
+    formatter on the listener side could not put it in its own field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SharedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that several processes can write to
+
+    Each write holds an flock on '<file>.lock', so size checks and rollovers
+    are serialized across gunicorn workers, and the stream is reopened when
+    another process has already rotated the file.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        self.lock_path = self.baseFilename + '.lock'
+        self._lock_file = None
+        self._lock_pid = None
+
+    @contextmanager
+    def _process_lock(self):
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        # flock is held per open file: a forked child needs its own descriptor
+        if self._lock_pid != os.getpid():
+            self._lock_file = open(self.lock_path, 'a')
+            self._lock_pid = os.getpid()
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _reopen_if_rotated(self):
+        if self.stream is None:
+            return
+        try:
+            rotated = os.stat(self.baseFilename).st_ino != os.fstat(self.stream.fileno()).st_ino
+        except FileNotFoundError:
+            rotated = True
+        if rotated:
+            self.stream.close()
+            self.stream = None
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            with self._process_lock():
+                self._reopen_if_rotated()
+                super().emit(record)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        super().close()
+        if self._lock_file is not None and self._lock_pid == os.getpid():
+            self._lock_file.close()
+        self._lock_file = None
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """
+    Per-logger levels from 'name=LEVEL,name=LEVEL'
+
+    Args:
+        spec: Comma-separated overrides, e.g. 'sqlalchemy.engine=WARNING'
+
+    Returns:
+        Mapping of logger name -> level
+    """
+    levels = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        name, _, level = item.partition('=')
+        if not name.strip() or not isinstance(logging.getLevelName(level.strip().upper()), int):
+            raise ValueError(f"Invalid LOG_LEVELS entry '{item.strip()}' (expected logger=LEVEL)")
+        levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return levels
+
+
+def _start_listener(handlers):
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(settings):
+    """
+    Route all logging through a queue to stdout and a rotating file
+
+    Args:
+        settings: Config class (or object) with the LOG_* attributes
+    """
+    global _queue_handler
+
+    formatter = JsonFormatter() if str(getattr(settings, 'LOG_FORMAT', 'text')).lower() == 'json' \
+        else logging.Formatter(TEXT_FORMAT)
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    log_file = getattr(settings, 'LOG_FILE', 'app.log')
+    if log_file:
+        handlers.append(SharedRotatingFileHandler(
+            log_file,
+            int(getattr(settings, 'LOG_MAX_BYTES', 10 * 1024 * 1024)),
+            int(getattr(settings, 'LOG_BACKUP_COUNT', 5))
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    _queue_handler = _RecordQueueHandler(queue.SimpleQueue())
+    root.addHandler(_queue_handler)
+    root.setLevel(str(getattr(settings, 'LOG_LEVEL', 'INFO')).upper())
+    for name, level in parse_levels(getattr(settings, 'LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(level)
+
+    _start_listener(handlers)
+
+
+def reinit_after_fork():
+    """Start a listener in a forked worker (the parent's thread is not copied)"""
+    if _listener is None:
+        return
+    # The parent's queue may have been locked by its listener mid-read
+    _start_listener(_listener.handlers)
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,242 @@
+"""
+Prometheus Metrics
+Request, database, auth, cloud sync, Gemini and feature metrics on /metrics
+
+Exported series (all prefixed mm_):
+
+- http_requests_total / http_request_duration_seconds: per endpoint, method
+  and status; db_queries_per_request from the request timer
+  (utils/request_timing.py)
+- db_pool_checkouts_total, db_pool_checkout_wait_seconds (time to obtain a
+  connection, including opening a new one) and db_pool_checked_out, per
+  engine ('primary' / 'replica')
+- sync_batches_total / sync_batch_duration_seconds / sync_batch_documents:
+  Firestore batch writes and collection reads of CloudSyncService
+- gemini_request_duration_seconds: Gemini calls by operation and outcome
+- feature_load_seconds: FeatureRegistry import/init time per feature
+
+ID tokens are not cached (every verify_token() call checks the token with
+firebase_admin), so there is no token cache series; verification time is
+the 'auth' phase of the request timer.
+
+/metrics needs 'Authorization: Bearer <METRICS_AUTH_TOKEN>'. Without a token
+configured it is only served in DEBUG or TESTING.
+
+prometheus_client is optional; without it the recording helpers are no-ops
+and /metrics is not registered. Under gunicorn each worker is a separate
+process: gunicorn.conf.py points PROMETHEUS_MULTIPROC_DIR at a shared
+directory (set it before the app is imported) where every process writes
+its values to mmap files, and /metrics aggregates them on scrape.
+"""
+
+import os
+import hmac
+import time
+import logging
+from contextlib import contextmanager
+from typing import Optional
+
+from flask import Response, g, jsonify, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+    )
+    from prometheus_client import multiprocess
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+DOCUMENT_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 5000)
+
+if PROMETHEUS_AVAILABLE:
+    HTTP_REQUESTS = Counter(
+        'mm_http_requests_total', 'HTTP requests', ['method', 'endpoint', 'status']
+    )
+    HTTP_LATENCY = Histogram(
+        'mm_http_request_duration_seconds', 'HTTP request latency', ['method', 'endpoint'],
+        buckets=LATENCY_BUCKETS
+    )
+    QUERIES_PER_REQUEST = Histogram(
+        'mm_db_queries_per_request', 'SQL statements executed per request', ['endpoint'],
+        buckets=QUERY_COUNT_BUCKETS
+    )
+    POOL_CHECKOUTS = Counter(
+        'mm_db_pool_checkouts_total', 'Connections checked out of the pool', ['engine']
+    )
+    POOL_WAIT = Histogram(
+        'mm_db_pool_checkout_wait_seconds', 'Time to obtain a pooled connection', ['engine'],
+        buckets=WAIT_BUCKETS
+    )
+    POOL_CHECKED_OUT = Gauge(
+        'mm_db_pool_checked_out', 'Connections currently checked out', ['engine'],
+        multiprocess_mode='livesum'
+    )
+    SYNC_BATCHES = Counter(
+        'mm_sync_batches_total', 'Cloud sync Firestore batches', ['operation', 'collection', 'outcome']
+    )
+    SYNC_BATCH_LATENCY = Histogram(
+        'mm_sync_batch_duration_seconds', 'Cloud sync Firestore batch duration', ['operation', 'collection'],
+        buckets=LATENCY_BUCKETS
+    )
+    SYNC_BATCH_DOCUMENTS = Histogram(
+        'mm_sync_batch_documents', 'Documents per cloud sync batch', ['operation', 'collection'],
+        buckets=DOCUMENT_BUCKETS
+    )
+    GEMINI_LATENCY = Histogram(
+        'mm_gemini_request_duration_seconds', 'Gemini API call latency', ['operation', 'outcome'],
+        buckets=LATENCY_BUCKETS + (30.0, 60.0)
+    )
+    FEATURE_LOAD = Gauge(
+        'mm_feature_load_seconds', 'Feature import/init time at startup', ['feature', 'phase'],
+        multiprocess_mode='max'
+    )
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.getenv('PROMETHEUS_MULTIPROC_DIR'))
+
+
+# ==================== RECORDING ====================
+
+def record_feature_load(feature: str, import_ms: float, init_ms: float):
+    if PROMETHEUS_AVAILABLE:
+        FEATURE_LOAD.labels(feature, 'import').set(import_ms / 1000)
+        FEATURE_LOAD.labels(feature, 'init').set(init_ms / 1000)
+
+
+@contextmanager
+def sync_batch(operation: str, collection: str, documents: Optional[int] = None):
+    """Time one Firestore batch commit or collection read (see observe_sync_documents)"""
+    if not PROMETHEUS_AVAILABLE:
+        yield
+        return
+    started = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'success'
+    finally:
+        SYNC_BATCHES.labels(operation, collection, outcome).inc()
+        SYNC_BATCH_LATENCY.labels(operation, collection).observe(time.perf_counter() - started)
+        if documents is not None:
+            SYNC_BATCH_DOCUMENTS.labels(operation, collection).observe(documents)
+
+
+def observe_sync_documents(operation: str, collection: str, documents: int):
+    """Document count of a batch whose size is only known after it ran (reads)"""
+    if PROMETHEUS_AVAILABLE:
+        SYNC_BATCH_DOCUMENTS.labels(operation, collection).observe(documents)
+
+
+@contextmanager
+def gemini_call(operation: str):
+    """Time one Gemini request"""
+    if not PROMETHEUS_AVAILABLE:
+        yield
+        return
+    started = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'success'
+    finally:
+        GEMINI_LATENCY.labels(operation, outcome).observe(time.perf_counter() - started)
+
+
+def attach_pool_metrics(engine, name: str):
+    """
+    Count checkouts and time connection acquisition on an engine's pool
+
+    The wait is measured around pool.connect(); the wrapper is reinstalled
+    when Engine.dispose() replaces the pool (e.g. after a gunicorn fork).
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return
+
+    def wrap_pool(pool):
+        connect = pool.connect
+
+        def timed_connect():
+            started = time.perf_counter()
+            try:
+                return connect()
+            finally:
+                POOL_WAIT.labels(name).observe(time.perf_counter() - started)
+
+        pool.connect = timed_connect
+
+    @event.listens_for(engine, 'checkout')
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKOUTS.labels(name).inc()
+        POOL_CHECKED_OUT.labels(name).inc()
+
+    @event.listens_for(engine, 'checkin')
+    def _checkin(dbapi_connection, connection_record):
+        POOL_CHECKED_OUT.labels(name).dec()
+
+    @event.listens_for(engine, 'engine_disposed')
+    def _disposed(disposed_engine):
+        wrap_pool(disposed_engine.pool)
+
+    wrap_pool(engine.pool)
+
+
+# ==================== ENDPOINT ====================
+
+def _render() -> bytes:
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def register_metrics(app):
+    """
+    Record request/pool metrics for the app and serve them on /metrics
+
+    Args:
+        app: Flask application with db_engine / db_read_engine
+    """
+    if not PROMETHEUS_AVAILABLE:
+        logger.info("Metrics disabled: 'pip install prometheus-client' to enable /metrics")
+        return
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    auth_token = app.config.get('METRICS_AUTH_TOKEN') or ''
+    if not auth_token and not (app.debug or app.testing):
+        logger.warning("Metrics disabled: set METRICS_AUTH_TOKEN to serve /metrics outside DEBUG/TESTING")
+        return
+    expected_header = f'Bearer {auth_token}'.encode()
+
+    attach_pool_metrics(app.db_engine, 'primary')
+    if app.db_read_engine is not app.db_engine:
+        attach_pool_metrics(app.db_read_engine, 'replica')
+
+    @app.after_request
+    def record_request_metrics(response):
+        timer = g.get('request_timer')
+        if timer is None:
+            return response
+        endpoint = request.endpoint or 'unmatched'
+        HTTP_REQUESTS.labels(request.method, endpoint, str(response.status_code)).inc()
+        HTTP_LATENCY.labels(request.method, endpoint).observe(timer.elapsed())
+        QUERIES_PER_REQUEST.labels(endpoint).observe(timer.query_count)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        """Prometheus scrape endpoint"""
+        if auth_token and not hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected_header):
+            return jsonify({'error': 'Invalid metrics token'}), 401
+        return Response(_render(), content_type=CONTENT_TYPE_LATEST)
+
+    logger.info("Prometheus metrics on /metrics" + (" (multiprocess)" if multiprocess_enabled() else ""))
@@ -12,9 +12,14 @@ except ImportError:
     genai = None
 
 from config import Config
+from utils.metrics import gemini_call
 
 def initialize_gemini():
     """Initialize Gemini API with the configured API key"""
+    if Config.GEMINI_BACKEND == 'stub':
+        from utils.io_stubs import stub_genai
+        return stub_genai(Config.IO_STUB_LATENCY_MS)
+    
     if not GEMINI_AVAILABLE:
         raise ValueError("Google Generative AI library not installed. Run 'pip install google-generativeai'")
     
@@ -68,7 +73,8 @@ def get_financial_insights(user_data, transaction_history):
         """
         
         # Generate response
-        response = model.generate_content(prompt)
+        with gemini_call('insights'):
+            response = model.generate_content(prompt)
         return response.text
         
     except Exception as e:
@@ -113,7 +119,8 @@ def predict_future_spending(transaction_history, months_ahead=3):
         """
         
         # Generate response
-        response = model.generate_content(prompt)
+        with gemini_call('predictions'):
+            response = model.generate_content(prompt)
         return response.text
         
     except Exception as e:
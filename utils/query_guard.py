@@ -0,0 +1,140 @@
+"""
+Query Guard
+N+1 detection and per-view query budgets for development and tests
+
+Builds on the request timer (utils/request_timing.py), which counts every
+statement a request executes, grouped by statement text. Statements are
+parameterized, so the same text means the same query shape:
+
+- after each request, shapes executed N_PLUS_ONE_THRESHOLD times or more
+  are logged as a likely N+1 (one query per item of a loop)
+- @query_budget(n) on a view fails the request when the view executes more
+  than n statements, so a change that adds an N+1 fails its tests
+
+QUERY_GUARD selects the mode: 'raise' (budget overruns raise
+QueryBudgetExceeded, which propagates to the test client under TESTING),
+'warn' (log only) or 'off'. Empty means 'raise' when TESTING, 'warn' when
+DEBUG and 'off' otherwise; when off the decorator is a pass-through. Responses carry an X-Query-Count header while the guard is on.
+"""
+
+import logging
+from functools import wraps
+from typing import List, Optional, Tuple
+
+from flask import current_app, request
+
+from .request_timing import RequestTimer, current_timer
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'warn', 'raise')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view executed more statements than its @query_budget allows"""
+
+
+def _shorten(statement: str, limit: int = 200) -> str:
+    statement = ' '.join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + '...'
+
+
+class QueryGuard:
+    """N+1 and query budget checks for one app"""
+
+    def __init__(self, mode: str, threshold: int):
+        self.mode = mode
+        self.threshold = threshold
+
+    def repeated_statements(self, timer: RequestTimer) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times, most repeated first"""
+        repeated = [(statement, count) for statement, count in timer.statement_counts.items()
+                    if count >= self.threshold]
+        return sorted(repeated, key=lambda item: item[1], reverse=True)
+
+    def check_request(self, timer: RequestTimer):
+        for statement, count in self.repeated_statements(timer):
+            logger.warning(
+                f"Possible N+1 in {request.method} {request.path} ({request.endpoint}): "
+                f"{count}x {_shorten(statement)}"
+            )
+
+    def check_budget(self, endpoint: Optional[str], executed: int, budget: int, timer: RequestTimer):
+        if executed <= budget:
+            return
+        message = f"{endpoint} executed {executed} queries (budget {budget})"
+        repeated = self.repeated_statements(timer)
+        if repeated:
+            message += f"; most repeated: {repeated[0][1]}x {_shorten(repeated[0][0])}"
+        if self.mode == 'raise':
+            raise QueryBudgetExceeded(message)
+        logger.warning(f"Query budget exceeded: {message}")
+
+
+def resolve_mode(app) -> str:
+    mode = str(app.config.get('QUERY_GUARD') or '').lower()
+    if mode in MODES:
+        return mode
+    if mode:
+        logger.warning(f"Unknown QUERY_GUARD '{mode}'; using the default")
+    return 'raise' if app.testing else 'warn' if app.debug else 'off'
+
+
+def register_query_guard(app):
+    """
+    Enable the N+1 check and query budgets for the app (per QUERY_GUARD)
+
+    Args:
+        app: Flask application with request timing registered
+    """
+    mode = resolve_mode(app)
+    if mode == 'off':
+        app.query_guard = None
+        return
+
+    guard = QueryGuard(mode, int(app.config.get('N_PLUS_ONE_THRESHOLD', 5)))
+    app.query_guard = guard
+
+    @app.errorhandler(QueryBudgetExceeded)
+    def propagate_budget_overrun(error):
+        # Bypass the catch-all Exception handler so the overrun reaches the
+        # test client (TESTING propagates exceptions) instead of a plain 500
+        raise error
+
+    @app.after_request
+    def check_queries(response):
+        timer = current_timer()
+        if timer is not None:
+            response.headers['X-Query-Count'] = str(timer.query_count)
+            guard.check_request(timer)
+        return response
+
+    logger.info(f"Query guard enabled ({mode}, N+1 threshold {guard.threshold})")
+
+
+def query_budget(max_queries: int):
+    """
+    Limit the statements a view may execute (checked only while the guard is on)
+
+    Usage:
+        @bp.route('/api/list')
+        @login_required
+        @query_budget(2)
+        def list_items():
+            ...
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            guard = getattr(current_app, 'query_guard', None)
+            timer = current_timer()
+            if guard is None or timer is None:
+                return current_app.ensure_sync(f)(*args, **kwargs)
+
+            before = timer.query_count
+            result = current_app.ensure_sync(f)(*args, **kwargs)
+            guard.check_budget(request.endpoint, timer.query_count - before, max_queries, timer)
+            return result
+
+        return decorated_function
+    return decorator
@@ -0,0 +1,337 @@
+"""
+Recurring Transaction Detection
+Finds subscriptions and bills by periodic cadence
+
+Expenses are grouped by (user, normalized description, amount band) and the
+day intervals between consecutive charges are summarized per group. Groups
+whose mean interval sits near a known cadence with low spread are treated as
+recurring. Summaries live in the recurring_signatures table:
+
+- rebuild_signatures() computes them for whole histories in one vectorized pass
+  (also the backfill of schema migration 3)
+- new transactions are folded in incrementally from session flush events
+  (Welford update of the interval mean/variance), so reads never rescan history
+
+Edits and deletions of past charges are not folded in; run
+'flask analytics rebuild-recurring' to recompute after bulk corrections.
+Queries over the signatures live in features/analytics/recurring.py.
+"""
+
+import math
+import logging
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import event, select, delete, insert, tuple_
+from sqlalchemy.exc import IntegrityError
+
+from models.recurring import RecurringSignature
+from models.transaction import Transaction
+from .histories import normalize_description, description_codes, load_histories, group_positions
+
+logger = logging.getLogger(__name__)
+
+# Nominal cadences in days (weekly, biweekly, monthly, quarterly, yearly)
+CADENCES = (7, 14, 30, 91, 365)
+# Mean interval may differ from a cadence by this fraction
+CADENCE_TOLERANCE = 0.15
+# Interval standard deviation allowed, as a fraction of the cadence
+MAX_RELATIVE_SPREAD = 0.25
+# Charges needed before a signature counts as recurring
+MIN_OCCURRENCES = 3
+# Amount band width: charges within ~25% of each other share a band
+BAND_RATIO = 1.25
+# A recurring charge overdue by this many cadences is considered cancelled
+STALE_CADENCES = 1.5
+
+_LOG_BAND_RATIO = math.log(BAND_RATIO)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def amount_band(amount) -> int:
+    """Logarithmic amount bucket"""
+    value = max(abs(float(amount)), 0.01)
+    return int(math.floor(math.log(value) / _LOG_BAND_RATIO))
+
+
+def make_signature(normalized_description: str, band: int) -> str:
+    return f"{normalized_description[:240]}|{band}"
+
+
+def classify_cadence(interval_count: int, interval_mean: float, interval_m2: float) -> Optional[int]:
+    """
+    Nominal cadence in days for a set of intervals, or None if not periodic
+
+    Args:
+        interval_count: Number of intervals (occurrences - 1)
+        interval_mean: Mean interval in days
+        interval_m2: Sum of squared deviations from the mean
+    """
+    if interval_count < MIN_OCCURRENCES - 1 or interval_mean <= 0:
+        return None
+
+    spread = math.sqrt(interval_m2 / interval_count)
+    for cadence in CADENCES:
+        if abs(interval_mean - cadence) <= CADENCE_TOLERANCE * cadence:
+            return cadence if spread <= MAX_RELATIVE_SPREAD * cadence else None
+    return None
+
+
+def _cadence_fields(interval_count: int, interval_mean: float, interval_m2: float,
+                    last_seen: date) -> Dict:
+    cadence = classify_cadence(interval_count, interval_mean, interval_m2)
+    return {
+        'cadence_days': cadence,
+        'is_recurring': cadence is not None,
+        'next_expected': last_seen + timedelta(days=round(interval_mean)) if cadence else None
+    }
+
+
+# ==================== BATCH DETECTION ====================
+
+def detect_signatures(arrays) -> List[Dict]:
+    """
+    Summarize every (user, description, band) group in one vectorized pass
+
+    Args:
+        arrays: TransactionArrays from anomalies.load_histories
+
+    Returns:
+        List of column dicts ready to insert into recurring_signatures
+    """
+    n = len(arrays.ids)
+    if n == 0:
+        return []
+
+    codes = description_codes(arrays.descriptions)
+    with np.errstate(divide='ignore'):
+        bands = np.floor(np.log(np.maximum(np.abs(arrays.amounts), 0.01)) / _LOG_BAND_RATIO).astype(np.int64)
+
+    named = codes >= 0
+    band_offset = bands - bands.min()
+    group_keys = (arrays.users * (codes.max() + 1) + codes) * (band_offset.max() + 1) + band_offset
+    group_keys = np.where(named, group_keys, -1)
+
+    order = np.lexsort((arrays.ids, arrays.days, group_keys))
+    order = order[group_keys[order] >= 0]
+    if len(order) == 0:
+        return []
+
+    keys = group_keys[order]
+    days = arrays.days[order]
+    positions = group_positions(keys)
+    is_start = positions == 0
+    group_index = np.cumsum(is_start) - 1
+    n_groups = group_index[-1] + 1
+
+    # Intervals between consecutive charges inside each group
+    intervals = np.diff(days).astype(np.float64)
+    same_group = ~is_start[1:]
+    interval_groups = group_index[1:][same_group]
+    intervals = intervals[same_group]
+
+    interval_count = np.bincount(interval_groups, minlength=n_groups)
+    interval_sum = np.bincount(interval_groups, weights=intervals, minlength=n_groups)
+    interval_sumsq = np.bincount(interval_groups, weights=intervals * intervals, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        interval_mean = np.where(interval_count > 0, interval_sum / interval_count, 0.0)
+    interval_m2 = np.maximum(interval_sumsq - interval_count * interval_mean ** 2, 0.0)
+
+    starts = np.flatnonzero(is_start)
+    ends = np.r_[starts[1:], len(order)] - 1
+    first_rows = order[starts]
+    last_rows = order[ends]
+
+    normalized_by_code = {}
+    signatures = []
+    for g in range(n_groups):
+        first, last = first_rows[g], last_rows[g]
+        code = codes[last]
+        if code not in normalized_by_code:
+            normalized_by_code[code] = normalize_description(arrays.descriptions[last])
+        last_seen = date.fromordinal(int(arrays.days[last]) + _EPOCH_ORDINAL)
+        signatures.append({
+            'firebase_uid': arrays.user_uids[arrays.users[last]],
+            'signature': make_signature(normalized_by_code[code], int(bands[last])),
+            'description': arrays.descriptions[last],
+            'category_id': None if arrays.categories[last] < 0 else int(arrays.categories[last]),
+            'amount_band': int(bands[last]),
+            'last_amount': Decimal(str(round(float(arrays.amounts[last]), 2))),
+            'occurrences': int(ends[g] - starts[g] + 1),
+            'first_seen': date.fromordinal(int(arrays.days[first]) + _EPOCH_ORDINAL),
+            'last_seen': last_seen,
+            'interval_count': int(interval_count[g]),
+            'interval_mean': float(interval_mean[g]),
+            'interval_m2': float(interval_m2[g]),
+            **_cadence_fields(int(interval_count[g]), float(interval_mean[g]), float(interval_m2[g]), last_seen)
+        })
+
+    return signatures
+
+
+def rebuild_signatures(db_session, firebase_uids: Optional[Sequence[str]] = None) -> int:
+    """
+    Recompute recurring signatures from full transaction histories
+
+    Args:
+        db_session: SQLAlchemy session
+        firebase_uids: Users to rebuild (default: everyone)
+
+    Returns:
+        Number of signatures written
+    """
+    arrays = load_histories(db_session, firebase_uids)
+    signatures = detect_signatures(arrays)
+
+    clear = delete(RecurringSignature)
+    if firebase_uids is not None:
+        clear = clear.where(RecurringSignature.firebase_uid.in_(list(firebase_uids)))
+    db_session.execute(clear)
+
+    if signatures:
+        db_session.execute(insert(RecurringSignature), signatures)
+    db_session.commit()
+
+    logger.info(f"Rebuilt {len(signatures)} recurring signatures")
+    return len(signatures)
+
+
+# ==================== INCREMENTAL UPDATES ====================
+
+def _new_charges(session) -> Dict:
+    """New, countable expense transactions in a flush, grouped by (uid, signature)"""
+    grouped: Dict = {}
+    for obj in session.new:
+        if not isinstance(obj, Transaction) or obj.type != 'expense' or obj.is_deleted:
+            continue
+        if obj.date is None or obj.amount is None:
+            continue
+        normalized = normalize_description(obj.description)
+        if not normalized:
+            continue
+        band = amount_band(obj.amount)
+        key = (obj.firebase_uid, make_signature(normalized, band))
+        grouped.setdefault(key, []).append(obj)
+    return grouped
+
+
+def _as_date(value) -> date:
+    return value.date() if hasattr(value, 'date') and callable(value.date) else value
+
+
+def _fold_charges(session, flush_context):
+    """
+    after_flush: fold new charges into their signatures
+
+    The fold runs in a savepoint and never fails the flush: signatures are
+    derived data, and a rebuild recomputes them. If a concurrent writer
+    inserted one of the signatures first, the fold is retried once against
+    the committed row.
+    """
+    grouped = _new_charges(session)
+    if not grouped:
+        return
+
+    connection = session.connection()
+    for attempt in range(2):
+        savepoint = connection.begin_nested()
+        try:
+            _fold_into_signatures(connection, grouped)
+            savepoint.commit()
+            return
+        except IntegrityError:
+            savepoint.rollback()
+            if attempt == 0:
+                continue
+            logger.warning("Skipped folding charges into recurring signatures after a concurrent insert; "
+                           "run 'flask analytics rebuild-recurring'")
+        except Exception as e:
+            savepoint.rollback()
+            logger.error(f"Failed to fold charges into recurring signatures: {str(e)}")
+            return
+
+
+def _fold_into_signatures(connection, grouped: Dict):
+    """Welford-update the signatures of grouped charges (rows locked while read)"""
+    table = RecurringSignature.__table__
+    existing = {
+        (row.firebase_uid, row.signature): row
+        for row in connection.execute(
+            select(table)
+            .where(tuple_(table.c.firebase_uid, table.c.signature).in_(list(grouped)))
+            .with_for_update()
+        )
+    }
+
+    for (firebase_uid, signature), charges in grouped.items():
+        charges.sort(key=lambda txn: _as_date(txn.date))
+        row = existing.get((firebase_uid, signature))
+
+        if row is None:
+            first = charges[0]
+            state = {
+                'occurrences': 0,
+                'first_seen': _as_date(first.date),
+                'last_seen': None,
+                'interval_count': 0,
+                'interval_mean': 0.0,
+                'interval_m2': 0.0
+            }
+        else:
+            state = {
+                'occurrences': row.occurrences,
+                'first_seen': row.first_seen,
+                'last_seen': row.last_seen,
+                'interval_count': row.interval_count,
+                'interval_mean': row.interval_mean,
+                'interval_m2': row.interval_m2
+            }
+
+        for txn in charges:
+            txn_date = _as_date(txn.date)
+            state['occurrences'] += 1
+            if state['last_seen'] is None:
+                state['last_seen'] = txn_date
+            elif txn_date >= state['last_seen']:
+                # Welford update with the new interval
+                interval = (txn_date - state['last_seen']).days
+                state['interval_count'] += 1
+                delta = interval - state['interval_mean']
+                state['interval_mean'] += delta / state['interval_count']
+                state['interval_m2'] += delta * (interval - state['interval_mean'])
+                state['last_seen'] = txn_date
+            else:
+                # Back-dated charge: counted, interval stats left as-is
+                state['first_seen'] = min(state['first_seen'], txn_date)
+
+        latest = charges[-1]
+        values = {
+            **state,
+            'description': latest.description,
+            'category_id': latest.category_id,
+            'last_amount': Decimal(str(latest.amount)).quantize(Decimal('0.01')),
+            **_cadence_fields(state['interval_count'], state['interval_mean'],
+                              state['interval_m2'], state['last_seen'])
+        }
+
+        if row is None:
+            connection.execute(insert(table).values(
+                firebase_uid=firebase_uid,
+                signature=signature,
+                amount_band=amount_band(latest.amount),
+                **values
+            ))
+        else:
+            connection.execute(table.update().where(table.c.id == row.id).values(**values))
+
+
+def register_signature_listeners(session_factory):
+    """
+    Keep recurring signatures current for every session created by a factory
+
+    Args:
+        session_factory: sessionmaker used by the application
+    """
+    event.listen(session_factory, 'after_flush', _fold_charges)
@@ -0,0 +1,186 @@
+"""
+Request Timing
+Per-request phase timings, Server-Timing headers and a slow-request log
+
+register_request_timing() starts a RequestTimer for every request and adds
+up where the time goes:
+
+- auth: Firebase token verification (utils/firebase_helpers.verify_token)
+- db: SQL execution, from the engines' before/after_cursor_execute events
+  (with the statements, for the slow-request log)
+- serialize: JSON encoding of responses (jsonify and dict return values)
+- app: everything else in the handler
+
+The phases are sent in a Server-Timing header (visible in the browser's
+network panel) when SERVER_TIMING_HEADER is on, by default only in DEBUG
+or TESTING since it tells clients how long auth and SQL took. Requests
+slower than SLOW_REQUEST_MS are written as one JSON line to the
+'slow_requests' logger with their phases and SQL (statements only, no
+parameters).
+"""
+
+import json
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from flask import g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+slow_request_logger = logging.getLogger('slow_requests')
+
+# Statements kept per request for the slow-request log (all are counted)
+MAX_RECORDED_STATEMENTS = 50
+
+
+class RequestTimer:
+    """Phase durations and SQL statements of one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.query_count = 0
+        self.statements: List[Tuple[str, float]] = []
+        self.statement_counts: Dict[str, int] = {}
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_query(self, statement: str, seconds: float):
+        self.add('db', seconds)
+        self.query_count += 1
+        self.statement_counts[statement] = self.statement_counts.get(statement, 0) + 1
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            self.statements.append((statement, seconds))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def breakdown_ms(self) -> Dict[str, float]:
+        """Phase durations in ms, with the unaccounted remainder as 'app' and the 'total'"""
+        total = self.elapsed()
+        phases = {name: seconds * 1000 for name, seconds in self.phases.items()}
+        phases['app'] = max(0.0, total * 1000 - sum(phases.values()))
+        phases['total'] = total * 1000
+        return {name: round(ms, 2) for name, ms in phases.items()}
+
+
+def current_timer() -> Optional[RequestTimer]:
+    """Timer of the active request, or None outside requests"""
+    if not has_request_context():
+        return None
+    return g.get('request_timer')
+
+
+@contextmanager
+def timed_phase(phase: str):
+    """Count the block's duration towards a phase of the current request (no-op outside requests)"""
+    timer = current_timer()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(phase, time.perf_counter() - started)
+
+
+def server_timing_header(breakdown: Dict[str, float], query_count: int) -> str:
+    entries = []
+    for name, ms in breakdown.items():
+        entry = f"{name};dur={ms}"
+        if name == 'db':
+            entry += f';desc="{query_count} queries"'
+        entries.append(entry)
+    return ', '.join(entries)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Default JSON provider that counts encoding time as 'serialize'"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        with timed_phase('serialize'):
+            return super().dumps(obj, **kwargs)
+
+
+# ==================== SQL EVENTS ====================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_timer() is not None:
+        context.request_timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'request_timing_start', None)
+    if started is None:
+        return
+    timer = current_timer()
+    if timer is not None:
+        timer.add_query(statement, time.perf_counter() - started)
+
+
+def attach_sql_timing(engine):
+    """Time every statement executed on the engine during a request"""
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+# ==================== REGISTRATION ====================
+
+def _log_slow_request(timer: RequestTimer, breakdown: Dict[str, float], response):
+    record = {
+        'event': 'slow_request',
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'duration_ms': breakdown['total'],
+        'phases': {name: ms for name, ms in breakdown.items() if name != 'total'},
+        'queries': timer.query_count,
+        'user': g.get('user_id'),
+        'sql': [
+            {'statement': ' '.join(statement.split()), 'ms': round(seconds * 1000, 2)}
+            for statement, seconds in timer.statements
+        ]
+    }
+    slow_request_logger.warning(json.dumps(record, default=str))
+
+
+def register_request_timing(app):
+    """
+    Time every request of the app
+
+    Args:
+        app: Flask application with db_engine / db_read_engine
+    """
+    setting = app.config.get('SERVER_TIMING_HEADER')
+    send_header = (app.debug or app.testing) if setting in (None, '') else str(setting).lower() == 'true'
+    slow_threshold_ms = float(app.config.get('SLOW_REQUEST_MS', 500))
+
+    app.json = TimedJSONProvider(app)
+    for engine in {app.db_engine, app.db_read_engine}:
+        attach_sql_timing(engine)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_timer = RequestTimer()
+
+    @app.after_request
+    def finish_request_timer(response):
+        timer = g.get('request_timer')
+        if timer is None:
+            return response
+
+        breakdown = timer.breakdown_ms()
+        if send_header:
+            response.headers['Server-Timing'] = server_timing_header(breakdown, timer.query_count)
+        if slow_threshold_ms and breakdown['total'] >= slow_threshold_ms:
+            _log_slow_request(timer, breakdown, response)
+        return response
+
+    logger.info(f"Request timing enabled (slow requests >= {slow_threshold_ms:.0f}ms)")
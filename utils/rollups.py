@@ -0,0 +1,334 @@
+"""
+Analytics Rollup Maintenance
+Keeps the monthly-by-category aggregate table in step with transactions
+
+Writes are folded into the rollup incrementally from SQLAlchemy flush events,
+so every code path that saves a Transaction through the ORM (routes, cloud
+pull, imports) updates the aggregates in the same database transaction.
+Rows written with Core bulk inserts bypass the ORM and need a rebuild.
+"""
+
+import logging
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, extract, func, inspect, insert, select, delete, and_
+from models.rollup import MonthlyCategoryRollup
+from models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+# Transaction attributes that influence the rollup
+TRACKED_FIELDS = ('firebase_uid', 'amount', 'type', 'category_id', 'date', 'is_deleted')
+
+RollupKey = Tuple[str, int, int, Optional[int], str]
+
+_CENT = Decimal('0.01')
+
+
+def _to_decimal(value) -> Decimal:
+    """Normalize float/str/Decimal amounts to a 2dp Decimal"""
+    if isinstance(value, Decimal):
+        return value.quantize(_CENT)
+    return Decimal(str(value)).quantize(_CENT)
+
+
+def _contribution(values: Dict) -> Optional[Tuple[RollupKey, Decimal]]:
+    """
+    Rollup key and amount a transaction contributes, or None if it is not counted
+
+    Args:
+        values: Mapping of TRACKED_FIELDS to values
+    """
+    if values.get('is_deleted'):
+        return None
+    if values.get('date') is None or values.get('amount') is None or not values.get('firebase_uid'):
+        return None
+
+    txn_date = values['date']
+    key = (values['firebase_uid'], txn_date.year, txn_date.month, values.get('category_id'), values['type'])
+    return key, _to_decimal(values['amount'])
+
+
+def _current_values(obj) -> Dict:
+    return {field: getattr(obj, field) for field in TRACKED_FIELDS}
+
+
+def _committed_values(obj) -> Dict:
+    """Values as last loaded from the database, before pending changes"""
+    state = inspect(obj)
+    values = {}
+    for field in TRACKED_FIELDS:
+        history = state.attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+        elif history.unchanged:
+            values[field] = history.unchanged[0]
+        else:
+            values[field] = getattr(obj, field)
+    return values
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    """
+    Attribute 'set' hook registered with active_history=True
+
+    Makes SQLAlchemy load the old value of an expired attribute (e.g. after
+    a commit) before it is overwritten, so _committed_values() can subtract it
+    """
+    return value
+
+
+def _has_tracked_changes(obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in TRACKED_FIELDS)
+
+
+def _add_delta(deltas: Dict, values: Dict, sign: int):
+    contribution = _contribution(values)
+    if contribution is None:
+        return
+    key, amount = contribution
+    total, count = deltas.get(key, (Decimal('0.00'), 0))
+    deltas[key] = (total + sign * amount, count + sign)
+
+
+def _collect_deltas(session, flush_context, instances):
+    """before_flush: compute rollup deltas from pending Transaction changes"""
+    deltas: Dict[RollupKey, Tuple[Decimal, int]] = {}
+
+    for obj in session.new:
+        if isinstance(obj, Transaction):
+            _add_delta(deltas, _current_values(obj), +1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Transaction) and _has_tracked_changes(obj):
+            _add_delta(deltas, _committed_values(obj), -1)
+            _add_delta(deltas, _current_values(obj), +1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Transaction):
+            _add_delta(deltas, _committed_values(obj), -1)
+
+    session.info['rollup_deltas'] = {
+        key: delta for key, delta in deltas.items() if delta != (Decimal('0.00'), 0)
+    }
+
+
+def _key_filter(key: RollupKey):
+    firebase_uid, year, month, category_id, txn_type = key
+    table = MonthlyCategoryRollup.__table__
+    category_clause = table.c.category_id.is_(None) if category_id is None else table.c.category_id == category_id
+    return and_(
+        table.c.firebase_uid == firebase_uid,
+        table.c.year == year,
+        table.c.month == month,
+        category_clause,
+        table.c.type == txn_type
+    )
+
+
+def _apply_deltas(session, flush_context):
+    """after_flush: fold the collected deltas into the rollup table"""
+    deltas = session.info.pop('rollup_deltas', None)
+    if not deltas:
+        return
+
+    apply_deltas(session.connection(), deltas)
+
+
+def _bucket_upsert(dialect: str):
+    """INSERT ... ON CONFLICT DO UPDATE for the dialect, or None when unsupported"""
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+
+    table = MonthlyCategoryRollup.__table__
+    bucket_index = next(index for index in table.indexes if index.name == 'uq_rollup_bucket')
+    stmt = dialect_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=list(bucket_index.expressions),
+        set_={
+            'total': table.c.total + stmt.excluded.total,
+            'count': table.c.count + stmt.excluded.count
+        }
+    )
+
+
+def apply_deltas(connection, deltas: Dict[RollupKey, Tuple[Decimal, int]]):
+    """
+    Upsert rollup deltas on a connection
+
+    Buckets gaining rows are written with one atomic upsert against the
+    uq_rollup_bucket index, so concurrent writers adding to a new bucket
+    never create duplicates. Other dialects fall back to UPDATE, then INSERT.
+
+    Args:
+        connection: SQLAlchemy connection inside the writing transaction
+        deltas: Mapping of rollup key to (total delta, count delta)
+    """
+    table = MonthlyCategoryRollup.__table__
+    upsert = _bucket_upsert(connection.dialect.name)
+
+    for key, (total_delta, count_delta) in deltas.items():
+        where = _key_filter(key)
+        firebase_uid, year, month, category_id, txn_type = key
+
+        if count_delta > 0 and upsert is not None:
+            connection.execute(upsert.values(
+                firebase_uid=firebase_uid,
+                year=year,
+                month=month,
+                category_id=category_id,
+                type=txn_type,
+                total=total_delta,
+                count=count_delta
+            ))
+            continue
+
+        result = connection.execute(
+            table.update().where(where).values(
+                total=table.c.total + total_delta,
+                count=table.c.count + count_delta
+            )
+        )
+
+        if result.rowcount == 0:
+            if count_delta <= 0:
+                # Nothing to subtract from; the rollup predates this row
+                logger.warning(f"Rollup bucket missing for {key}; run 'flask analytics rebuild-rollups'")
+                continue
+            connection.execute(insert(table).values(
+                firebase_uid=firebase_uid,
+                year=year,
+                month=month,
+                category_id=category_id,
+                type=txn_type,
+                total=total_delta,
+                count=count_delta
+            ))
+        elif count_delta < 0:
+            connection.execute(delete(table).where(where, table.c.count <= 0))
+
+
+def register_rollup_listeners(session_factory):
+    """
+    Attach rollup maintenance to every session created by a factory
+
+    Args:
+        session_factory: sessionmaker used by the application
+    """
+    for field in TRACKED_FIELDS:
+        attribute = getattr(Transaction, field)
+        if not event.contains(attribute, 'set', _load_previous_value):
+            event.listen(attribute, 'set', _load_previous_value, active_history=True)
+    event.listen(session_factory, 'before_flush', _collect_deltas)
+    event.listen(session_factory, 'after_flush', _apply_deltas)
+
+
+def rebuild_rollups(db_session, firebase_uid: Optional[str] = None) -> int:
+    """
+    Recompute the rollup table from raw transactions
+
+    Args:
+        db_session: SQLAlchemy session
+        firebase_uid: Restrict the rebuild to one user (default: everyone)
+
+    Returns:
+        Number of rollup rows written
+    """
+    table = MonthlyCategoryRollup.__table__
+    year = extract('year', Transaction.date)
+    month = extract('month', Transaction.date)
+
+    source = select(
+        Transaction.firebase_uid,
+        year,
+        month,
+        Transaction.category_id,
+        Transaction.type,
+        func.sum(Transaction.amount),
+        func.count(Transaction.id)
+    ).where(Transaction.is_deleted == False)  # noqa: E712
+
+    clear = delete(table)
+    if firebase_uid:
+        source = source.where(Transaction.firebase_uid == firebase_uid)
+        clear = clear.where(table.c.firebase_uid == firebase_uid)
+
+    source = source.group_by(
+        Transaction.firebase_uid, year, month, Transaction.category_id, Transaction.type
+    )
+
+    db_session.execute(clear)
+    result = db_session.execute(
+        insert(table).from_select(
+            ['firebase_uid', 'year', 'month', 'category_id', 'type', 'total', 'count'],
+            source
+        )
+    )
+    db_session.commit()
+
+    logger.info(f"Rebuilt {result.rowcount} rollup rows" + (f" for user {firebase_uid}" if firebase_uid else ""))
+    return result.rowcount
+
+
+def _period_index(year: int, month: int) -> int:
+    return year * 12 + (month - 1)
+
+
+def _period_filter(start: Optional[Tuple[int, int]], end: Optional[Tuple[int, int]]) -> List:
+    period = MonthlyCategoryRollup.year * 12 + (MonthlyCategoryRollup.month - 1)
+    clauses = []
+    if start:
+        clauses.append(period >= _period_index(*start))
+    if end:
+        clauses.append(period <= _period_index(*end))
+    return clauses
+
+
+def monthly_totals(db_session, firebase_uid: str, txn_type: str = 'expense',
+                   start: Optional[Tuple[int, int]] = None,
+                   end: Optional[Tuple[int, int]] = None) -> List:
+    """
+    Monthly totals for a user between two (year, month) bounds, inclusive
+
+    Returns:
+        Rows of (year, month, total, count) ordered by period
+    """
+    return db_session.query(
+        MonthlyCategoryRollup.year,
+        MonthlyCategoryRollup.month,
+        func.sum(MonthlyCategoryRollup.total).label('total'),
+        func.sum(MonthlyCategoryRollup.count).label('count')
+    ).filter(
+        MonthlyCategoryRollup.firebase_uid == firebase_uid,
+        MonthlyCategoryRollup.type == txn_type,
+        *_period_filter(start, end)
+    ).group_by(MonthlyCategoryRollup.year, MonthlyCategoryRollup.month)\
+    .order_by(MonthlyCategoryRollup.year, MonthlyCategoryRollup.month)\
+    .all()
+
+
+def category_totals(db_session, firebase_uid: str, txn_type: str = 'expense',
+                    start: Optional[Tuple[int, int]] = None,
+                    end: Optional[Tuple[int, int]] = None) -> List:
+    """
+    Per-category totals for a user between two (year, month) bounds, inclusive
+
+    Returns:
+        Rows of (category_id, total, count)
+    """
+    return db_session.query(
+        MonthlyCategoryRollup.category_id,
+        func.sum(MonthlyCategoryRollup.total).label('total'),
+        func.sum(MonthlyCategoryRollup.count).label('count')
+    ).filter(
+        MonthlyCategoryRollup.firebase_uid == firebase_uid,
+        MonthlyCategoryRollup.type == txn_type,
+        *_period_filter(start, end)
+    ).group_by(MonthlyCategoryRollup.category_id)\
+    .all()
@@ -0,0 +1,256 @@
+"""
+Sampling Profiler
+Opt-in, low-overhead request profiling for production workers
+
+A profiled request registers its thread with a shared sampler thread,
+which every PROFILE_INTERVAL_MS reads the thread's current stack from
+sys._current_frames() and counts it. Nothing is traced, so the request
+itself runs at full speed; the cost is one stack walk per interval.
+
+A request is profiled when:
+
+- it carries 'X-Profile: 1' and an admin bearer token (the same check as
+  @require_admin; without one the header is ignored), or
+- it is picked at random with probability PROFILE_SAMPLE_RATE (0 = never)
+
+Each profile is written to PROFILE_DIR as '<name>.collapsed', in the
+collapsed-stack format of flamegraph.pl, speedscope and inferno
+('outer;inner;leaf <samples>'), next to '<name>.json' with the request's
+metadata. The newest PROFILE_MAX_FILES are kept. Profiled responses carry
+an X-Profile-Id header; GET /admin/api/profiles lists recent profiles.
+
+Only the request thread is sampled: the body of an async view runs on
+asgiref's event loop thread and shows up as a wait in async_to_sync, and
+gevent workers show the hub.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Profile:
+    """Stack sample counts of one request"""
+
+    def __init__(self, thread_id: int):
+        self.thread_id = thread_id
+        self.started = time.perf_counter()
+        self.samples = 0
+        self.stacks: Dict[str, int] = {}
+
+    def add(self, stack: str):
+        self.samples += 1
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def collapsed(self) -> str:
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+
+class SamplingProfiler:
+    """One background thread sampling the stacks of all registered request threads"""
+
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self._active: Dict[int, Profile] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._labels: Dict[object, str] = {}
+
+    def start(self) -> Profile:
+        """Start sampling the calling thread"""
+        profile = Profile(threading.get_ident())
+        with self._lock:
+            self._active[profile.thread_id] = profile
+            # After a fork the thread object is copied but not running
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return profile
+
+    def stop(self, profile: Profile):
+        with self._lock:
+            if self._active.get(profile.thread_id) is profile:
+                del self._active[profile.thread_id]
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename
+            if path.startswith(PROJECT_ROOT + os.sep):
+                path = os.path.relpath(path, PROJECT_ROOT)
+            elif 'site-packages' + os.sep in path:
+                path = path.split('site-packages' + os.sep, 1)[1]
+            else:
+                path = os.path.basename(path)
+            label = f"{code.co_name} ({path}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _stack(self, frame) -> str:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        return ';'.join(reversed(labels))
+
+    def _run(self):
+        while True:
+            with self._lock:
+                active = list(self._active.values())
+            if not active:
+                # Idle until the next profiled request
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            frames = sys._current_frames()
+            for profile in active:
+                frame = frames.get(profile.thread_id)
+                if frame is not None:
+                    profile.add(self._stack(frame))
+            del frames
+            time.sleep(self.interval_s)
+
+
+# ==================== STORAGE ====================
+
+def _safe_name(endpoint: Optional[str]) -> str:
+    return ''.join(c if c.isalnum() or c in '-_' else '-' for c in (endpoint or 'unmatched'))
+
+
+def save_profile(directory: str, profile: Profile, metadata: Dict, max_files: int) -> str:
+    """
+    Write a profile and its metadata, then prune the oldest beyond max_files
+
+    Returns:
+        Profile name (file name without extension)
+    """
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+    name = f"{stamp}_{_safe_name(metadata.get('endpoint'))}_{os.getpid()}_{uuid.uuid4().hex[:6]}"
+
+    with open(os.path.join(directory, f"{name}.collapsed"), 'w') as f:
+        f.write(profile.collapsed())
+    with open(os.path.join(directory, f"{name}.json"), 'w') as f:
+        json.dump(dict(metadata, name=name), f)
+
+    if max_files > 0:
+        for old in list_profiles(directory)[max_files:]:
+            for extension in ('.collapsed', '.json'):
+                try:
+                    os.remove(os.path.join(directory, old['name'] + extension))
+                except OSError:
+                    pass
+    return name
+
+
+def profile_dir(app) -> str:
+    return os.path.abspath(app.config.get('PROFILE_DIR', 'profiles'))
+
+
+def list_profiles(directory: str, limit: Optional[int] = None) -> List[Dict]:
+    """Metadata of the stored profiles, newest first"""
+    try:
+        names = [entry for entry in os.listdir(directory) if entry.endswith('.json')]
+    except FileNotFoundError:
+        return []
+
+    profiles = []
+    for entry in sorted(names, reverse=True)[:limit]:
+        try:
+            with open(os.path.join(directory, entry)) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # Pruned or being written by another worker
+    return profiles
+
+
+# ==================== REGISTRATION ====================
+
+def _wants_profile(sample_rate: float) -> Optional[str]:
+    """Why the current request should be profiled ('header' / 'sampled'), or None"""
+    if request.headers.get(PROFILE_HEADER) == '1':
+        # Kept on g, so require_admin on the view does not verify the token again
+        from .auth_decorators import authenticate_admin
+        decoded_token, error = authenticate_admin()
+        if decoded_token is not None:
+            return 'header'
+        logger.info(f"Ignoring {PROFILE_HEADER} header without admin credentials on {request.path}")
+    if sample_rate > 0 and random.random() < sample_rate:
+        return 'sampled'
+    return None
+
+
+def register_profiler(app):
+    """
+    Profile requests selected by the admin header or PROFILE_SAMPLE_RATE
+
+    Args:
+        app: Flask application
+    """
+    if not app.config.get('PROFILER_ENABLED', True):
+        app.profiler = None
+        return
+
+    sample_rate = float(app.config.get('PROFILE_SAMPLE_RATE', 0))
+    directory = profile_dir(app)
+    max_files = int(app.config.get('PROFILE_MAX_FILES', 100))
+    profiler = SamplingProfiler(float(app.config.get('PROFILE_INTERVAL_MS', 5)) / 1000)
+
+    app.profiler = profiler
+
+    @app.before_request
+    def start_profile():
+        trigger = _wants_profile(sample_rate)
+        if trigger:
+            g.profile = profiler.start()
+            g.profile_trigger = trigger
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+        profiler.stop(profile)
+
+        try:
+            name = save_profile(directory, profile, {
+                'created': datetime.now(timezone.utc).isoformat(),
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - profile.started) * 1000, 2),
+                'samples': profile.samples,
+                'interval_ms': profiler.interval_s * 1000,
+                'trigger': g.get('profile_trigger'),
+                'pid': os.getpid()
+            }, max_files)
+            response.headers['X-Profile-Id'] = name
+        except OSError as e:
+            logger.error(f"Failed to save profile: {str(e)}")
+        return response
+
+    @app.teardown_request
+    def stop_profile(exc):
+        # after_request is skipped when a response could not be produced
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profiler.stop(profile)
+
+    logger.info(f"Sampling profiler ready (header {PROFILE_HEADER}, sample rate {sample_rate})")
@@ -0,0 +1,332 @@
+"""
+Versioned Database Schema
+Ordered migrations recorded in the schema_version table
+
+Workers no longer run Base.metadata.create_all() on every boot. Instead
+ensure_schema() reads the current version with one query; only when the
+database is behind does it take a leader lock (SQLite write lock, PostgreSQL
+advisory lock, MySQL named lock), re-check, and apply the pending migrations,
+so concurrent workers never race on DDL. With SCHEMA_AUTO_UPGRADE disabled,
+run migrations explicitly as a release step:
+
+    flask --app app db upgrade
+    flask --app app db current
+
+Adding a schema change: append a Migration with the next version number.
+Migrations must be safe to run against databases created before versioning
+existed (use checkfirst=True), and may backfill data in the same transaction.
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Callable, List, NamedTuple, Optional
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import Table, and_, delete, func, insert, select, update
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+from models.base import Base
+from models.schema import SchemaVersion
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key for PostgreSQL advisory locks
+ADVISORY_LOCK_KEY = 0x4D4D5343  # 'MMSC'
+LOCK_TIMEOUT_SECONDS = 300
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable
+
+
+# ==================== MIGRATIONS ====================
+
+def _create_tables(connection, *names: str):
+    for name in names:
+        Base.metadata.tables[name].create(connection, checkfirst=True)
+
+
+def _create_index(connection, table: Table, name: str):
+    index = next(index for index in table.indexes if index.name == name)
+    index.create(connection, checkfirst=True)
+
+
+def _baseline(connection):
+    """Tables that existed before schema versioning"""
+    _create_tables(connection, 'users', 'user_settings', 'categories', 'transactions', 'budgets')
+
+
+def _monthly_rollups(connection):
+    """Monthly category rollups, backfilled from existing transactions"""
+    from utils.rollups import rebuild_rollups
+
+    _create_tables(connection, 'monthly_category_rollups')
+    with _backfill_session(connection) as session:
+        rebuild_rollups(session)
+
+
+def _recurring_signatures(connection):
+    """Recurring-charge signatures, backfilled from existing transactions"""
+    from utils.recurring import rebuild_signatures
+
+    _create_tables(connection, 'recurring_signatures')
+    with _backfill_session(connection) as session:
+        rebuild_signatures(session)
+
+
+def _transactions_user_date_index(connection):
+    """Composite (firebase_uid, date) index for per-user range scans"""
+    from models.transaction import Transaction
+
+    _create_index(connection, Transaction.__table__, 'ix_transactions_user_date')
+
+
+def _rollup_bucket_unique(connection):
+    """Merge duplicate rollup buckets, then index the bucket key as unique"""
+    from models.rollup import MonthlyCategoryRollup
+
+    table = MonthlyCategoryRollup.__table__
+    bucket = next(index for index in table.indexes if index.name == 'uq_rollup_bucket')
+    key = list(bucket.expressions)
+
+    duplicates = connection.execute(
+        select(func.min(table.c.id), func.sum(table.c.total), func.sum(table.c.count), *key)
+        .group_by(*key)
+        .having(func.count() > 1)
+    ).all()
+    for keep_id, total, count, *values in duplicates:
+        same_bucket = and_(*(expression == value for expression, value in zip(key, values)))
+        connection.execute(delete(table).where(same_bucket, table.c.id != keep_id))
+        connection.execute(update(table).where(table.c.id == keep_id).values(total=total, count=count))
+    if duplicates:
+        logger.info(f"Merged {len(duplicates)} duplicated rollup buckets")
+
+    if connection.dialect.name in ('sqlite', 'postgresql'):
+        # Expression indexes are not reflected on SQLite, so checkfirst cannot see it
+        connection.execute(CreateIndex(bucket, if_not_exists=True))
+    else:
+        _create_index(connection, table, 'uq_rollup_bucket')
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'baseline', _baseline),
+    Migration(2, 'monthly_category_rollups', _monthly_rollups),
+    Migration(3, 'recurring_signatures', _recurring_signatures),
+    Migration(4, 'transactions_user_date_index', _transactions_user_date_index),
+    Migration(5, 'rollup_bucket_unique', _rollup_bucket_unique),
+]
+
+HEAD = MIGRATIONS[-1].version
+
+
+@contextmanager
+def _backfill_session(connection):
+    """ORM session that runs inside the migration's transaction (its commits become savepoints)"""
+    session = Session(bind=connection, join_transaction_mode='create_savepoint')
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+# ==================== VERSION CHECK ====================
+
+def current_version(connection) -> Optional[int]:
+    """
+    Schema version of a database
+
+    Returns:
+        Highest applied version, 0 if versioning exists but nothing is
+        applied, or None when the schema_version table does not exist
+    """
+    table = SchemaVersion.__table__
+    try:
+        return connection.execute(select(func.coalesce(func.max(table.c.version), 0))).scalar()
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+# ==================== LEADER LOCK ====================
+
+@contextmanager
+def _leader_lock(engine):
+    """
+    Connection holding an exclusive, database-wide migration lock
+
+    The connection is inside a transaction for the duration of the block;
+    it is committed on success and rolled back on error.
+    """
+    dialect = engine.dialect.name
+
+    if dialect == 'sqlite':
+        # BEGIN IMMEDIATE takes SQLite's write lock up front; other workers
+        # wait on it (busy timeout) rather than interleaving DDL
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.exec_driver_sql(f'PRAGMA busy_timeout = {LOCK_TIMEOUT_SECONDS * 1000}')
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except Exception:
+                connection.exec_driver_sql('ROLLBACK')
+                raise
+            connection.exec_driver_sql('COMMIT')
+        return
+
+    with engine.begin() as connection:
+        if dialect == 'postgresql':
+            # Backfills may outlive DB_STATEMENT_TIMEOUT_MS
+            connection.exec_driver_sql('SET LOCAL statement_timeout = 0')
+            # Released automatically at commit/rollback
+            connection.exec_driver_sql(f'SELECT pg_advisory_xact_lock({ADVISORY_LOCK_KEY})')
+        elif dialect in ('mysql', 'mariadb'):
+            acquired = connection.exec_driver_sql(
+                f"SELECT GET_LOCK('money_matrix_schema', {LOCK_TIMEOUT_SECONDS})"
+            ).scalar()
+            if not acquired:
+                raise RuntimeError('Timed out waiting for the schema migration lock')
+        else:
+            logger.warning(f"No migration lock for dialect '{dialect}'; run 'flask db upgrade' from one process")
+        try:
+            yield connection
+        finally:
+            if dialect in ('mysql', 'mariadb'):
+                connection.exec_driver_sql("SELECT RELEASE_LOCK('money_matrix_schema')")
+
+
+# ==================== UPGRADE ====================
+
+def upgrade(engine, target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations under the leader lock
+
+    Args:
+        engine: SQLAlchemy engine
+        target: Stop after this version (default: HEAD)
+
+    Returns:
+        Migrations applied by this process (empty if another worker got there first)
+    """
+    target = HEAD if target is None else target
+    applied = []
+
+    with _leader_lock(engine) as connection:
+        # Re-check under the lock: another worker may have upgraded meanwhile
+        table = SchemaVersion.__table__
+        table.create(connection, checkfirst=True)
+        version = current_version(connection)
+
+        for migration in MIGRATIONS:
+            if migration.version <= version or migration.version > target:
+                continue
+            logger.info(f"Applying schema migration {migration.version}: {migration.name}")
+            migration.upgrade(connection)
+            connection.execute(insert(table).values(version=migration.version, name=migration.name))
+            applied.append(migration)
+
+    if applied:
+        logger.info(f"Database schema upgraded to version {applied[-1].version}")
+    return applied
+
+
+def ensure_schema(engine, auto_upgrade: bool = True) -> Optional[int]:
+    """
+    Boot-time schema check: one query when the database is current
+
+    Args:
+        engine: SQLAlchemy engine
+        auto_upgrade: Apply pending migrations (under the leader lock) instead
+            of only reporting them
+
+    Returns:
+        Schema version after the check
+    """
+    with engine.connect() as connection:
+        version = current_version(connection)
+
+    if version == HEAD:
+        return version
+    if version is not None and version > HEAD:
+        logger.warning(f"Database schema version {version} is newer than this code ({HEAD}); deploy newer code")
+        return version
+    if not auto_upgrade:
+        logger.error(
+            f"Database schema is at version {version or 0}, code expects {HEAD}. "
+            f"Run 'flask --app app db upgrade'"
+        )
+        return version
+
+    upgrade(engine)
+    with engine.connect() as connection:
+        return current_version(connection)
+
+
+# ==================== CLI ====================
+
+db_cli = AppGroup('db', help='Database schema migrations and seeding')
+
+
+@db_cli.command('upgrade')
+@click.option('--target', type=int, default=None, help='Stop after this version (default: latest)')
+def upgrade_command(target):
+    """Apply pending schema migrations"""
+    applied = upgrade(current_app.db_engine, target)
+    for migration in applied:
+        click.echo(f"Applied {migration.version}: {migration.name}")
+    if not applied:
+        click.echo('Schema already up to date')
+
+
+@db_cli.command('current')
+def current_command():
+    """Show the database schema version"""
+    with current_app.db_engine.connect() as connection:
+        version = current_version(connection)
+    if version is None:
+        click.echo(f"Unversioned database (latest: {HEAD})")
+    else:
+        click.echo(f"Schema version {version} (latest: {HEAD})")
+    for migration in MIGRATIONS:
+        status = 'applied' if version is not None and migration.version <= version else 'pending'
+        click.echo(f"  {migration.version:>3}  {migration.name:<36} {status}")
+
+
+@db_cli.command('seed')
+@click.option('--users', type=int, default=10, show_default=True, help='Number of users')
+@click.option('--transactions', type=int, default=10000, show_default=True, help='Total transactions')
+@click.option('--seed', 'seed', type=int, default=42, show_default=True, help='Generator seed')
+@click.option('--months', type=int, default=24, show_default=True, help='Months of history')
+@click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']), default='2025-12-31', show_default=True,
+              help='Last day of the history')
+@click.option('--demo-user', is_flag=True, help="Give the first user the development demo id")
+@click.option('--batch-size', type=int, default=20000, show_default=True, help='Rows per bulk insert')
+@click.option('--no-rebuild', is_flag=True, help='Skip rebuilding rollups and recurring signatures')
+def seed_command(users, transactions, seed, months, end_date, demo_user, batch_size, no_rebuild):
+    """Bulk-generate a deterministic synthetic dataset"""
+    from utils.seed import seed_database
+
+    step = max(1, users // 20)
+
+    def progress(done, written):
+        if done % step == 0 or done == users:
+            click.echo(f"  {done}/{users} users, {written} transactions")
+
+    db_session = current_app.db_session
+    try:
+        stats = seed_database(
+            db_session, users=users, transactions=transactions, seed=seed, months=months,
+            end_date=end_date.date(), demo_user=demo_user, batch_size=batch_size,
+            rebuild=not no_rebuild, progress=progress
+        )
+    finally:
+        db_session.remove()
+
+    click.echo(f"Seeded {stats['users']} users, {stats['transactions']} transactions, {stats['budgets']} budgets "
+               f"({stats['start_date']} to {stats['end_date']}, seed {stats['seed']})")
+    click.echo(f"Insert {stats['insert_seconds']}s ({stats['rows_per_second']} rows/s), "
+               f"total {stats['total_seconds']}s")
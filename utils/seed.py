@@ -0,0 +1,486 @@
+"""
+Synthetic Dataset Generator
+Deterministic users, categories, budgets and transactions for benchmarking
+
+Generates realistic-looking personal finance histories at scale:
+
+- income on a payday cadence (biweekly, semi-monthly or monthly salary with
+  a yearly raise, occasional freelance payments, monthly interest)
+- recurring bills on fixed days (rent, insurance, phone, utilities with
+  winter/summer peaks, a handful of subscriptions, some cancelled part-way)
+- day-to-day spending drawn per (day, category) with seasonal multipliers
+  (December shopping, summer travel) and weekday/weekend patterns
+
+Every user draws from its own generator seeded with (seed, user index), so a
+given seed always produces the same rows, and user N's history does not
+depend on how many other users are generated. Rows are written with bulk
+inserts (no ORM units of work or flush listeners): Core executemany on
+server databases, and on SQLite the driver's executemany with values already
+in SQLAlchemy's storage format, which skips per-row bind processing. The
+monthly rollups and recurring signatures are rebuilt once at the end.
+
+    flask --app app db seed --users 100 --transactions 1000000 --seed 42
+
+Seeded users have ids 'seed-user-000000', ...; seeding again replaces them.
+"""
+
+import time
+import logging
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select
+
+from models.budget import Budget
+from models.transaction import Category, Transaction
+from models.user import User, UserSettings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEED = 42
+DEFAULT_MONTHS = 24
+# Fixed so the same seed yields the same dates whenever it runs
+DEFAULT_END_DATE = date(2025, 12, 31)
+DEFAULT_BATCH_SIZE = 20000
+
+SEED_UID_PREFIX = 'seed-user-'
+DEMO_UID = 'demo-user-id'
+
+# (name, type, icon, color); created as shared default categories
+CATEGORY_CATALOG = (
+    ('Salary', 'income', 'briefcase', '#2E7D32'),
+    ('Freelance', 'income', 'laptop', '#43A047'),
+    ('Interest', 'income', 'percent', '#66BB6A'),
+    ('Housing', 'expense', 'home', '#6D4C41'),
+    ('Utilities', 'expense', 'bolt', '#F9A825'),
+    ('Insurance', 'expense', 'shield', '#546E7A'),
+    ('Subscriptions', 'expense', 'repeat', '#8E24AA'),
+    ('Groceries', 'expense', 'cart', '#00897B'),
+    ('Dining Out', 'expense', 'utensils', '#E53935'),
+    ('Transport', 'expense', 'car', '#1E88E5'),
+    ('Shopping', 'expense', 'bag', '#D81B60'),
+    ('Entertainment', 'expense', 'film', '#FB8C00'),
+    ('Travel', 'expense', 'plane', '#3949AB'),
+    ('Healthcare', 'expense', 'heart', '#C62828'),
+)
+
+
+class SpendingProfile(NamedTuple):
+    """Day-to-day spending in one category"""
+    category: str
+    daily_rate: float            # Relative purchase frequency
+    median_amount: float         # At the reference income
+    spread: float                # Log-normal sigma of the amount
+    weekend: float               # Frequency multiplier on Saturday/Sunday
+    seasonality: Tuple[float, ...]  # Frequency multiplier per month, Jan..Dec
+    merchants: Tuple[str, ...]
+
+
+SPENDING_PROFILES = (
+    SpendingProfile('Groceries', 0.35, 55.0, 0.5, 1.6,
+                    (1.0, 0.95, 1.0, 1.0, 1.0, 1.0, 1.05, 1.0, 1.0, 1.0, 1.15, 1.25),
+                    ('FRESHMART', 'GREEN VALLEY GROCERS', 'COSTCO WHOLESALE', 'TRADER JOES', 'CORNER MARKET')),
+    SpendingProfile('Dining Out', 0.30, 24.0, 0.6, 1.8,
+                    (0.85, 0.9, 1.0, 1.0, 1.05, 1.1, 1.15, 1.1, 1.0, 1.0, 1.0, 1.2),
+                    ('BLUE BOTTLE COFFEE', 'STARBUCKS', 'CHIPOTLE', 'PIZZA PALACE', 'SUSHI ZEN', 'DOORDASH')),
+    SpendingProfile('Transport', 0.22, 38.0, 0.4, 0.7,
+                    (1.0, 1.0, 1.0, 1.0, 1.05, 1.15, 1.2, 1.15, 1.0, 1.0, 1.0, 1.05),
+                    ('SHELL OIL', 'CHEVRON', 'UBER TRIP', 'METRO TRANSIT', 'CITY PARKING')),
+    SpendingProfile('Shopping', 0.12, 48.0, 0.9, 1.5,
+                    (0.7, 0.8, 0.9, 0.9, 1.0, 1.0, 1.0, 1.3, 1.2, 1.0, 1.6, 2.2),
+                    ('AMAZON MKTPLACE', 'TARGET', 'BEST BUY', 'IKEA', 'ZARA', 'HOME DEPOT')),
+    SpendingProfile('Entertainment', 0.08, 32.0, 0.7, 2.0,
+                    (0.8, 0.9, 1.0, 1.0, 1.1, 1.2, 1.2, 1.1, 1.0, 1.0, 1.0, 1.2),
+                    ('AMC THEATRES', 'STEAM GAMES', 'TICKETMASTER', 'BOWLERO')),
+    SpendingProfile('Travel', 0.015, 240.0, 0.8, 1.2,
+                    (0.6, 0.7, 1.0, 0.9, 1.1, 2.2, 2.5, 2.3, 0.9, 0.8, 1.2, 1.8),
+                    ('DELTA AIR LINES', 'UNITED AIRLINES', 'MARRIOTT HOTELS', 'AIRBNB', 'HERTZ RENTAL')),
+    SpendingProfile('Healthcare', 0.02, 70.0, 0.9, 0.3,
+                    (1.3, 1.2, 1.0, 1.0, 1.0, 0.9, 0.9, 0.9, 1.0, 1.0, 1.1, 1.0),
+                    ('CVS PHARMACY', 'WALGREENS', 'CITY MEDICAL GROUP', 'BRIGHT DENTAL')),
+)
+
+# (description, monthly price)
+SUBSCRIPTIONS = (
+    ('NETFLIX.COM', 15.49),
+    ('SPOTIFY USA', 10.99),
+    ('APPLE.COM/BILL ICLOUD', 2.99),
+    ('PLANET FITNESS', 24.99),
+    ('NYTIMES DIGITAL', 17.00),
+    ('ADOBE CREATIVE CLOUD', 54.99),
+    ('AMAZON PRIME', 14.99),
+    ('DISNEY PLUS', 13.99),
+)
+
+# Utility bill size per month relative to the yearly average (heating/cooling)
+UTILITY_SEASONALITY = (1.45, 1.35, 1.1, 0.9, 0.8, 0.95, 1.2, 1.25, 0.95, 0.8, 0.95, 1.3)
+
+# Monthly take-home income the median amounts above are calibrated for
+REFERENCE_INCOME = 4500.0
+
+
+def seed_uid(index: int) -> str:
+    return f"{SEED_UID_PREFIX}{index:06d}"
+
+
+def _month_start(day: date, months_back: int = 0) -> date:
+    month_index = day.year * 12 + day.month - 1 - months_back
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _month_end(day: date) -> date:
+    return _month_start(day, -1) - timedelta(days=1)
+
+
+def _round_to(value: float, step: float) -> float:
+    return max(step, round(value / step) * step)
+
+
+# ==================== GENERATION ====================
+
+class _Calendar:
+    """Day ordinals of the seeded range with their month/weekday lookups"""
+
+    def __init__(self, start: date, end: date):
+        import numpy as np
+
+        self.start = start
+        self.end = end
+        self.ordinals = np.arange(start.toordinal(), end.toordinal() + 1)
+        days = [date.fromordinal(int(ordinal)) for ordinal in self.ordinals]
+        self.dates = days
+        self.timestamps = [datetime(day.year, day.month, day.day, 12) for day in days]
+        # SQLite storage format of the same values (see _TransactionWriter)
+        self.date_strings = [day.isoformat() for day in days]
+        self.timestamp_strings = [f"{day.isoformat()} 12:00:00.000000" for day in days]
+        self.months = np.array([day.month - 1 for day in days])
+        self.weekend = np.array([day.weekday() >= 5 for day in days])
+        self.month_starts = sorted({_month_start(day) for day in days})
+
+    def index(self, day: date) -> Optional[int]:
+        position = day.toordinal() - self.start.toordinal()
+        return position if 0 <= position < len(self.dates) else None
+
+
+def _recurring(rng, calendar: _Calendar, income: float) -> List[Tuple[int, str, str, float]]:
+    """
+    Payday income and fixed-day bills as (day index, category, description, amount)
+    """
+    rows = []
+
+    def add(day: date, category: str, description: str, amount: float):
+        position = calendar.index(day)
+        if position is not None:
+            rows.append((position, category, description, round(amount, 2)))
+
+    # Salary, with a raise each January
+    cadence = rng.choice(['biweekly', 'semimonthly', 'monthly'], p=[0.5, 0.3, 0.2])
+    raise_rate = rng.uniform(0.0, 0.05)
+    employer = f"PAYROLL {rng.choice(['ACME CORP', 'GLOBEX INC', 'INITECH LLC', 'UMBRELLA CO', 'STARK IND'])}"
+
+    def salary(day: date, per_month: float) -> float:
+        return income * per_month * (1 + raise_rate) ** (day.year - calendar.start.year)
+
+    if cadence == 'biweekly':
+        payday = calendar.start + timedelta(days=(4 - calendar.start.weekday()) % 7 + 7 * int(rng.integers(0, 2)))
+        while payday <= calendar.end:
+            add(payday, 'Salary', employer, salary(payday, 12 / 26))
+            payday += timedelta(days=14)
+    else:
+        for month in calendar.month_starts:
+            if cadence == 'semimonthly':
+                add(month.replace(day=15), 'Salary', employer, salary(month, 0.5))
+                add(_month_end(month), 'Salary', employer, salary(month, 0.5))
+            else:
+                add(_month_end(month), 'Salary', employer, salary(month, 1.0))
+
+    freelancer = rng.random() < 0.3
+    rent = _round_to(income * rng.uniform(0.25, 0.35), 5)
+    rent_day = int(rng.integers(1, 4))
+    insurance = round(rng.uniform(80, 220), 2)
+    phone = round(rng.uniform(35, 95), 2)
+    power_base = rng.uniform(60, 160) * (income / REFERENCE_INCOME) ** 0.3
+    power_day, insurance_day, phone_day = (int(day) for day in rng.integers(5, 28, size=3))
+
+    chosen = rng.choice(len(SUBSCRIPTIONS), size=int(rng.integers(2, 6)), replace=False)
+    subscriptions = []
+    for index in sorted(chosen):
+        description, price = SUBSCRIPTIONS[index]
+        # About one in five is cancelled part-way through the range
+        cancel_after = int(rng.integers(6, len(calendar.month_starts))) if rng.random() < 0.2 else None
+        subscriptions.append((description, price, int(rng.integers(1, 29)), cancel_after))
+
+    for month_number, month in enumerate(calendar.month_starts):
+        add(month.replace(day=rent_day), 'Housing', 'RENT - PARKVIEW APARTMENTS', rent)
+        add(month.replace(day=insurance_day), 'Insurance', 'STATE AUTO INSURANCE', insurance)
+        add(month.replace(day=phone_day), 'Utilities', 'VERIZON WIRELESS', phone)
+        power = power_base * UTILITY_SEASONALITY[month.month - 1] * rng.lognormal(0, 0.08)
+        add(month.replace(day=power_day), 'Utilities', 'CITY POWER & LIGHT', power)
+
+        for description, price, day, cancel_after in subscriptions:
+            if cancel_after is None or month_number < cancel_after:
+                add(month.replace(day=day), 'Subscriptions', description, price)
+
+        add(_month_end(month), 'Interest', 'HIGH YIELD SAVINGS INTEREST', income * rng.uniform(0.002, 0.01))
+        if freelancer and rng.random() < 0.6:
+            payday = month + timedelta(days=int(rng.integers(0, 28)))
+            add(payday, 'Freelance', 'FREELANCE INVOICE PAYMENT', income * rng.uniform(0.1, 0.5))
+
+    return rows
+
+
+def _spending(rng, calendar: _Calendar, income: float, count: int):
+    """
+    Day-to-day purchases: (day index array, profile index array, amount array, merchant array)
+    """
+    import numpy as np
+
+    profiles = SPENDING_PROFILES
+    rates = np.array([profile.daily_rate for profile in profiles])
+    seasonality = np.array([profile.seasonality for profile in profiles])   # (K, 12)
+    weekend = np.array([profile.weekend for profile in profiles])
+
+    # Purchase weight per (day, category); a multinomial draw spreads the
+    # requested count over the cells
+    weights = rates[None, :] * seasonality[:, calendar.months].T
+    weights = np.where(calendar.weekend[:, None], weights * weekend[None, :], weights)
+    # Per-user taste: some people eat out more, some shop more
+    weights = weights * rng.lognormal(0, 0.35, size=len(profiles))[None, :]
+    cell_counts = rng.multinomial(count, (weights / weights.sum()).ravel())
+    cells = np.repeat(np.arange(cell_counts.size), cell_counts)
+    days, categories = np.divmod(cells, len(profiles))
+
+    medians = np.log([profile.median_amount for profile in profiles])
+    spreads = np.array([profile.spread for profile in profiles])
+    scale = (income / REFERENCE_INCOME) ** 0.6
+    amounts = np.exp(rng.normal(medians[categories], spreads[categories])) * scale
+    amounts = np.maximum(np.round(amounts, 2), 1.0)
+
+    # Each user has favourite merchants: a skewed choice within the category
+    merchant_counts = np.array([len(profile.merchants) for profile in profiles])
+    picks = (rng.random(count) ** 2 * merchant_counts[categories]).astype(np.int64)
+    return days, categories, amounts, picks
+
+
+def generate_user(seed: int, index: int, calendar: _Calendar, transactions: int) -> Dict:
+    """
+    One user's history, identical for the same (seed, index, calendar, transactions)
+
+    Returns:
+        {'income': monthly income, 'rows': [(day index, category, description,
+        amount, type), ...] sorted by day}
+    """
+    import numpy as np
+
+    rng = np.random.default_rng([seed, index])
+    income = float(np.clip(rng.lognormal(np.log(REFERENCE_INCOME), 0.45), 1800, 25000))
+    income_categories = {name for name, txn_type, _, _ in CATEGORY_CATALOG if txn_type == 'income'}
+
+    recurring = _recurring(rng, calendar, income)
+    if len(recurring) > transactions:
+        keep = np.sort(rng.choice(len(recurring), size=transactions, replace=False))
+        recurring = [recurring[position] for position in keep]
+
+    days, categories, amounts, picks = _spending(rng, calendar, income, transactions - len(recurring))
+    rows = [
+        (position, category, description, amount, 'income' if category in income_categories else 'expense')
+        for position, category, description, amount in recurring
+    ]
+    rows.extend(
+        (day, SPENDING_PROFILES[category].category, SPENDING_PROFILES[category].merchants[pick], amount, 'expense')
+        for day, category, amount, pick in zip(days.tolist(), categories.tolist(), amounts.tolist(), picks.tolist())
+    )
+    rows.sort(key=lambda row: row[0])
+    return {'income': income, 'rows': rows}
+
+
+# ==================== DATABASE ====================
+
+def ensure_categories(db_session) -> Dict[str, int]:
+    """
+    Create the missing default categories
+
+    Returns:
+        Category id by name
+    """
+    existing = dict(db_session.execute(
+        select(Category.name, Category.id).where(Category.firebase_uid.is_(None))
+    ).all())
+    missing = [
+        {'firebase_uid': None, 'name': name, 'type': txn_type, 'icon': icon, 'color': color, 'is_default': True}
+        for name, txn_type, icon, color in CATEGORY_CATALOG if name not in existing
+    ]
+    if missing:
+        db_session.execute(insert(Category.__table__), missing)
+        existing = dict(db_session.execute(
+            select(Category.name, Category.id).where(Category.firebase_uid.is_(None))
+        ).all())
+    return existing
+
+
+class _TransactionWriter:
+    """Bulk transaction inserts in batches"""
+
+    COLUMNS = ('firebase_uid', 'amount', 'type', 'category_id', 'description', 'date', 'is_deleted',
+               'created_at', 'updated_at')
+
+    def __init__(self, db_session, calendar: _Calendar, batch_size: int):
+        self.db_session = db_session
+        self.batch_size = batch_size
+        self.raw = db_session.get_bind().dialect.name == 'sqlite'
+        if self.raw:
+            self.dates, self.timestamps = calendar.date_strings, calendar.timestamp_strings
+        else:
+            self.dates, self.timestamps = calendar.dates, calendar.timestamps
+        self.pending: List[tuple] = []
+
+    def add(self, uid: str, day: int, category_id: int, description: str, amount: float, txn_type: str):
+        self.pending.append((uid, amount, txn_type, category_id, description, self.dates[day], False,
+                             self.timestamps[day], self.timestamps[day]))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        if self.raw:
+            columns = ', '.join(self.COLUMNS)
+            placeholders = ', '.join('?' * len(self.COLUMNS))
+            cursor = self.db_session.connection().connection.cursor()
+            try:
+                cursor.executemany(f"INSERT INTO transactions ({columns}) VALUES ({placeholders})", self.pending)
+            finally:
+                cursor.close()
+        else:
+            self.db_session.execute(
+                insert(Transaction.__table__),
+                [dict(zip(self.COLUMNS, row)) for row in self.pending]
+            )
+        self.pending = []
+
+
+def clear_users(db_session, firebase_uids: Sequence[str]):
+    """Delete users and everything they own (rollups/signatures are rebuilt afterwards)"""
+    from models.recurring import RecurringSignature
+    from models.rollup import MonthlyCategoryRollup
+
+    uids = list(firebase_uids)
+    for start in range(0, len(uids), 500):
+        chunk = uids[start:start + 500]
+        for model in (Transaction, Budget, MonthlyCategoryRollup, RecurringSignature, UserSettings, User):
+            db_session.execute(delete(model.__table__).where(model.__table__.c.firebase_uid.in_(chunk)))
+
+
+def seed_database(db_session, users: int = 10, transactions: int = 10000, seed: int = DEFAULT_SEED,
+                  months: int = DEFAULT_MONTHS, end_date: date = DEFAULT_END_DATE, demo_user: bool = False,
+                  batch_size: int = DEFAULT_BATCH_SIZE, rebuild: bool = True,
+                  progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """
+    Bulk-generate users with budgets and transaction histories
+
+    Args:
+        db_session: SQLAlchemy session on a migrated database
+        users: Number of users
+        transactions: Total transactions, split evenly across users
+        seed: Generator seed; the same arguments always produce the same rows
+        months: Length of the history, ending with end_date's month
+        end_date: Last day of the history
+        demo_user: Give the first user the development demo id ('demo-user-id')
+        batch_size: Rows per bulk insert statement
+        rebuild: Rebuild monthly rollups and recurring signatures afterwards
+        progress: Called with (users done, transactions written) after each user
+
+    Returns:
+        Counts and timings
+    """
+    if users < 1:
+        raise ValueError('At least one user is required')
+
+    started = time.perf_counter()
+    calendar = _Calendar(_month_start(end_date, months - 1), end_date)
+    uids = [DEMO_UID if demo_user and index == 0 else seed_uid(index) for index in range(users)]
+
+    clear_users(db_session, uids)
+    category_ids = ensure_categories(db_session)
+
+    per_user, remainder = divmod(transactions, users)
+    writer = _TransactionWriter(db_session, calendar, batch_size)
+    budgets: List[Dict] = []
+    written = 0
+
+    db_session.execute(insert(User.__table__), [
+        {
+            'firebase_uid': uid,
+            'email': 'demo@example.com' if uid == DEMO_UID else f"{uid}@example.com",
+            'display_name': 'Demo User' if uid == DEMO_UID else f"Seed User {index}",
+            'is_active': True,
+            'created_at': datetime.combine(calendar.start, datetime.min.time()),
+            'updated_at': datetime.combine(calendar.start, datetime.min.time())
+        }
+        for index, uid in enumerate(uids)
+    ])
+    db_session.execute(insert(UserSettings.__table__), [
+        {'firebase_uid': uid, 'theme': 'auto', 'currency': 'USD', 'date_format': 'MM/DD/YYYY', 'language': 'en'}
+        for uid in uids
+    ])
+
+    for index, uid in enumerate(uids):
+        history = generate_user(seed, index, calendar, per_user + (1 if index < remainder else 0))
+
+        spent: Dict[str, float] = {}
+        for day, category, description, amount, txn_type in history['rows']:
+            writer.add(uid, day, category_ids[category], description, amount, txn_type)
+            if txn_type == 'expense':
+                spent[category] = spent.get(category, 0.0) + amount
+        written += len(history['rows'])
+
+        # Monthly budgets on the biggest flexible categories, set a little
+        # above or below the user's actual average
+        flexible = sorted(
+            (profile.category for profile in SPENDING_PROFILES if profile.category in spent),
+            key=lambda name: -spent[name]
+        )[:4]
+        for position, category in enumerate(flexible):
+            monthly = spent[category] / months
+            factor = 0.85 + 0.1 * ((index + position) % 5)
+            budgets.append({
+                'firebase_uid': uid,
+                'category_id': category_ids[category],
+                'limit_amount': _round_to(monthly * factor, 10),
+                'period': 'monthly',
+                'start_date': calendar.start,
+                'end_date': calendar.end,
+                'is_active': True
+            })
+
+        if progress:
+            progress(index + 1, written)
+
+    writer.flush()
+    if budgets:
+        db_session.execute(insert(Budget.__table__), budgets)
+    db_session.commit()
+    inserted = time.perf_counter() - started
+
+    if rebuild:
+        from utils.rollups import rebuild_rollups
+        from utils.recurring import rebuild_signatures
+
+        rebuild_rollups(db_session)
+        rebuild_signatures(db_session, uids)
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        'users': users,
+        'transactions': written,
+        'budgets': len(budgets),
+        'categories': len(category_ids),
+        'seed': seed,
+        'start_date': calendar.start.isoformat(),
+        'end_date': calendar.end.isoformat(),
+        'insert_seconds': round(inserted, 2),
+        'total_seconds': round(elapsed, 2),
+        'rows_per_second': round(written / inserted) if inserted else None
+    }
+    logger.info(f"Seeded {users} users with {written} transactions in {elapsed:.1f}s (seed {seed})")
+    return stats
@@ -0,0 +1,206 @@
+"""
+Startup Profiler
+Phase-by-phase timing of create_app() and import-cost reports
+
+Enable by setting MM_STARTUP_PROFILE to the path of a JSON report (or to
+'1' for startup_profile.json). create_app() then records how long each phase
+takes (config, firebase, database, schema, features, ...) along with
+per-feature import/init times, and writes the report when the app is ready.
+
+Import costs cannot be measured from inside the process that pays them, so
+the command-line entry point re-runs create_app() under 'python -X importtime'
+and merges the top imports by cumulative time into the report:
+
+    python -m utils.startup_profiler [--env development] [--top 25] [--output report.json]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = 'MM_STARTUP_PROFILE'
+DEFAULT_REPORT_PATH = 'startup_profile.json'
+
+
+class StartupProfiler:
+    """
+    Records nested phase timings during application startup
+    A disabled profiler accepts the same calls and records nothing
+    """
+
+    def __init__(self, report_path: Optional[str] = None):
+        self.enabled = report_path is not None
+        self.report_path = report_path
+        self.started = time.perf_counter()
+        self.phases: List[Dict] = []
+        self._stack: List[str] = []
+
+    @classmethod
+    def from_env(cls) -> 'StartupProfiler':
+        """Profiler configured from MM_STARTUP_PROFILE (disabled when unset)"""
+        value = os.getenv(ENV_VAR, '').strip()
+        if not value or value.lower() in ('0', 'false', 'no'):
+            return cls(None)
+        return cls(DEFAULT_REPORT_PATH if value.lower() in ('1', 'true', 'yes') else value)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block; nested phases are reported as 'parent.child'"""
+        if not self.enabled:
+            yield
+            return
+
+        self._stack.append(name)
+        full_name = '.'.join(self._stack)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            self.phases.append({
+                'name': full_name,
+                'ms': round((time.perf_counter() - started) * 1000, 2)
+            })
+
+    def report(self, app=None, config_name: Optional[str] = None) -> Dict:
+        """Build the report; feature timings are read from app.feature_registry"""
+        registry = getattr(app, 'feature_registry', None)
+        return {
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'pid': os.getpid(),
+            'python': sys.version.split()[0],
+            'config': config_name,
+            'phases': self.phases,
+            'features': registry.feature_timings if registry is not None else {},
+            'failed_features': registry.failed_features if registry is not None else {}
+        }
+
+    def finish(self, app=None, config_name: Optional[str] = None) -> Optional[Dict]:
+        """Write the JSON report (if enabled) and return it"""
+        if not self.enabled:
+            return None
+
+        report = self.report(app, config_name)
+        try:
+            with open(self.report_path, 'w') as f:
+                json.dump(report, f, indent=2)
+            logger.info(f"Startup profile written to {self.report_path} ({report['total_ms']:.0f}ms)")
+        except OSError as e:
+            logger.warning(f"Could not write startup profile: {str(e)}")
+        return report
+
+
+# ==================== IMPORT TIME ====================
+
+def parse_importtime(output: str) -> List[Dict]:
+    """
+    Parse 'python -X importtime' stderr output
+
+    Args:
+        output: Captured stderr
+
+    Returns:
+        One dict per import: {module, self_us, cumulative_us, depth}
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # Header row
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        imports.append({
+            'module': module,
+            'self_us': self_us,
+            'cumulative_us': cumulative_us,
+            # importtime indents nested imports by two spaces per level
+            'depth': (len(name) - len(module) - 1) // 2
+        })
+    return imports
+
+
+def top_imports(imports: List[Dict], top: int = 25) -> List[Dict]:
+    """Slowest imports by cumulative time"""
+    return sorted(imports, key=lambda item: item['cumulative_us'], reverse=True)[:top]
+
+
+def profile_startup(env: str = 'development', top: int = 25, cwd: Optional[str] = None) -> Dict:
+    """
+    Run create_app() in a fresh interpreter with import-time tracing
+
+    Args:
+        env: Configuration name passed to create_app()
+        top: Number of imports to include
+        cwd: Working directory for the child process (default: project root)
+
+    Returns:
+        Startup report with 'wall_ms' and 'imports' added
+    """
+    project_root = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    fd, report_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+
+    child_env = dict(os.environ, **{ENV_VAR: report_path})
+    started = time.perf_counter()
+    try:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c',
+             f"from app import create_app; create_app({env!r})"],
+            cwd=project_root,
+            env=child_env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        wall_ms = round((time.perf_counter() - started) * 1000, 2)
+        if result.returncode != 0:
+            raise RuntimeError(f"create_app() failed:\n{result.stderr[-2000:]}")
+
+        with open(report_path) as f:
+            report = json.load(f)
+    finally:
+        os.remove(report_path)
+
+    imports = parse_importtime(result.stderr)
+    report['wall_ms'] = wall_ms
+    report['import_total_ms'] = round(sum(i['cumulative_us'] for i in imports if i['depth'] == 0) / 1000, 2)
+    report['imports'] = top_imports(imports, top)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m utils.startup_profiler',
+                                     description='Profile create_app() startup')
+    parser.add_argument('--env', default=os.getenv('FLASK_ENV', 'development'),
+                        help='configuration name (default: $FLASK_ENV or development)')
+    parser.add_argument('--top', type=int, default=25, help='number of imports to report')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = profile_startup(args.env, args.top)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
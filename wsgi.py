@@ -0,0 +1,14 @@
+"""
+WSGI Entry Point
+Module-level application object for production servers
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The configuration is taken from FLASK_ENV (default: production).
+"""
+
+import os
+
+from app import create_app
+
+app = create_app(os.getenv('FLASK_ENV', 'production'))